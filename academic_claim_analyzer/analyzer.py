@@ -7,12 +7,19 @@ from typing import List, Dict, Any, Optional, Union
 from .models import RequestAnalysis, Paper, RankedPaper
 from .schema_manager import create_model_from_schema
 from .query_processor import formulate_queries_for_platforms
-from .search_coordinator import perform_searches
-from .exclusion_processor import apply_exclusion_criteria
+from .search_coordinator import perform_searches, hydrate_full_texts, drop_papers_without_content
+from .search.http_client import create_http_session
+from .exclusion_processor import apply_exclusion_criteria, apply_abstract_screening
 from .paper_ranker import rank_papers
+from .streaming_pipeline import run_streaming_pipeline
+from .checkpoint_store import (
+    RequestCheckpoint, current_checkpoint, dump_papers, load_papers, dump_queries, load_queries
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SUBQUERY_CONCURRENCY = 3
+
 async def analyze_request(
     query: Union[str, List[str]],
     ranking_guidance: str = "",
@@ -33,8 +40,12 @@ async def analyze_request(
 
     If a config is provided and includes a "search.platforms" list, only those platforms are used.
     Otherwise, the default is to use all platforms: openalex, scopus, core, arxiv, and semantic_scholar.
+    Setting "processing.abstract_screening" in the config screens papers on title + abstract
+    before any full text is scraped.
 
-    This function supports multiple user queries if `query` is provided as a list.
+    This function supports multiple user queries if `query` is provided as a list. The
+    queries are searched concurrently ("processing.subquery_concurrency" at a time) and
+    their papers merged before ranking.
     
     Args:
         query: Single query string or list of query strings
@@ -57,6 +68,28 @@ async def analyze_request(
     default_platforms = ["openalex", "scopus", "core", "arxiv", "semantic_scholar"]
     if config and "search" in config and "platforms" in config["search"]:
         default_platforms = config["search"]["platforms"]
+    processing = (config or {}).get("processing", {})
+    abstract_screening = bool(processing.get("abstract_screening", False))
+
+    # Parameters shared by the single- and multi-query analyses
+    parameters = {
+        "num_queries": num_queries,
+        "papers_per_query": papers_per_query,
+        "num_papers_to_return": num_papers_to_return,
+        "platforms": default_platforms,
+        "abstract_screening": abstract_screening,
+        "combined_query_formulation": processing.get("combined_query_formulation", False),
+        "streaming_pipeline": processing.get("streaming_pipeline", False),
+        "stream_quorum": processing.get("stream_quorum"),
+        "stream_deadline": processing.get("stream_deadline"),
+        "ranking_tokens_per_paper": processing.get("ranking_tokens_per_paper"),
+        "analysis_token_budget": processing.get("analysis_token_budget"),
+        "passage_top_k": processing.get("passage_top_k"),
+        "exclusion_batch_size": processing.get("exclusion_batch_size"),
+        "exclusion_batch_tokens": processing.get("exclusion_batch_tokens"),
+        "prerank_top_m": processing.get("prerank_top_m"),
+        "adaptive_ranking": processing.get("adaptive_ranking", False)
+    }
 
     # Handle multiple queries vs single query
     if isinstance(query, list):
@@ -64,12 +97,7 @@ async def analyze_request(
         analysis = RequestAnalysis(
             query="(multiple user queries)",
             ranking_guidance=ranking_guidance,
-            parameters={
-                "num_queries": num_queries,
-                "papers_per_query": papers_per_query,
-                "num_papers_to_return": num_papers_to_return,
-                "platforms": default_platforms
-            }
+            parameters={**parameters, "subquery_concurrency": processing.get("subquery_concurrency")}
         )
 
         if exclusion_criteria:
@@ -79,25 +107,19 @@ async def analyze_request(
             ExtractionModel = create_model_from_schema('DataExtractionSchema', data_extraction_schema)
             analysis.data_extraction_schema = ExtractionModel
 
-        # For each user query, set analysis.query and perform search and exclusion
-        for q in query:
-            analysis.query = q
-            await _search_and_exclude(analysis)
+        # Search and exclude for every user query concurrently, then merge the results
+        await _search_sub_queries(analysis, query)
 
-        # Once all queries are processed, perform ranking on aggregated results
-        await _rank_papers(analysis)
+        # Once all queries are processed, perform ranking on aggregated results. Ranking
+        # uses the last user query, as when the sub-queries ran one after another.
+        await _rank_papers(analysis, query=query[-1])
         return analysis
     else:
         # Single query scenario
         analysis = RequestAnalysis(
             query=query,
             ranking_guidance=ranking_guidance,
-            parameters={
-                "num_queries": num_queries,
-                "papers_per_query": papers_per_query,
-                "num_papers_to_return": num_papers_to_return,
-                "platforms": default_platforms
-            }
+            parameters=parameters
         )
 
         if exclusion_criteria:
@@ -111,31 +133,135 @@ async def analyze_request(
         return analysis
 
 async def _search_and_exclude(analysis: RequestAnalysis) -> None:
-    """Helper function to perform query formulation, searching, and applying exclusion criteria."""
-    await formulate_queries_for_platforms(analysis)
-    await perform_searches(analysis)
-    await apply_exclusion_criteria(analysis)
+    """
+    Helper function to perform query formulation, searching, and applying exclusion criteria.
+    Full text is only scraped for papers that survive deduplication (and abstract screening, if enabled).
+    By default the stages run one after another; with "streaming_pipeline" they
+    overlap as a streaming pipeline (see streaming_pipeline.py).
+
+    When the request has a checkpoint (see checkpoint_store.py), the formulated queries,
+    the hydrated search results (sequential mode only) and the papers that passed
+    exclusion are saved per query, and stages found in the checkpoint are skipped.
+    """
+    checkpoint = current_checkpoint()
+    queries = _load_stage(checkpoint, "queries", analysis)
+    if queries is not None:
+        analysis.queries = load_queries(queries)
+        excluded = _load_stage(checkpoint, "excluded", analysis)
+        if excluded is not None:
+            analysis.search_results = load_papers(excluded)
+            logger.info(f"Resumed {len(analysis.search_results)} papers for '{analysis.query}' from checkpoint")
+            return
+    else:
+        await formulate_queries_for_platforms(analysis)
+        _save_stage(checkpoint, "queries", analysis, dump_queries(analysis.queries))
+
+    if analysis.parameters.get("streaming_pipeline", False):
+        async with create_http_session() as session:
+            await run_streaming_pipeline(
+                analysis,
+                session,
+                quorum=analysis.parameters.get("stream_quorum"),
+                deadline=analysis.parameters.get("stream_deadline")
+            )
+    else:
+        searched = _load_stage(checkpoint, "search", analysis)
+        if searched is not None:
+            analysis.search_results = load_papers(searched)
+        else:
+            async with create_http_session() as session:
+                await perform_searches(analysis, session, hydrate=False)
+                if analysis.parameters.get("abstract_screening"):
+                    await apply_abstract_screening(analysis)
+                await hydrate_full_texts(analysis.search_results, session)
+            analysis.search_results = drop_papers_without_content(analysis.search_results)
+            _save_stage(checkpoint, "search", analysis, dump_papers(analysis.search_results))
+        await apply_exclusion_criteria(analysis)
+    _save_stage(checkpoint, "excluded", analysis, dump_papers(analysis.search_results))
+
+def _load_stage(checkpoint: Optional[RequestCheckpoint], stage: str, analysis: RequestAnalysis) -> Optional[Any]:
+    # Stages before ranking are per user query, so each sub-query of a request has its own
+    if checkpoint is None:
+        return None
+    return checkpoint.load(f"{stage}:{analysis.query}")
+
+def _save_stage(checkpoint: Optional[RequestCheckpoint], stage: str, analysis: RequestAnalysis, value: Any) -> None:
+    if checkpoint is not None:
+        checkpoint.save(f"{stage}:{analysis.query}", value)
+
+async def _search_sub_queries(analysis: RequestAnalysis, sub_queries: List[str]) -> None:
+    """
+    Run _search_and_exclude for each user query of a multi-query request concurrently
+    (at most `subquery_concurrency` at a time), each on its own copy of the analysis so
+    sub-queries never see or re-process each other's queries and papers. The formulated
+    queries and surviving papers are then merged into `analysis` in sub-query order,
+    deduplicated by title, and each sub-query's metadata is kept under
+    analysis.metadata["sub_queries"][sub_query]. analysis.query is left unchanged.
+    """
+    limit = analysis.parameters.get("subquery_concurrency") or DEFAULT_SUBQUERY_CONCURRENCY
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(sub_query: str) -> RequestAnalysis:
+        async with semaphore:
+            sub_analysis = analysis.model_copy(update={
+                "query": sub_query,
+                "queries": [],
+                "search_results": [],
+                "ranked_papers": [],
+                "metadata": {},
+            })
+            await _search_and_exclude(sub_analysis)
+            return sub_analysis
+
+    logger.info(f"Processing {len(sub_queries)} sub-queries, up to {limit} at a time")
+    results = await asyncio.gather(*(run(q) for q in sub_queries), return_exceptions=True)
+
+    for sub_query, result in zip(sub_queries, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing sub-query '{sub_query}': {str(result)}", exc_info=result)
+            continue
+        analysis.queries.extend(result.queries)
+        added = sum(analysis.add_search_result(p) for p in result.search_results)
+        if result.metadata:
+            analysis.metadata.setdefault("sub_queries", {})[sub_query] = result.metadata
+        logger.info(f"Sub-query '{sub_query}': {added} of {len(result.search_results)} papers were new")
 
 async def _perform_analysis(analysis: RequestAnalysis) -> None:
     """Perform the complete analysis pipeline."""
     await _search_and_exclude(analysis)
     await _rank_papers(analysis)
 
-async def _rank_papers(analysis: RequestAnalysis) -> None:
-    """Rank papers based on relevance to the query."""
+async def _rank_papers(analysis: RequestAnalysis, query: Optional[str] = None) -> None:
+    """Rank papers based on relevance to `query` (defaults to analysis.query)."""
     if not analysis.search_results:
         logger.warning("No papers to rank.")
         return
+    checkpoint = current_checkpoint()
+    ranked = checkpoint.load("ranked") if checkpoint else None
+    if ranked is not None:
+        for rp in load_papers(ranked["papers"]):
+            analysis.add_ranked_paper(rp)
+        analysis.metadata.update(ranked["metadata"])
+        logger.info(f"Resumed {len(analysis.ranked_papers)} ranked papers from checkpoint")
+        return
     try:
         ranked_list = await rank_papers(
             papers=analysis.search_results,
-            query=analysis.query,
+            query=query or analysis.query,
             ranking_guidance=analysis.ranking_guidance,
             exclusion_schema=analysis.exclusion_schema,
             data_extraction_schema=analysis.data_extraction_schema,
-            top_n=analysis.parameters["num_papers_to_return"]
+            top_n=analysis.parameters["num_papers_to_return"],
+            ranking_tokens_per_paper=analysis.parameters.get("ranking_tokens_per_paper"),
+            analysis_token_budget=analysis.parameters.get("analysis_token_budget"),
+            context_stats=analysis.metadata.setdefault("context_tokens", {}),
+            passage_top_k=analysis.parameters.get("passage_top_k"),
+            prerank_top_m=analysis.parameters.get("prerank_top_m"),
+            adaptive_ranking=analysis.parameters.get("adaptive_ranking", False)
         )
         for rp in ranked_list:
             analysis.add_ranked_paper(rp)
+        if checkpoint is not None:
+            checkpoint.save("ranked", {"papers": dump_papers(analysis.ranked_papers), "metadata": analysis.metadata})
     except Exception as e:
         logger.error(f"Error ranking papers: {str(e)}", exc_info=True)
\ No newline at end of file
@@ -1,16 +1,38 @@
 import asyncio 
-import json
+import argparse
+import heapq
 import os
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple, TypeVar
 import yaml
 
 from .debug_utils import configure_logging
 from .models import RequestAnalysis
+from .search.response_cache import configure_response_cache, close_response_cache
+from .fulltext_store import configure_fulltext_store, close_fulltext_store
+from .browser_pool import shutdown_browser_pool
+from .llm_handler_config import (
+    configure_llm_cache, close_llm_cache, configure_llm_rate_limit, DEFAULT_UNCACHED_STAGES, LLM_REQUESTS_PER_MINUTE
+)
+from .pdf_extractor import close_pdf_extractor
+from .search.rate_limiter import configure_stage_limits, configure_shared_rate_limits
+from .search.search_config import GlobalSearchConfig
+from .result_writer import JSONLResultWriter, jsonl_to_json, merge_jsonl
+from .job_queue import JobQueue, run_queue_worker, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, DEFAULT_POLL_INTERVAL
+from .checkpoint_store import (
+    RESULT_STAGE, RequestCheckpoint, configure_checkpoint_store, close_checkpoint_store,
+    get_checkpoint_store, request_fingerprint, use_checkpoint
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
 # Initialize with default configuration
 configure_logging()
 
@@ -30,6 +52,38 @@ class BatchProcessorConfig:
         self.num_queries = processing.get('num_queries', 5)
         self.papers_per_query = processing.get('papers_per_query', 5)
         self.num_papers_to_return = processing.get('num_papers_to_return', 3)
+        self.abstract_screening = processing.get('abstract_screening', False)
+        self.combined_query_formulation = processing.get('combined_query_formulation', False)
+        self.streaming_pipeline = processing.get('streaming_pipeline', False)
+        self.stream_quorum = processing.get('stream_quorum', None)
+        self.stream_deadline = processing.get('stream_deadline', None)
+        self.subquery_concurrency = processing.get('subquery_concurrency', None)
+        self.ranking_tokens_per_paper = processing.get('ranking_tokens_per_paper', None)
+        self.analysis_token_budget = processing.get('analysis_token_budget', None)
+        self.passage_top_k = processing.get('passage_top_k', None)
+        self.exclusion_batch_size = processing.get('exclusion_batch_size', None)
+        self.exclusion_batch_tokens = processing.get('exclusion_batch_tokens', None)
+        self.prerank_top_m = processing.get('prerank_top_m', None)
+        self.adaptive_ranking = processing.get('adaptive_ranking', False)
+
+        # Scheduler settings (None keeps the GlobalSearchConfig stage caps)
+        scheduler = config_data.get('scheduler', {}) or {}
+        self.max_concurrent_requests = scheduler.get('max_concurrent_requests', DEFAULT_MAX_CONCURRENT_REQUESTS)
+        self.search_concurrency = scheduler.get('search_concurrency', None)
+        self.scrape_concurrency = scheduler.get('scrape_concurrency', None)
+        self.llm_concurrency = scheduler.get('llm_concurrency', None)
+
+        # Job queue settings (distributed workers; off unless a path is given here or on the command line)
+        queue = config_data.get('queue', {}) or {}
+        self.queue_path = queue.get('path', None)
+        self.queue_lease_seconds = queue.get('lease_seconds', DEFAULT_LEASE_SECONDS)
+        self.queue_max_attempts = queue.get('max_attempts', DEFAULT_MAX_ATTEMPTS)
+        self.queue_poll_interval = queue.get('poll_interval', DEFAULT_POLL_INTERVAL)
+
+        # Checkpoint settings
+        checkpoint = config_data.get('checkpoint', {}) or {}
+        self.checkpoint_enabled = checkpoint.get('enabled', True)
+        self.checkpoint_path = checkpoint.get('path', None)
 
         # Logging settings
         logging_config = config_data.get('logging', {})
@@ -41,6 +95,27 @@ class BatchProcessorConfig:
         self.min_year = search.get('min_year', None)
         self.max_year = search.get('max_year', None)
 
+        # Cache settings (all caches are opt-in)
+        cache = config_data.get('cache', {}) or {}
+        http_cache = cache.get('http', {}) or {}
+        self.http_cache_enabled = http_cache.get('enabled', False)
+        self.http_cache_path = http_cache.get('path', None)
+        self.http_cache_ttl_hours = http_cache.get('ttl_hours', None)
+        self.http_cache_max_size_mb = http_cache.get('max_size_mb', None)
+
+        fulltext_cache = cache.get('fulltext', {}) or {}
+        self.fulltext_cache_enabled = fulltext_cache.get('enabled', False)
+        self.fulltext_cache_path = fulltext_cache.get('path', None)
+        self.fulltext_cache_max_size_mb = fulltext_cache.get('max_size_mb', None)
+        self.fulltext_memory_items = fulltext_cache.get('memory_items', 256)
+
+        llm_cache = cache.get('llm', {}) or {}
+        self.llm_cache_enabled = llm_cache.get('enabled', False)
+        self.llm_cache_path = llm_cache.get('path', None)
+        self.llm_cache_ttl_hours = llm_cache.get('ttl_hours', None)
+        self.llm_cache_max_size_mb = llm_cache.get('max_size_mb', None)
+        self.llm_cache_skip_stages = llm_cache.get('skip_stages', list(DEFAULT_UNCACHED_STAGES))
+
 def load_batch_config(yaml_file: str) -> BatchProcessorConfig:
     """Load batch processing configuration from YAML file."""
     try:
@@ -98,6 +173,83 @@ def merge_configs(global_config: dict, request_config: dict) -> dict:
             merged[key] = value
     return merged
 
+def request_priority(req_data: Dict[str, Any]) -> float:
+    """The request's optional `priority` (higher runs first); 0 if missing or invalid."""
+    priority = req_data.get('priority', 0)
+    try:
+        return float(priority or 0)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid priority {priority!r} for request '{req_data.get('id', '')}'")
+        return 0.0
+
+class RequestScheduler:
+    """
+    Runs a batch of jobs with at most `max_concurrent` in flight.
+
+    Jobs start in descending priority order (ties keep their input order), and a
+    new job starts as soon as a running one finishes. Limiting whole requests keeps
+    sessions, browsers and full texts of only a few requests in memory at a time;
+    the process-wide stage caps (see stage_semaphore) then bound the search, scrape
+    and LLM calls those requests make together.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+
+    async def run(
+        self,
+        jobs: List[Callable[[], Awaitable[T]]],
+        priorities: Optional[List[float]] = None,
+        on_result: Optional[Callable[[int, T], None]] = None
+    ) -> List[T]:
+        """
+        Run `jobs` (coroutine factories) and return their results in input order.
+
+        Args:
+            jobs: Callables returning the coroutine to run for each job
+            priorities: Priority per job, higher first (default: all equal)
+            on_result: Called with (job index, result) as each job completes; results
+                are then handed over instead of collected
+
+        Returns:
+            The result of each job, in the order of `jobs` (empty with `on_result`)
+        """
+        priorities = priorities or [0.0] * len(jobs)
+        queue = [(-priority, index) for index, priority in enumerate(priorities)]
+        heapq.heapify(queue)
+        results: List[Any] = [None] * len(jobs) if on_result is None else []
+
+        async def worker() -> None:
+            while queue:
+                _, index = heapq.heappop(queue)
+                result = await jobs[index]()
+                if on_result is not None:
+                    on_result(index, result)
+                else:
+                    results[index] = result
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrent, len(jobs)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return results
+
+def request_id_for(req_data: Dict[str, Any]) -> str:
+    """The request's `id`, or one made from the first words of its (first) query."""
+    request_id = req_data.get('id', '')
+    if not request_id:
+        queries = req_data.get('queries')
+        if isinstance(queries, list) and queries:
+            user_query = str(queries[0])
+        else:
+            user_query = str(req_data.get('query', ''))
+        request_id = "_".join(user_query.split()[:5]) or "unnamed_request"
+    return str(request_id).strip()
+
 async def analyze_single_request(
     req_data: Dict[str, Any],
     global_config: Dict[str, Any]
@@ -105,6 +257,10 @@ async def analyze_single_request(
     """
     Process a single request asynchronously.
     Returns (request_id, analysis_dict).
+
+    If checkpointing is enabled, a request already completed with the same request
+    data and config is returned from its checkpoint, and an unfinished one picks up
+    after its last checkpointed stage.
     """
     # Prepare config merges
     req_config = req_data.get('config', {})
@@ -120,56 +276,67 @@ async def analyze_single_request(
             return "empty_query", {"error": "Empty query."}
         user_query = query_text
 
-    # Determine request_id
-    request_id = req_data.get('id', '')
-    if not request_id:
-        if isinstance(user_query, list):
-            request_id = "_".join(user_query[0].split()[:5]) or "unnamed_request"
-        else:
-            request_id = "_".join(user_query.split()[:5]) or "unnamed_request"
-
-    request_id = request_id.strip()
+    request_id = request_id_for(req_data)
 
     # Extra ranking guidance
     ranking_text = req_data.get('ranking_guidance', '').strip()
 
+    checkpoint = None
+    store = get_checkpoint_store()
+    if store is not None:
+        checkpoint = RequestCheckpoint(store, f"{request_id}:{request_fingerprint(req_data, merged_config)}")
+        finished = checkpoint.load(RESULT_STAGE)
+        if finished is not None:
+            logger.info(f"Request '{request_id}' already completed, using its checkpointed result")
+            return request_id, finished
+
     try:
         # Actually call the analyze_request function
-        analysis = await analyze_request(
-            query=user_query,
-            ranking_guidance=ranking_text,
-            exclusion_criteria=req_data.get('exclusion_criteria', {}),
-            data_extraction_schema=req_data.get('information_extraction', {}),
-            num_queries=merged_config["processing"]["num_queries"],
-            papers_per_query=merged_config["processing"]["papers_per_query"],
-            num_papers_to_return=merged_config["processing"]["num_papers_to_return"],
-            config=merged_config
-        )
+        with use_checkpoint(checkpoint):
+            analysis = await analyze_request(
+                query=user_query,
+                ranking_guidance=ranking_text,
+                exclusion_criteria=req_data.get('exclusion_criteria', {}),
+                data_extraction_schema=req_data.get('information_extraction', {}),
+                num_queries=merged_config["processing"]["num_queries"],
+                papers_per_query=merged_config["processing"]["papers_per_query"],
+                num_papers_to_return=merged_config["processing"]["num_papers_to_return"],
+                config=merged_config
+            )
         # Convert to dict
         if isinstance(analysis, RequestAnalysis):
-            return request_id, analysis.to_dict()
+            result = analysis.to_dict()
         else:
             # Should rarely happen, but if it returns some other format
-            return request_id, analysis
+            result = analysis
+        if checkpoint is not None:
+            checkpoint.save(RESULT_STAGE, result)
+        return request_id, result
 
     except Exception as e:
         logger.error(f"Error analyzing request '{request_id}': {str(e)}", exc_info=True)
         return request_id, {"error": str(e)}
 
-async def process_all_requests_parallel(
-    requests_data: List[Dict[str, Any]],
-    config: BatchProcessorConfig
-) -> Dict[str, Any]:
-    """
-    Process ALL requests in parallel (instead of sequentially).
-    Returns a dict: { request_id: analysis_dict, ... }
-    """
-    # Build the shared "global_config" from BatchProcessorConfig
-    global_config = {
+def build_global_config(config: BatchProcessorConfig) -> Dict[str, Any]:
+    """Build the shared "global_config" that every request's config is merged into."""
+    return {
         "processing": {
             "num_queries": config.num_queries,
             "papers_per_query": config.papers_per_query,
-            "num_papers_to_return": config.num_papers_to_return
+            "num_papers_to_return": config.num_papers_to_return,
+            "abstract_screening": config.abstract_screening,
+            "combined_query_formulation": config.combined_query_formulation,
+            "streaming_pipeline": config.streaming_pipeline,
+            "stream_quorum": config.stream_quorum,
+            "stream_deadline": config.stream_deadline,
+            "subquery_concurrency": config.subquery_concurrency,
+            "ranking_tokens_per_paper": config.ranking_tokens_per_paper,
+            "analysis_token_budget": config.analysis_token_budget,
+            "passage_top_k": config.passage_top_k,
+            "exclusion_batch_size": config.exclusion_batch_size,
+            "exclusion_batch_tokens": config.exclusion_batch_tokens,
+            "prerank_top_m": config.prerank_top_m,
+            "adaptive_ranking": config.adaptive_ranking
         },
         "logging": {"level": config.log_level},
         "search": {
@@ -179,13 +346,53 @@ async def process_all_requests_parallel(
         }
     }
 
-    # Create a separate coroutine task for each request
-    tasks = []
-    for req_data in requests_data:
-        tasks.append(analyze_single_request(req_data, global_config))
+async def _shutdown_browser_pool() -> None:
+    browser_stats = await shutdown_browser_pool()
+    if browser_stats:
+        logger.info(
+            f"Browser pool: {browser_stats['pages_served']} pages served by "
+            f"{browser_stats['launches']} browser launches"
+        )
+
+def _configure_stage_limits(config: BatchProcessorConfig) -> None:
+    configure_stage_limits(
+        search=config.search_concurrency,
+        scrape=config.scrape_concurrency,
+        llm=config.llm_concurrency
+    )
 
-    # Run them all in parallel
-    results_list = await asyncio.gather(*tasks, return_exceptions=False)
+async def process_all_requests_parallel(
+    requests_data: List[Dict[str, Any]],
+    config: BatchProcessorConfig,
+    on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Process all requests concurrently, with at most `config.max_concurrent_requests`
+    in flight, higher-priority requests first.
+    Returns a dict: { request_id: analysis_dict, ... }
+
+    With `on_result`, each (request_id, analysis_dict) is passed to it as soon as the
+    request completes and nothing is kept in memory; the returned dict is then empty.
+    """
+    global_config = build_global_config(config)
+
+    _configure_stage_limits(config)
+    jobs = [
+        lambda req_data=req_data: analyze_single_request(req_data, global_config)
+        for req_data in requests_data
+    ]
+    priorities = [request_priority(req_data) for req_data in requests_data]
+
+    # The browser pool is shared by all requests and closed once at the end
+    try:
+        scheduler = RequestScheduler(config.max_concurrent_requests)
+        results_list = await scheduler.run(
+            jobs,
+            priorities,
+            on_result=(lambda index, item: on_result(*item)) if on_result is not None else None
+        )
+    finally:
+        await _shutdown_browser_pool()
     # results_list is a list of (request_id, analysis_dict)
 
     # Convert to a dict
@@ -195,60 +402,399 @@ async def process_all_requests_parallel(
 
     return results_dict
 
+def enqueue_requests(
+    queue: JobQueue,
+    requests_data: List[Dict[str, Any]],
+    config: BatchProcessorConfig,
+    fresh: bool = False
+) -> int:
+    """
+    Add the batch's requests to `queue`, keyed like their checkpoints (request ID plus
+    a fingerprint of the request and merged config). Requests already in the queue are
+    skipped, so every worker host can enqueue the same YAML. With `fresh`, the jobs and
+    results of earlier runs are discarded first (see JobQueue.replace). Returns the
+    number added.
+    """
+    global_config = build_global_config(config)
+    jobs = []
+    for req_data in requests_data:
+        request_id = request_id_for(req_data)
+        merged_config = merge_configs(global_config, req_data.get('config', {}))
+        job_key = f"{request_id}:{request_fingerprint(req_data, merged_config)}"
+        jobs.append((job_key, request_id, req_data, global_config, request_priority(req_data)))
+    if fresh:
+        added = queue.replace(jobs)
+        logger.info(f"Started a fresh queue of {added} requests in {queue.path}")
+    else:
+        added = queue.enqueue(jobs)
+        logger.info(f"Enqueued {added} of {len(requests_data)} requests in {queue.path} (the rest were already queued)")
+    return added
+
+async def process_queue(queue: JobQueue, config: BatchProcessorConfig) -> int:
+    """
+    Work through `queue` as one worker, with up to `config.max_concurrent_requests`
+    requests in flight, until every job is done or failed. Returns the number of jobs
+    this worker completed.
+    """
+    _configure_stage_limits(config)
+
+    async def process(req_data: Dict[str, Any], global_config: Dict[str, Any]) -> Dict[str, Any]:
+        _, analysis_dict = await analyze_single_request(req_data, global_config)
+        if isinstance(analysis_dict, dict) and "error" in analysis_dict:
+            # Raise so the job is released and retried instead of stored as done
+            raise RuntimeError(analysis_dict["error"])
+        return analysis_dict
+
+    try:
+        return await run_queue_worker(
+            queue,
+            process,
+            max_concurrent=config.max_concurrent_requests,
+            poll_interval=config.queue_poll_interval
+        )
+    finally:
+        await _shutdown_browser_pool()
+
+def _open_queue(queue_path: str, config: BatchProcessorConfig) -> JobQueue:
+    return JobQueue(queue_path, lease_seconds=config.queue_lease_seconds, max_attempts=config.queue_max_attempts)
+
+def concise_result(req_id: str, analysis_dict: Any, default_num_papers: int = 5) -> Dict[str, Any]:
+    """
+    Create a shortened/concise version of one request's top papers.
+    """
+    if not isinstance(analysis_dict, dict):
+        # e.g. error
+        return {"error": "Not a dict result"}
+
+    ranked_papers = analysis_dict.get('ranked_papers', [])
+    # Figure out how many top papers to show
+    # We'll see if parameters => num_papers_to_return is present
+    all_params = analysis_dict.get('parameters', {})
+    n = all_params.get('num_papers_to_return', default_num_papers)
+
+    # Just pick the first `n` from the 'ranked_papers' array
+    top_papers = ranked_papers[:n]
+    concise_papers = []
+
+    for paper in top_papers:
+        # The stored `paper` might be a dict
+        # We only want a small subset of fields
+        paper_dict = {
+            'title': paper.get('title', 'Unknown'),
+            'authors': paper.get('authors', []),
+            'year': paper.get('year', None),
+            'relevance_score': paper.get('relevance_score'),
+            'relevance_uncertainty': paper.get('relevance_uncertainty'),
+            'analysis': paper.get('analysis', ''),
+            'relevant_quotes': paper.get('relevant_quotes', [])[:3],
+            'exclusion_criteria_result': paper.get('exclusion_criteria_result', {}),
+            'extraction_result': paper.get('extraction_result', {}),
+        }
+        concise_papers.append(paper_dict)
+
+    return {
+        'request_id': req_id,
+        'parameters': all_params,
+        'top_papers': concise_papers,
+        'num_total_papers': len(ranked_papers),
+        'timestamp': analysis_dict.get('timestamp', datetime.now().isoformat())
+    }
+
 def extract_concise_results(results: Dict[str, Any], default_num_papers: int = 5) -> Dict[str, Any]:
     """
     Create a shortened/concise version of each request's top papers.
     """
-    from .models import RequestAnalysis, RankedPaper
-    concise_results = {}
-
-    for req_id, analysis_dict in results.items():
-        if not isinstance(analysis_dict, dict):
-            # e.g. error
-            concise_results[req_id] = {"error": "Not a dict result"}
-            continue
-
-        ranked_papers = analysis_dict.get('ranked_papers', [])
-        # Figure out how many top papers to show
-        # We'll see if parameters => num_papers_to_return is present
-        all_params = analysis_dict.get('parameters', {})
-        n = all_params.get('num_papers_to_return', default_num_papers)
-
-        # Just pick the first `n` from the 'ranked_papers' array
-        top_papers = ranked_papers[:n]
-        concise_papers = []
-
-        for paper in top_papers:
-            # The stored `paper` might be a dict
-            # We only want a small subset of fields
-            paper_dict = {
-                'title': paper.get('title', 'Unknown'),
-                'authors': paper.get('authors', []),
-                'year': paper.get('year', None),
-                'relevance_score': paper.get('relevance_score'),
-                'analysis': paper.get('analysis', ''),
-                'relevant_quotes': paper.get('relevant_quotes', [])[:3],
-                'exclusion_criteria_result': paper.get('exclusion_criteria_result', {}),
-                'extraction_result': paper.get('extraction_result', {}),
-            }
-            concise_papers.append(paper_dict)
-
-        concise_results[req_id] = {
-            'request_id': req_id,
-            'parameters': all_params,
-            'top_papers': concise_papers,
-            'num_total_papers': len(ranked_papers),
-            'timestamp': analysis_dict.get('timestamp', datetime.now().isoformat())
-        }
+    return {
+        req_id: concise_result(req_id, analysis_dict, default_num_papers)
+        for req_id, analysis_dict in results.items()
+    }
 
-    return concise_results
+def shard_requests(requests_data: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """
+    Split requests into at most `workers` shards, dealing them round-robin in priority
+    order so every shard gets a similar mix of high- and low-priority requests.
+    """
+    order = sorted(range(len(requests_data)), key=lambda i: -request_priority(requests_data[i]))
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(max(1, workers))]
+    for position, index in enumerate(order):
+        shards[position % len(shards)].append(requests_data[index])
+    return [shard for shard in shards if shard]
+
+def _checkpoint_path(config: BatchProcessorConfig, output_dir: str) -> str:
+    return config.checkpoint_path or os.path.join(output_dir, 'checkpoints.sqlite')
+
+def _open_run_resources(
+    config: BatchProcessorConfig,
+    output_dir: str,
+    resume: bool,
+    shared_fulltext: bool = False
+) -> None:
+    """Enable the caches, checkpoint store and full-text store configured for a run."""
+    if config.http_cache_enabled:
+        configure_response_cache(
+            path=config.http_cache_path or os.path.join(output_dir, 'cache', 'http_responses.sqlite'),
+            ttl_seconds=config.http_cache_ttl_hours * 3600 if config.http_cache_ttl_hours else None,
+            max_size_bytes=config.http_cache_max_size_mb * 1024 * 1024 if config.http_cache_max_size_mb else None
+        )
+
+    if config.llm_cache_enabled:
+        configure_llm_cache(
+            path=config.llm_cache_path or os.path.join(output_dir, 'cache', 'llm_responses.sqlite'),
+            max_size_bytes=config.llm_cache_max_size_mb * 1024 * 1024 if config.llm_cache_max_size_mb else None,
+            ttl_seconds=config.llm_cache_ttl_hours * 3600 if config.llm_cache_ttl_hours else None,
+            uncached_stages=config.llm_cache_skip_stages
+        )
 
-def batch_analyze_requests(yaml_file: str) -> None:
+    if config.checkpoint_enabled:
+        configure_checkpoint_store(_checkpoint_path(config, output_dir), resume=resume)
+    elif resume:
+        logger.warning("Resume requested but checkpoints are disabled; running every request")
+
+    # Full texts are always shared in memory across requests; on disk only if enabled,
+    # or when worker processes need to share them
+    configure_fulltext_store(
+        path=(config.fulltext_cache_path or os.path.join(output_dir, 'cache', 'full_texts.sqlite'))
+        if config.fulltext_cache_enabled or shared_fulltext else None,
+        memory_items=config.fulltext_memory_items,
+        max_size_bytes=config.fulltext_cache_max_size_mb * 1024 * 1024 if config.fulltext_cache_max_size_mb else None
+    )
+
+def _close_run_resources() -> None:
+    """Close everything _open_run_resources enabled and log their statistics."""
+    http_cache_stats = close_response_cache()
+    if http_cache_stats:
+        logger.info(
+            f"HTTP cache: {http_cache_stats['hits']} hits, {http_cache_stats['misses']} misses, "
+            f"{http_cache_stats['entries']} entries stored"
+        )
+    llm_cache_stats = close_llm_cache()
+    if llm_cache_stats:
+        logger.info(
+            f"LLM cache: {llm_cache_stats['hits']} hits, {llm_cache_stats['misses']} misses, "
+            f"{llm_cache_stats['entries']} entries stored"
+        )
+    close_pdf_extractor()
+    checkpoint_stats = close_checkpoint_store()
+    if checkpoint_stats:
+        logger.info(
+            f"Checkpoints: {checkpoint_stats['hits']} loaded, "
+            f"{checkpoint_stats['saved']} saved ({checkpoint_stats['entries']} stored)"
+        )
+    fulltext_stats = close_fulltext_store()
+    if fulltext_stats:
+        logger.info(
+            f"Full-text store: {fulltext_stats['hits']} hits, {fulltext_stats['misses']} scrapes, "
+            f"{fulltext_stats['coalesced']} coalesced lookups"
+        )
+
+def _run_requests(
+    requests_data: List[Dict[str, Any]],
+    config: BatchProcessorConfig,
+    full_jsonl_path: str,
+    concise_jsonl_path: str
+) -> int:
+    """
+    Run requests on a new event loop, writing each result (and its concise version) as
+    it completes. Returns the number of results written.
+    """
+    with JSONLResultWriter(full_jsonl_path) as full_writer, \
+            JSONLResultWriter(concise_jsonl_path) as concise_writer:
+        def write_result(request_id: str, analysis_dict: Dict[str, Any]) -> None:
+            full_writer.write(request_id, analysis_dict)
+            concise_writer.write(
+                request_id, concise_result(request_id, analysis_dict, config.num_papers_to_return)
+            )
+
+        _run_in_new_loop(process_all_requests_parallel(requests_data, config, on_result=write_result))
+    logger.info(f"Streamed {full_writer.written} results to {full_jsonl_path}")
+    return full_writer.written
+
+def _worker_jsonl_paths(output_dir: str, worker_index: int) -> Tuple[str, str]:
+    return (
+        os.path.join(output_dir, f'full_results.worker{worker_index}.jsonl'),
+        os.path.join(output_dir, f'concise_results.worker{worker_index}.jsonl'),
+    )
+
+def _configure_worker_process(config: BatchProcessorConfig, output_dir: str, worker_index: int, workers: int) -> None:
+    """Per-process setup of a worker: its own log file and its share of the rate limits and PDF pool."""
+    configure_logging(
+        log_file=os.path.join(output_dir, f'batch_process.worker{worker_index}.log'),
+        console_level=config.log_level
+    )
+    configure_shared_rate_limits(os.path.join(output_dir, 'cache', 'rate_limits.sqlite'))
+    configure_llm_rate_limit(LLM_REQUESTS_PER_MINUTE / workers)
+    GlobalSearchConfig.pdf_workers = min(GlobalSearchConfig.pdf_workers, max(1, (os.cpu_count() or 1) // workers))
+
+def _reset_checkpoints(config: BatchProcessorConfig, output_dir: str) -> None:
+    """Discard an earlier run's checkpoints once, before worker processes open the store with resume."""
+    if config.checkpoint_enabled:
+        configure_checkpoint_store(_checkpoint_path(config, output_dir), resume=False)
+        close_checkpoint_store()
+
+def _run_worker_shard(
+    shard: List[Dict[str, Any]],
+    config: BatchProcessorConfig,
+    output_dir: str,
+    worker_index: int,
+    workers: int
+) -> int:
+    """
+    Entry point of a worker process: analyze one shard of the batch on its own event
+    loop. Host rate limits are shared with the other workers through a SQLite file, the
+    LLM request rate and PDF extraction pool are this worker's share of the machine's,
+    and caches, full texts and checkpoints go through the run's SQLite files.
+    """
+    _configure_worker_process(config, output_dir, worker_index, workers)
+    logger.info(f"Worker {worker_index}: {len(shard)} requests")
+    try:
+        # The parent process already reset the checkpoints if this is not a resumed run
+        _open_run_resources(config, output_dir, resume=True, shared_fulltext=True)
+        return _run_requests(shard, config, *_worker_jsonl_paths(output_dir, worker_index))
+    finally:
+        _close_run_resources()
+
+def _run_workers(
+    requests_data: List[Dict[str, Any]],
+    config: BatchProcessorConfig,
+    output_dir: str,
+    resume: bool,
+    workers: int,
+    full_jsonl_path: str,
+    concise_jsonl_path: str
+) -> None:
+    """Run the batch in worker processes, one shard each, and merge their JSONL results."""
+    if not resume:
+        _reset_checkpoints(config, output_dir)
+
+    shards = shard_requests(requests_data, workers)
+    logger.info(f"Running {len(requests_data)} requests in {len(shards)} worker processes")
+    # Spawned (not forked) workers start without the parent's event loop, threads and sessions
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as pool:
+        futures = [
+            pool.submit(_run_worker_shard, shard, config, output_dir, index, len(shards))
+            for index, shard in enumerate(shards)
+        ]
+        for index, future in enumerate(futures):
+            try:
+                future.result()
+            except Exception as e:
+                # Its finished requests are still merged below and checkpointed for --resume
+                logger.error(f"Worker {index} failed: {str(e)}", exc_info=True)
+
+    worker_paths = [_worker_jsonl_paths(output_dir, index) for index in range(len(shards))]
+    merge_jsonl([full for full, _ in worker_paths], full_jsonl_path)
+    merge_jsonl([concise for _, concise in worker_paths], concise_jsonl_path)
+    for paths in worker_paths:
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+def _run_queue_worker_process(
+    queue_path: str,
+    config: BatchProcessorConfig,
+    output_dir: str,
+    worker_index: int,
+    workers: int
+) -> int:
+    """Entry point of a worker process in queue mode (see _run_worker_shard for what is shared)."""
+    _configure_worker_process(config, output_dir, worker_index, workers)
+    queue = _open_queue(queue_path, config)
+    try:
+        # Queue workers always share checkpoints, so a re-leased job continues where the lost worker stopped
+        _open_run_resources(config, output_dir, resume=True, shared_fulltext=True)
+        return _run_in_new_loop(process_queue(queue, config))
+    finally:
+        _close_run_resources()
+        queue.close()
+
+def _run_in_new_loop(coroutine: Awaitable[T]) -> T:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+def _run_queue(
+    queue_path: str,
+    requests_data: List[Dict[str, Any]],
+    config: BatchProcessorConfig,
+    output_dir: str,
+    resume: bool,
+    workers: int,
+    full_jsonl_path: str,
+    concise_jsonl_path: str
+) -> None:
+    """
+    Enqueue the batch, work on the queue (in this process or `workers` worker
+    processes) until it is drained, then write every finished result from the queue.
+
+    Without `resume`, this process starts the queue afresh and resets the checkpoints;
+    other hosts join the run with `resume`.
+    """
+    queue = _open_queue(queue_path, config)
+    try:
+        enqueue_requests(queue, requests_data, config, fresh=not resume)
+        if not resume:
+            # Only after the queue was started afresh: a refused joiner must not wipe the checkpoints
+            _reset_checkpoints(config, output_dir)
+        if workers > 1:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(_run_queue_worker_process, queue_path, config, output_dir, index, workers)
+                    for index in range(workers)
+                ]
+                for index, future in enumerate(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # Its leased jobs expire and are picked up by the other workers
+                        logger.error(f"Worker {index} failed: {str(e)}", exc_info=True)
+        else:
+            # Checkpoints were reset above if this is not a resumed run
+            _open_run_resources(config, output_dir, resume=True)
+            _run_in_new_loop(process_queue(queue, config))
+
+        counts = queue.counts()
+        logger.info(f"Queue status: {counts}")
+        with JSONLResultWriter(full_jsonl_path) as full_writer, \
+                JSONLResultWriter(concise_jsonl_path) as concise_writer:
+            for request_id, analysis_dict in queue.results():
+                full_writer.write(request_id, analysis_dict)
+                concise_writer.write(
+                    request_id, concise_result(request_id, analysis_dict, config.num_papers_to_return)
+                )
+        logger.info(f"Wrote {full_writer.written} results from the queue to {full_jsonl_path}")
+    finally:
+        queue.close()
+
+def batch_analyze_requests(
+    yaml_file: str,
+    resume: bool = False,
+    workers: int = 1,
+    queue_path: Optional[str] = None
+) -> None:
     """
     Main entry point: 
     1) Loads config + requests from YAML
-    2) Runs them all in parallel
-    3) Saves full results and concise results into separate JSON files
+    2) Runs them concurrently through the request scheduler
+    3) Streams full and concise results to JSONL files as each request completes,
+       then converts them into the pretty-printed JSON files
+
+    Each finished request (and stage) is checkpointed in the results folder. With
+    `resume`, the checkpoints of the previous run are kept: completed requests are not
+    analyzed again and interrupted ones continue from their last finished stage.
+
+    With `workers` > 1, the requests are sharded across that many worker processes,
+    each with its own event loop and scheduler, and their results merged.
+
+    With `queue_path` (or `queue.path` in the YAML), the requests are instead put in a
+    durable SQLite job queue that any number of worker processes and hosts pull from
+    (see job_queue.py); this call enqueues the batch, works on it until it is drained
+    and writes the results of every finished job. Running the same call on several
+    hosts sharing the file spreads the batch over all of them.
     """
     try:
         yaml_dir = os.path.dirname(os.path.abspath(yaml_file))
@@ -270,16 +816,18 @@ def batch_analyze_requests(yaml_file: str) -> None:
             logger.warning("No requests to process. Exiting.")
             return
 
-        # Run all requests concurrently
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            all_results = loop.run_until_complete(process_all_requests_parallel(requests_data, config))
-        finally:
-            loop.close()
-
-        # Generate a "concise" version
-        concise_results = extract_concise_results(all_results, default_num_papers=config.num_papers_to_return)
+        full_jsonl_path = os.path.join(output_dir, 'full_results.jsonl')
+        concise_jsonl_path = os.path.join(output_dir, 'concise_results.jsonl')
+        queue_path = queue_path or config.queue_path
+        if queue_path:
+            _run_queue(
+                queue_path, requests_data, config, output_dir, resume, workers, full_jsonl_path, concise_jsonl_path
+            )
+        elif workers > 1:
+            _run_workers(requests_data, config, output_dir, resume, workers, full_jsonl_path, concise_jsonl_path)
+        else:
+            _open_run_resources(config, output_dir, resume)
+            _run_requests(requests_data, config, full_jsonl_path, concise_jsonl_path)
 
         # Save full and concise results in separate JSON files
         timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -288,22 +836,28 @@ def batch_analyze_requests(yaml_file: str) -> None:
         full_path = os.path.join(output_dir, full_filename)
         concise_path = os.path.join(output_dir, concise_filename)
 
-        with open(full_path, 'w', encoding='utf-8') as f:
-            json.dump(all_results, f, ensure_ascii=False, indent=2, default=str)
+        jsonl_to_json(full_jsonl_path, full_path)
         logger.info(f"Saved full results to file: {full_path}")
 
-        with open(concise_path, 'w', encoding='utf-8') as f:
-            json.dump(concise_results, f, ensure_ascii=False, indent=2, default=str)
+        jsonl_to_json(concise_jsonl_path, concise_path)
         logger.info(f"Saved concise results to file: {concise_path}")
 
     except Exception as e:
         logger.error(f"Batch processing failed: {str(e)}", exc_info=True)
     finally:
+        _close_run_resources()
         logger.info("Batch processing completed.")
 
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Analyze the research requests of a YAML file.")
+    parser.add_argument("yaml_file", help="YAML file with the batch config and requests")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes to shard the requests across")
+    parser.add_argument("--resume", action="store_true", help="Keep the previous run's checkpoints and skip finished work")
+    parser.add_argument("--queue", metavar="PATH", help="SQLite job queue shared with other workers (enables queue mode)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    batch_analyze_requests(args.yaml_file, resume=args.resume, workers=args.workers, queue_path=args.queue)
 
 if __name__ == "__main__":
-    # Example usage / test
-    batch_analyze_requests(
-        r"C:\Users\bryan\OneDrive\Documents\Projects\ACADEMIC LITERATURE UTILITIES\academic-claim-analyzer\queries\kendall_edits.yaml"
-    )
\ No newline at end of file
+    main()
@@ -0,0 +1,216 @@
+# academic_claim_analyzer/browser_pool.py
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+
+from .search.search_config import GlobalSearchConfig
+
+logger = logging.getLogger(__name__)
+
+# Hosts whose requests never contribute to a paper's text
+BLOCKED_HOST_FRAGMENTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google",
+    "facebook.net",
+    "hotjar.com",
+    "scorecardresearch.com",
+    "adnxs.com",
+    "criteo.com",
+)
+
+def should_block_request(resource_type: str, url: str) -> bool:
+    """Whether a page sub-request can be aborted without losing any text content."""
+    if resource_type in GlobalSearchConfig.browser_blocked_resource_types:
+        return True
+    host = (urlparse(url).hostname or "").lower()
+    return any(fragment in host for fragment in BLOCKED_HOST_FRAGMENTS)
+
+async def _route_handler(route: Any) -> None:
+    request = route.request
+    if should_block_request(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+class _PooledContext:
+    """A browser context with a single page, reused until it has served `max_uses` pages."""
+
+    def __init__(self, context: Any, page: Any):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+    async def close(self) -> None:
+        try:
+            await self.context.close()
+        except Exception:
+            pass
+
+class _BrowserSlot:
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Any = None
+        self.idle: List[_PooledContext] = []
+        self.active = 0
+        self.lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+class BrowserPool:
+    """
+    A fixed set of headless Chromium browsers shared by every scraper in the process.
+
+    Pages are handed out through `page()`; their contexts are kept and reused (up to
+    GlobalSearchConfig.browser_context_max_uses pages each) instead of being created
+    per URL. Images, fonts, media and known ad/analytics hosts are blocked at the
+    routing layer. A browser that crashes or disconnects is relaunched on the next
+    request routed to it.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        pages_per_browser: Optional[int] = None,
+        context_max_uses: Optional[int] = None
+    ):
+        self.size = size or GlobalSearchConfig.browser_pool_size
+        self.pages_per_browser = pages_per_browser or GlobalSearchConfig.browser_pages_per_browser
+        self.context_max_uses = context_max_uses or GlobalSearchConfig.browser_context_max_uses
+        self.loop = asyncio.get_running_loop()
+        self.launches = 0
+        self.pages_served = 0
+        self._playwright: Any = None
+        self._start_lock = asyncio.Lock()
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        self._capacity = asyncio.Semaphore(self.size * self.pages_per_browser)
+        self._closed = False
+
+    async def _ensure_playwright(self) -> None:
+        async with self._start_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+    async def _ensure_browser(self, slot: _BrowserSlot) -> Any:
+        async with slot.lock:
+            if slot.alive:
+                return slot.browser
+            if slot.browser is not None:
+                logger.warning(f"Browser {slot.index} disconnected; relaunching")
+                for pooled in slot.idle:
+                    await pooled.close()
+                slot.idle.clear()
+            await self._ensure_playwright()
+            slot.browser = await self._playwright.chromium.launch(headless=True)
+            self.launches += 1
+            return slot.browser
+
+    async def _new_context(self, browser: Any, user_agent: Optional[str]) -> _PooledContext:
+        context = await browser.new_context(
+            user_agent=user_agent,
+            viewport={"width": 1920, "height": 1080},
+            ignore_https_errors=True,
+        )
+        await context.route("**/*", _route_handler)
+        page = await context.new_page()
+        return _PooledContext(context, page)
+
+    def _pick_slot(self) -> _BrowserSlot:
+        return min(self._slots, key=lambda slot: (slot.active, slot.index))
+
+    @asynccontextmanager
+    async def page(self, user_agent: Optional[str] = None) -> AsyncIterator[Any]:
+        """
+        Borrow a page from the pool for the duration of the `async with` block.
+
+        Args:
+            user_agent: User agent for a newly created context (reused contexts keep theirs)
+
+        Yields:
+            A Playwright Page
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool has been shut down")
+
+        async with self._capacity:
+            slot = self._pick_slot()
+            slot.active += 1
+            pooled = None
+            healthy = False
+            try:
+                browser = await self._ensure_browser(slot)
+                pooled = slot.idle.pop() if slot.idle else await self._new_context(browser, user_agent)
+                pooled.uses += 1
+                self.pages_served += 1
+                yield pooled.page
+                healthy = slot.alive and not pooled.page.is_closed()
+            finally:
+                slot.active -= 1
+                if pooled is not None:
+                    if healthy and not self._closed and pooled.uses < self.context_max_uses:
+                        slot.idle.append(pooled)
+                    else:
+                        await pooled.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "browsers": sum(1 for slot in self._slots if slot.alive),
+            "launches": self.launches,
+            "pages_served": self.pages_served,
+            "idle_contexts": sum(len(slot.idle) for slot in self._slots),
+        }
+
+    async def close(self) -> None:
+        """Close every browser and stop the Playwright driver."""
+        self._closed = True
+        for slot in self._slots:
+            for pooled in slot.idle:
+                await pooled.close()
+            slot.idle.clear()
+            if slot.browser is not None:
+                try:
+                    await slot.browser.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser {slot.index}: {str(e)}")
+                slot.browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Playwright: {str(e)}")
+            self._playwright = None
+
+# Process-wide pool, bound to the event loop it was created on.
+_browser_pool: Optional[BrowserPool] = None
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Return the process-wide browser pool, creating it (lazily, no browser is launched
+    until the first page is requested) on the running event loop.
+    """
+    global _browser_pool
+    loop = asyncio.get_running_loop()
+    if _browser_pool is None or _browser_pool.loop is not loop or _browser_pool._closed:
+        # Playwright objects cannot cross event loops; a pool left on a finished loop is dropped.
+        _browser_pool = BrowserPool()
+    return _browser_pool
+
+async def shutdown_browser_pool() -> Optional[Dict[str, Any]]:
+    """Close the process-wide pool and return its statistics (None if it was never used)."""
+    global _browser_pool
+    pool = _browser_pool
+    _browser_pool = None
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        return None
+    stats = pool.stats()
+    await pool.close()
+    return stats
@@ -0,0 +1,144 @@
+# academic_claim_analyzer/cache_store.py
+
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Optional, Any
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+class SQLiteBlobStore:
+    """
+    A small persistent key/value store for zstd-compressed blobs, backed by SQLite.
+
+    Entries older than `ttl_seconds` are treated as misses, and once the stored
+    (compressed) payload grows past `max_size_bytes` the least recently used entries
+    are evicted. SQLite's WAL mode lets several coroutines, threads or processes share
+    one file safely.
+
+    Every call does blocking SQLite I/O and (de)compression; async code should run
+    it off the event loop with asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "blobs",
+        max_size_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+        compression_level: int = 3
+    ):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)")
+        self._size = self._total_size()
+
+    def _total_size(self) -> int:
+        row = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        return int(row[0])
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored value for `key`, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created = row
+            if self.ttl_seconds is not None and now - created > self.ttl_seconds:
+                self._delete_locked(key)
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        try:
+            return self._decompressor.decompress(value)
+        except zstandard.ZstdError as e:
+            logger.warning(f"Cache: corrupt entry in {self.table}, dropping it: {str(e)}")
+            self.delete(key)
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store `value` under `key`, evicting least recently used entries if needed."""
+        compressed = self._compressor.compress(value)
+        now = time.time()
+        with self._lock:
+            # An overwritten entry no longer counts towards the size
+            replaced = self._stored_size(key)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, compressed, len(compressed), now, now)
+            )
+            self._size += len(compressed) - replaced
+            if self._size > self.max_size_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._delete_locked(key)
+
+    def _stored_size(self, key: str) -> int:
+        row = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _delete_locked(self, key: str) -> None:
+        self._size -= self._stored_size(key)
+        self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store is back under 90% of its budget."""
+        # Other processes may share the file, so re-read the real size first.
+        self._size = self._total_size()
+        target = int(self.max_size_bytes * 0.9)
+        if self._size <= target:
+            return
+        evicted = 0
+        rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed ASC").fetchall()
+        for key, size in rows:
+            if self._size <= target:
+                break
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._size -= size
+            evicted += 1
+        logger.debug(f"Cache: evicted {evicted} entries from {self.table}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "size_bytes": self._size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,151 @@
+# academic_claim_analyzer/checkpoint_store.py
+
+import os
+import sys
+import json
+import hashlib
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from .cache_store import SQLiteBlobStore
+from .models import Paper, RankedPaper, SearchQuery
+
+logger = logging.getLogger(__name__)
+
+RESULT_STAGE = "result"
+
+def request_fingerprint(req_data: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """
+    Short hash of a request and its merged config. Editing either gives the request a
+    new fingerprint, so its old checkpoints are not reused. `priority` only affects
+    scheduling and is left out.
+    """
+    request = {key: value for key, value in req_data.items() if key != "priority"}
+    canonical = json.dumps([request, config], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+def dump_papers(papers: List[Paper]) -> List[Dict[str, Any]]:
+    """JSON-ready form of papers, keeping whether each one is a RankedPaper."""
+    return [
+        {"ranked": isinstance(p, RankedPaper), "paper": p.model_dump(mode="json", exclude_none=True)}
+        for p in papers
+    ]
+
+def load_papers(items: List[Dict[str, Any]]) -> List[Paper]:
+    """Inverse of dump_papers."""
+    return [(RankedPaper if item["ranked"] else Paper).model_validate(item["paper"]) for item in items]
+
+def dump_queries(queries: List[SearchQuery]) -> List[Dict[str, Any]]:
+    return [q.model_dump(mode="json") for q in queries]
+
+def load_queries(items: List[Dict[str, Any]]) -> List[SearchQuery]:
+    return [SearchQuery.model_validate(item) for item in items]
+
+class CheckpointStore:
+    """
+    Persistent record of finished work in a batch run, so a crashed or interrupted
+    batch can be resumed without repeating searches and LLM calls.
+
+    Entries are JSON values keyed by request and stage. Unlike the caches, nothing is
+    ever evicted or expired: a checkpoint stays until the batch is started again
+    without resuming.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.store = SQLiteBlobStore(path, table="checkpoints", max_size_bytes=sys.maxsize)
+        self.saved = 0
+
+    @staticmethod
+    def make_key(request_key: str, stage: str) -> str:
+        return f"{request_key}/{stage}"
+
+    def load(self, request_key: str, stage: str) -> Optional[Any]:
+        """Return the checkpointed value of `stage` for a request, or None if it has none."""
+        value = self.store.get(self.make_key(request_key, stage))
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError as e:
+            logger.warning(f"Checkpoint: unreadable {stage} checkpoint for {request_key}, ignoring it: {str(e)}")
+            return None
+
+    def save(self, request_key: str, stage: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        self.store.set(self.make_key(request_key, stage), data)
+        self.saved += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.store.stats()
+        stats["saved"] = self.saved
+        return stats
+
+    def close(self) -> None:
+        self.store.close()
+
+class RequestCheckpoint:
+    """The checkpoints of one request; stages are named by the analyzer."""
+
+    def __init__(self, store: CheckpointStore, request_key: str):
+        self.store = store
+        self.request_key = request_key
+
+    def load(self, stage: str) -> Optional[Any]:
+        return self.store.load(self.request_key, stage)
+
+    def save(self, stage: str, value: Any) -> None:
+        try:
+            self.store.save(self.request_key, stage, value)
+        except Exception as e:
+            # A failed checkpoint only costs a rerun of this stage on resume
+            logger.warning(f"Checkpoint: could not save {stage} for {self.request_key}: {str(e)}")
+
+# Process-wide store; None means checkpointing is disabled.
+_checkpoint_store: Optional[CheckpointStore] = None
+
+# The checkpoint of the request being analyzed in the current task (see use_checkpoint).
+_current_checkpoint: ContextVar[Optional[RequestCheckpoint]] = ContextVar("current_checkpoint", default=None)
+
+def configure_checkpoint_store(path: str, resume: bool = False) -> CheckpointStore:
+    """
+    Enable checkpointing to the SQLite file at `path`. Without `resume`, checkpoints
+    left by an earlier run are discarded first.
+    """
+    global _checkpoint_store
+    if _checkpoint_store is not None:
+        _checkpoint_store.close()
+    if not resume:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    _checkpoint_store = CheckpointStore(path)
+    logger.info(f"Checkpoints {'resumed from' if resume else 'written to'} {path}")
+    return _checkpoint_store
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    return _checkpoint_store
+
+def close_checkpoint_store() -> Optional[Dict[str, Any]]:
+    """Disable checkpointing and return the store's statistics (None if it was not enabled)."""
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        return None
+    stats = _checkpoint_store.stats()
+    _checkpoint_store.close()
+    _checkpoint_store = None
+    return stats
+
+@contextmanager
+def use_checkpoint(checkpoint: Optional[RequestCheckpoint]) -> Iterator[None]:
+    """Make `checkpoint` the current one for this task and the tasks it starts."""
+    token = _current_checkpoint.set(checkpoint)
+    try:
+        yield
+    finally:
+        _current_checkpoint.reset(token)
+
+def current_checkpoint() -> Optional[RequestCheckpoint]:
+    return _current_checkpoint.get()
@@ -0,0 +1,178 @@
+# academic_claim_analyzer/context_packer.py
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .models import Paper
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+CHARS_PER_TOKEN = 4  # estimate used when the tiktoken encoding cannot be loaded
+ELLIPSIS = "\n[...]\n"
+
+CONCLUSION_HEADING = re.compile(
+    r"^\s*(?:\d+(?:\.\d+)*\.?\s*)?(?:conclusions?|concluding remarks|summary and conclusions?|"
+    r"conclusions? and (?:future work|outlook|recommendations)|discussion and conclusions?)\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+BACK_MATTER_HEADING = re.compile(
+    r"^\s*(?:\d+(?:\.\d+)*\.?\s*)?(?:references|bibliography|acknowledge?ments?|literature cited|"
+    r"declaration of competing interest|conflicts? of interest|funding|author contributions)\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+_encoding = None
+_encoding_failed = False
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+        except Exception as e:
+            # tiktoken downloads its BPE files on first use; offline we fall back to an estimate
+            logger.warning(f"tiktoken encoding unavailable, estimating token counts: {str(e)}")
+            _encoding_failed = True
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text` (estimated at ~4 characters per token without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens` tokens."""
+    if max_tokens <= 0 or not text:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+@dataclass
+class PackedContext:
+    """Paper content selected for a prompt, with its token accounting."""
+    text: str
+    tokens: int
+    original_tokens: int
+
+    @property
+    def truncated(self) -> bool:
+        return self.tokens < self.original_tokens
+
+def split_sections(full_text: str) -> Dict[str, str]:
+    """
+    Split a scraped full text into "body" and "conclusions", dropping back matter
+    (references, acknowledgements, ...) when its heading can be found.
+    """
+    back_matter = BACK_MATTER_HEADING.search(full_text)
+    main = full_text[:back_matter.start()] if back_matter and back_matter.start() > len(full_text) // 3 else full_text
+
+    conclusion = None
+    for conclusion in CONCLUSION_HEADING.finditer(main):
+        pass  # keep the last match; earlier ones are usually tables of contents
+    if conclusion is None:
+        return {"body": main.strip(), "conclusions": ""}
+    return {
+        "body": main[:conclusion.start()].strip(),
+        "conclusions": main[conclusion.end():].strip(),
+    }
+
+def pack_paper(paper: Paper, budget: int) -> PackedContext:
+    """
+    Fit a paper's content into `budget` tokens.
+
+    Papers that fit are passed through unchanged. Otherwise the abstract is kept
+    first, then the conclusions (up to half of what is left), and the rest of the
+    budget goes to the beginning of the body (introduction, methods, results).
+
+    Args:
+        paper: The paper to pack
+        budget: Maximum number of tokens for the paper's content
+
+    Returns:
+        PackedContext with the selected text and its token counts
+    """
+    full_text = paper.full_text or paper.abstract or ""
+    original_tokens = count_tokens(full_text)
+    if original_tokens <= budget:
+        return PackedContext(full_text, original_tokens, original_tokens)
+
+    sections = split_sections(paper.full_text or "")
+    parts: List[str] = []
+    remaining = budget
+
+    abstract = (paper.abstract or "").strip()
+    if abstract and abstract not in sections["body"][:len(abstract) * 2]:
+        abstract_text = truncate_to_tokens(f"Abstract: {abstract}", remaining)
+        parts.append(abstract_text)
+        remaining -= count_tokens(abstract_text)
+
+    conclusions = ""
+    if sections["conclusions"] and remaining > 0:
+        conclusions = truncate_to_tokens(f"Conclusions: {sections['conclusions']}", remaining // 2)
+        remaining -= count_tokens(conclusions)
+
+    ellipsis_tokens = count_tokens(ELLIPSIS)
+    if sections["body"] and remaining > ellipsis_tokens:
+        body = truncate_to_tokens(sections["body"], remaining - ellipsis_tokens)
+        parts.append(body + (ELLIPSIS if len(body) < len(sections["body"]) else ""))
+
+    if conclusions:
+        parts.append(conclusions)
+
+    text = "\n\n".join(part for part in parts if part)
+    return PackedContext(text, count_tokens(text), original_tokens)
+
+class ContextPacker:
+    """
+    Packs paper content into per-prompt token budgets and keeps a running total of
+    the tokens actually sent versus the tokens the papers contained.
+    """
+
+    def __init__(self, tokens_per_paper: int):
+        self.tokens_per_paper = tokens_per_paper
+        self.tokens_sent = 0
+        self.tokens_available = 0
+        self.papers_truncated = 0
+
+    def pack(self, paper: Paper, budget: Optional[int] = None) -> str:
+        packed = pack_paper(paper, budget or self.tokens_per_paper)
+        self.tokens_sent += packed.tokens
+        self.tokens_available += packed.original_tokens
+        if packed.truncated:
+            self.papers_truncated += 1
+        return packed.text
+
+    def pack_group(self, papers: List[Paper]) -> Dict[str, str]:
+        """
+        Pack a group of papers sharing one prompt. Each paper gets tokens_per_paper;
+        budget left unused by short papers is handed to the longer ones.
+        """
+        total = self.tokens_per_paper * len(papers)
+        by_length = sorted(papers, key=lambda p: count_tokens(p.full_text or p.abstract or ""))
+        packed: Dict[str, str] = {}
+        for index, paper in enumerate(by_length):
+            share = total // (len(by_length) - index)
+            text = self.pack(paper, share)
+            total -= count_tokens(text)
+            packed[paper.id] = text
+        return packed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "tokens_sent": self.tokens_sent,
+            "tokens_available": self.tokens_available,
+            "papers_truncated": self.papers_truncated,
+        }
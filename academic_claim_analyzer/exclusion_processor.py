@@ -1,60 +1,41 @@
 # academic_claim_analyzer/exclusion_processor.py
 
 import logging
-from typing import Type
-from pydantic import BaseModel
+from typing import Dict, List, Tuple, Type
+from pydantic import BaseModel, ValidationError
 
-from .models import RequestAnalysis, RankedPaper
-from .schema_manager import create_combined_schema
+from .models import RequestAnalysis, Paper, RankedPaper
+from .schema_manager import create_combined_schema, create_screening_schema, create_batch_schema
 from .llm_handler_config import llm_handler
+from .passage_retriever import select_passages, DEFAULT_TOP_K
+from .context_packer import count_tokens
 
 logger = logging.getLogger(__name__)
 
-async def apply_exclusion_criteria(analysis: RequestAnalysis) -> None:
+DEFAULT_EXCLUSION_BATCH_SIZE = 4
+DEFAULT_EXCLUSION_BATCH_TOKENS = 12000  # paper content per batched exclusion/extraction call
+UNEVALUATED_KEY = "exclusion_unevaluated"
+
+def mark_unevaluated(papers: List[Paper], reason: str) -> List[Paper]:
     """
-    Apply exclusion criteria and extract data from papers.
-    
-    Args:
-        analysis: The RequestAnalysis object containing papers and schemas
+    Keep papers whose exclusion/extraction evaluation failed, recording why in their
+    metadata, so an outage neither drops them nor passes them off as evaluated.
     """
-    if not analysis.exclusion_schema and not analysis.data_extraction_schema:
-        logger.info("No exclusion or extraction schema provided. Skipping.")
-        return
-
-    papers_to_evaluate = analysis.search_results
-    CombinedSchema = create_combined_schema(
-        analysis.exclusion_schema,
-        analysis.data_extraction_schema
-    )
-
-    prompts = []
-    ranked_papers = []
-    for paper in papers_to_evaluate:
-        rp = RankedPaper(
-            **paper.model_dump(),
-            relevance_score=None,
-            relevant_quotes=[],
-            analysis="",
-            exclusion_criteria_result={},
-            extraction_result={}
-        )
-        prompt_text = f"""
-You are analyzing the following academic paper to (1) evaluate certain Exclusion Criteria (boolean flags) and (2) extract structured data fields. Read the entire text carefully and then produce a single JSON object with **exactly** the fields specified in the schema below. Do not add extra keys, text, or commentary.
-
----
-
-**Paper to Analyze**
-
-Title: {rp.title}
-
-Full Text:
-{rp.full_text}
-
----
-
-**Task Requirements**
+    for paper in papers:
+        paper.metadata[UNEVALUATED_KEY] = reason
+        logger.warning(f"Keeping unevaluated paper '{paper.title}': {reason}")
+    return papers
+
+def _field_descriptions(*schemas: Type[BaseModel]) -> List[str]:
+    descriptions = []
+    for schema in schemas:
+        if schema is None:
+            continue
+        for name, field in schema.model_fields.items():
+            descriptions.append(f"{name.replace('_', ' ')} {field.description or ''}")
+    return descriptions
 
-1. **Exclusion Criteria** (boolean fields):  
+_TASK_REQUIREMENTS = """1. **Exclusion Criteria** (boolean fields):  
    - Each field asks whether the paper meets some condition that would exclude it from further analysis.  
    - If the paper’s text clearly indicates the condition is true, set that field to `true`.  
    - If the text either contradicts it or does not mention it, set that field to `false`.  
@@ -67,7 +48,41 @@ Full Text:
      - For floats or integers: `-1` (or `-1.0`)  
      - For booleans: `false`  
      - For lists: `[]`  
+"""
+
+_CLARIFICATIONS = """### Important Clarifications
 
+- If the paper’s text is ambiguous or silent about a particular boolean exclusion criterion, set that criterion to `false` (i.e., we assume it does **not** meet that exclusion).  
+- If the text is ambiguous or silent about a requested numeric or string field, apply the fallback (`-1`/`-1.0` for numbers, `"N/A"` for strings, `[]` for lists, `false` for booleans).  
+- Do not guess or fabricate data.  
+- **Do not** add any fields that are not in the schema.  
+"""
+
+def _paper_text(rp: RankedPaper, retrieval_queries: List[str], top_k: int) -> Tuple[str, str]:
+    """Return the (label, text) of the paper content sent for evaluation."""
+    passages = select_passages(rp.full_text, retrieval_queries, top_k)
+    if passages:
+        return "Relevant Passages (excerpts of the full text selected for the criteria and fields below)", passages
+    return "Full Text", rp.full_text
+
+def _single_prompt(rp: RankedPaper, text_label: str, paper_text: str, CombinedSchema: Type[BaseModel]) -> str:
+    return f"""
+You are analyzing the following academic paper to (1) evaluate certain Exclusion Criteria (boolean flags) and (2) extract structured data fields. Read the provided text carefully and then produce a single JSON object with **exactly** the fields specified in the schema below. Do not add extra keys, text, or commentary.
+
+---
+
+**Paper to Analyze**
+
+Title: {rp.title}
+
+{text_label}:
+{paper_text}
+
+---
+
+**Task Requirements**
+
+{_TASK_REQUIREMENTS}
 3. **Schema**  
    - Here is a JSON schema describing all required fields and the expected data types.  
    - **You must** return a JSON object matching this schema exactly—no extra keys or wrappers.  
@@ -88,37 +103,195 @@ Schema Definition:
 
 ---
 
-### Important Clarifications
+{_CLARIFICATIONS}
+**Now produce the JSON output.** Do not include any extra text before or after the JSON.
+"""
 
-- If the paper’s text is ambiguous or silent about a particular boolean exclusion criterion, set that criterion to `false` (i.e., we assume it does **not** meet that exclusion).  
-- If the text is ambiguous or silent about a requested numeric or string field, apply the fallback (`-1`/`-1.0` for numbers, `"N/A"` for strings, `[]` for lists, `false` for booleans).  
-- Do not guess or fabricate data.  
-- **Do not** add any fields that are not in the schema.  
+def _batch_prompt(entries: List[Tuple[str, RankedPaper, str, str]], BatchSchema: Type[BaseModel]) -> str:
+    papers_block = "\n\n---\n\n".join(
+        f"Paper ID: {paper_id}\nTitle: {rp.title}\n\n{text_label}:\n{paper_text}"
+        for paper_id, rp, text_label, paper_text in entries
+    )
+    return f"""
+You are analyzing the following {len(entries)} academic papers to (1) evaluate certain Exclusion Criteria (boolean flags) and (2) extract structured data fields for **each paper separately**. Read each paper's text carefully and then produce a single JSON object whose `results` list holds one entry per paper, as specified in the schema below. Do not add extra keys, text, or commentary.
+
+---
+
+**Papers to Analyze**
+
+{papers_block}
+
+---
+
+**Task Requirements** (apply to each paper independently, using only that paper's text)
+
+{_TASK_REQUIREMENTS}
+3. **Schema**  
+   - Here is a JSON schema describing the required output. Each entry of `results` must contain the `paper_id` shown above and all exclusion and extraction fields for that paper.  
+   - Include exactly one entry for every paper ID listed above.
+
+Schema Definition:
+{BatchSchema.model_json_schema()}
+
+---
 
+**Output Format Requirements**
+
+1. Return only a single **valid JSON object** (no markdown, no code block fences, no extra commentary).  
+2. Every field in the schema must be present in every entry.  
+3. Do not include any text or disclaimers—just the raw JSON.
+
+---
+
+{_CLARIFICATIONS}
 **Now produce the JSON output.** Do not include any extra text before or after the JSON.
 """
-        prompts.append(prompt_text)
-        ranked_papers.append(rp)
 
-    results = await llm_handler.process(
-        prompts=prompts,
-        response_type=CombinedSchema
-    )
+def plan_batches(token_counts: List[int], batch_size: int, token_budget: int) -> List[List[int]]:
+    """
+    Group paper indices into batches of at most `batch_size` papers whose combined
+    content fits in `token_budget` tokens. Papers too long to share a prompt get a
+    batch of their own.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, tokens in enumerate(token_counts):
+        if batch_size <= 1 or tokens > token_budget // 2:
+            batches.append([index])
+            continue
+        if current and (len(current) >= batch_size or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return sorted(batches)
+
+def _parse_batch(data: BaseModel, paper_ids: List[str], CombinedSchema: Type[BaseModel]) -> Dict[str, BaseModel]:
+    """Validate each entry of a batched response on its own; invalid or unknown entries are dropped."""
+    parsed: Dict[str, BaseModel] = {}
+    for entry in getattr(data, "results", None) or []:
+        if not isinstance(entry, dict) or entry.get("paper_id") not in paper_ids:
+            continue
+        fields = {k: v for k, v in entry.items() if k != "paper_id"}
+        try:
+            parsed[entry["paper_id"]] = CombinedSchema.model_validate(fields)
+        except ValidationError as e:
+            logger.warning(f"Invalid batched result for {entry['paper_id']}, will retry it alone: {e.error_count()} errors")
+    return parsed
 
-    if not results.success or not isinstance(results.data, list):
-        logger.error(f"Exclusion/data-extraction call failed: {results.error}")
+async def apply_exclusion_criteria(analysis: RequestAnalysis) -> None:
+    """
+    Apply exclusion criteria and extract data from papers.
+
+    Long papers are not sent whole: only the passages that best match the request
+    query and the exclusion/extraction field descriptions are included (see
+    passage_retriever.py; `passage_top_k` in the analysis parameters, 0 disables).
+
+    Short papers are evaluated several at a time (`exclusion_batch_size` papers
+    within `exclusion_batch_tokens` of content per call), sharing one copy of the
+    instructions and schema. Papers missing from a batched response, or whose entry
+    fails validation, are re-evaluated with a single-paper call. Papers whose
+    evaluation still fails are kept, marked with `exclusion_unevaluated` in their
+    metadata (see mark_unevaluated).
+    
+    Args:
+        analysis: The RequestAnalysis object containing papers and schemas
+    """
+    if not analysis.exclusion_schema and not analysis.data_extraction_schema:
+        logger.info("No exclusion or extraction schema provided. Skipping.")
         return
 
+    papers_to_evaluate = analysis.search_results
+    CombinedSchema = create_combined_schema(
+        analysis.exclusion_schema,
+        analysis.data_extraction_schema
+    )
+
+    top_k = analysis.parameters.get("passage_top_k")
+    top_k = DEFAULT_TOP_K if top_k is None else top_k
+    batch_size = analysis.parameters.get("exclusion_batch_size")
+    batch_size = DEFAULT_EXCLUSION_BATCH_SIZE if batch_size is None else batch_size
+    batch_tokens = analysis.parameters.get("exclusion_batch_tokens") or DEFAULT_EXCLUSION_BATCH_TOKENS
+    retrieval_queries = [analysis.query] + _field_descriptions(
+        analysis.exclusion_schema,
+        analysis.data_extraction_schema
+    )
+
+    ranked_papers = []
+    contents = []
+    for paper in papers_to_evaluate:
+        rp = RankedPaper(
+            **paper.model_dump(),
+            relevance_score=None,
+            relevant_quotes=[],
+            analysis="",
+            exclusion_criteria_result={},
+            extraction_result={}
+        )
+        ranked_papers.append(rp)
+        contents.append(_paper_text(rp, retrieval_queries, top_k))
+
+    batches = plan_batches([count_tokens(text or "") for _, text in contents], batch_size, batch_tokens)
+    multi = [b for b in batches if len(b) > 1]
+    singles = [b[0] for b in batches if len(b) == 1]
+
+    schema_objs: Dict[int, BaseModel] = {}
+    errors: Dict[int, str] = {}
+    if multi:
+        BatchSchema = create_batch_schema(CombinedSchema)
+        prompts = []
+        for batch in multi:
+            entries = [(f"paper_{i+1}", ranked_papers[i], *contents[i]) for i in batch]
+            prompts.append(_batch_prompt(entries, BatchSchema))
+        results = await llm_handler.process(prompts=prompts, response_type=BatchSchema, stage="exclusion")
+        items = results.data if results.success and isinstance(results.data, list) else [None] * len(multi)
+        if items[0] is None:
+            logger.warning(f"Batched exclusion/data-extraction call failed, falling back to single calls: {results.error}")
+        for batch, item in zip(multi, items):
+            parsed = {}
+            if item is not None and not item.error and item.data is not None:
+                parsed = _parse_batch(item.data, [f"paper_{i+1}" for i in batch], CombinedSchema)
+            for i in batch:
+                if f"paper_{i+1}" in parsed:
+                    schema_objs[i] = parsed[f"paper_{i+1}"]
+                else:
+                    singles.append(i)
+        logger.info(
+            f"Exclusion/data extraction: {len(schema_objs)} papers evaluated in {len(multi)} batched calls, "
+            f"{len(singles)} single-paper calls"
+        )
+
+    singles.sort()
+    if singles:
+        results = await llm_handler.process(
+            prompts=[_single_prompt(ranked_papers[i], *contents[i], CombinedSchema) for i in singles],
+            response_type=CombinedSchema,
+            stage="exclusion"
+        )
+
+        if not results.success or not isinstance(results.data, list):
+            logger.error(f"Exclusion/data-extraction call failed: {results.error}")
+            for i in singles:
+                errors[i] = str(results.error)
+        else:
+            for i, item in zip(singles, results.data):
+                if item.error:
+                    errors[i] = item.error
+                else:
+                    schema_objs[i] = item.data
+
     filtered = []
-    for i, item in enumerate(results.data):
-        ranked_paper = ranked_papers[i]
+    for i, ranked_paper in enumerate(ranked_papers):
         exclude = False
 
-        if item.error:
-            logger.error(f"Error evaluating paper '{ranked_paper.title}': {item.error}")
+        if i not in schema_objs:
+            filtered.extend(mark_unevaluated([ranked_paper], errors.get(i, "no evaluation returned")))
             continue
 
-        schema_obj = item.data
+        schema_obj = schema_objs[i]
         exclusion_result = {}
         extraction_result = {}
 
@@ -143,4 +316,96 @@ Schema Definition:
         else:
             logger.info(f"Paper excluded: {ranked_paper.title}")
 
-    analysis.search_results = filtered
\ No newline at end of file
+    analysis.search_results = filtered
+
+async def apply_abstract_screening(analysis: RequestAnalysis) -> None:
+    """
+    Cheap pre-screening on title + abstract, run before full text is scraped.
+
+    Drops papers whose abstract clearly meets an exclusion criterion or that are
+    clearly off-topic for the query. Anything ambiguous, and any paper without an
+    abstract, passes through to full-text evaluation.
+    
+    Args:
+        analysis: The RequestAnalysis object containing (metadata-only) papers
+    """
+    ScreeningSchema = create_screening_schema(analysis.exclusion_schema)
+
+    prompts = []
+    screened = []
+    passed = []
+    for paper in analysis.search_results:
+        # Papers without an abstract can't be screened; already-screened ones (multi-query) passed before
+        if not paper.abstract or not paper.abstract.strip() or "abstract_screening" in paper.metadata:
+            passed.append(paper)
+            continue
+        prompt_text = f"""
+You are pre-screening an academic paper for a literature review using only its title and abstract. Produce a single JSON object with **exactly** the fields specified in the schema below. Do not add extra keys, text, or commentary.
+
+---
+
+**Research Query**
+
+{analysis.query}
+
+**Paper to Screen**
+
+Title: {paper.title}
+
+Abstract:
+{paper.abstract}
+
+---
+
+**Task Requirements**
+
+1. **Exclusion Criteria** (boolean fields, if any):  
+   - Set a field to `true` only if the title or abstract **clearly** shows the paper meets that condition.  
+   - If the abstract does not mention it, or is ambiguous, set it to `false`. The full text will be checked later.
+
+2. **is_relevant** (boolean):  
+   - Set to `false` only if the paper is clearly unrelated to the Research Query.  
+   - If it could plausibly contribute evidence, set it to `true`.
+
+Schema Definition:
+{ScreeningSchema.model_json_schema()}
+
+**Now produce the JSON output.** Do not include any extra text before or after the JSON.
+"""
+        prompts.append(prompt_text)
+        screened.append(paper)
+
+    if not prompts:
+        logger.info("Abstract screening: no papers with abstracts to screen.")
+        return
+
+    results = await llm_handler.process(
+        prompts=prompts,
+        response_type=ScreeningSchema,
+        stage="screening"
+    )
+
+    if not results.success or not isinstance(results.data, list):
+        logger.error(f"Abstract screening call failed, keeping all papers: {results.error}")
+        return
+
+    excluded = 0
+    for paper, item in zip(screened, results.data):
+        if item.error or item.data is None:
+            logger.warning(f"Screening error for '{paper.title}', keeping it: {item.error}")
+            passed.append(paper)
+            continue
+
+        verdict = item.data.model_dump()
+        paper.metadata["abstract_screening"] = verdict
+        met_criteria = [f for f, v in verdict.items() if f != "is_relevant" and v is True]
+        if met_criteria or verdict.get("is_relevant") is False:
+            excluded += 1
+            reason = ", ".join(met_criteria) if met_criteria else "not relevant"
+            logger.info(f"Paper screened out ({reason}): {paper.title}")
+        else:
+            passed.append(paper)
+
+    logger.info(f"Abstract screening: {excluded} of {len(screened)} screened papers excluded")
+    passed_ids = {id(p) for p in passed}
+    analysis.search_results = [p for p in analysis.search_results if id(p) in passed_ids]
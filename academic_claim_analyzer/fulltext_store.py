@@ -0,0 +1,223 @@
+# academic_claim_analyzer/fulltext_store.py
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse, urlunparse
+
+from .cache_store import SQLiteBlobStore
+from .models import Paper
+
+logger = logging.getLogger(__name__)
+
+DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:")
+
+def normalize_fulltext_key(doi: Optional[str] = None, url: Optional[str] = None) -> Optional[str]:
+    """
+    Build the store key for a paper: its normalized DOI if it has one, otherwise its
+    normalized PDF/landing URL. Returns None if neither is usable.
+    """
+    if doi and isinstance(doi, str):
+        value = doi.strip().lower()
+        for prefix in DOI_PREFIXES:
+            if value.startswith(prefix):
+                value = value[len(prefix):]
+                break
+        value = value.strip().strip("/")
+        if value:
+            return f"doi:{value}"
+
+    if url and isinstance(url, str):
+        parsed = urlparse(url.strip())
+        if parsed.netloc:
+            normalized = urlunparse((
+                (parsed.scheme or "http").lower(),
+                parsed.netloc.lower(),
+                parsed.path.rstrip("/") or "/",
+                parsed.params,
+                parsed.query,
+                ""
+            ))
+            return f"url:{normalized}"
+    return None
+
+class FullTextStore:
+    """
+    Content-addressed store of scraped full texts, so each DOI / PDF URL is scraped
+    at most once.
+
+    Lookups go through an in-memory LRU first, then the optional on-disk store
+    (zstd-compressed, shared across runs and processes). Concurrent lookups for the
+    same key share a single in-flight fetch. Failed scrapes are remembered in memory
+    only, so they are not retried within a run but are retried on the next one.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_items: int = 256,
+        max_size_bytes: int = 2 * 1024 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.memory_items = memory_items
+        self.disk = SQLiteBlobStore(
+            path,
+            table="full_texts",
+            max_size_bytes=max_size_bytes,
+            ttl_seconds=ttl_seconds
+        ) if path else None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+
+    def _remember(self, key: str, text: str) -> None:
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _from_memory(self, key: str) -> Optional[str]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+        return None
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        value = self.disk.get(key) if self.disk is not None else None
+        return value.decode("utf-8") if value is not None else None
+
+    def _write_disk(self, key: str, text: Optional[str]) -> None:
+        if text and self.disk is not None:
+            self.disk.set(key, text.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored text for `key` without fetching (None if unknown)."""
+        text = self._from_memory(key)
+        if text is None:
+            text = self._read_disk(key)
+            if text is not None:
+                self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: Optional[str]) -> None:
+        self._remember(key, text or "")
+        self._write_disk(key, text)
+
+    async def get_or_fetch(
+        self,
+        key: Optional[str],
+        fetch: Callable[[], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """
+        Return the full text for `key`, calling `fetch` only if no stored copy exists
+        and no other coroutine is already fetching it.
+
+        Args:
+            key: Store key from normalize_fulltext_key (None disables the store)
+            fetch: Coroutine function performing the actual scrape
+
+        Returns:
+            The full text, or None/"" if it could not be retrieved
+        """
+        if key is None:
+            return await fetch()
+
+        # The disk store is read and written off the event loop
+        text = self._from_memory(key)
+        if text is None and self.disk is not None:
+            text = await asyncio.to_thread(self._read_disk, key)
+            if text is not None:
+                self._remember(key, text)
+        if text is not None:
+            self.hits += 1
+            return text
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            text = await fetch()
+            self._remember(key, text or "")
+            if text and self.disk is not None:
+                await asyncio.to_thread(self._write_disk, key, text)
+            future.set_result(text)
+            return text
+        except BaseException:
+            # Waiters get None rather than our exception; the key is not stored so it can be retried.
+            future.set_result(None)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def fetch_paper_text(self, paper: Paper, scraper: Any) -> Optional[str]:
+        """
+        Get full text for a paper via its DOI (preferred) or PDF link, scraping
+        with `scraper` (a UnifiedWebScraper) only on a store miss.
+        """
+        if paper.doi:
+            target = f"https://doi.org/{paper.doi}"
+            key = normalize_fulltext_key(doi=paper.doi)
+        elif paper.pdf_link:
+            target = paper.pdf_link
+            key = normalize_fulltext_key(url=paper.pdf_link)
+        else:
+            return None
+        return await self.get_or_fetch(key, lambda: scraper.scrape(target))
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "memory_entries": len(self._memory),
+        }
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+# Process-wide store; memory-only until configure_fulltext_store() gives it a disk path.
+_fulltext_store: Optional[FullTextStore] = None
+
+def get_fulltext_store() -> FullTextStore:
+    global _fulltext_store
+    if _fulltext_store is None:
+        _fulltext_store = FullTextStore()
+    return _fulltext_store
+
+def configure_fulltext_store(
+    path: Optional[str] = None,
+    memory_items: int = 256,
+    max_size_bytes: Optional[int] = None,
+    ttl_seconds: Optional[float] = None
+) -> FullTextStore:
+    """Replace the process-wide store, optionally persisting texts to the SQLite file at `path`."""
+    global _fulltext_store
+    if _fulltext_store is not None:
+        _fulltext_store.close()
+    kwargs = {"max_size_bytes": max_size_bytes} if max_size_bytes else {}
+    _fulltext_store = FullTextStore(path, memory_items=memory_items, ttl_seconds=ttl_seconds, **kwargs)
+    if path:
+        logger.info(f"Full-text store persisted at {path}")
+    return _fulltext_store
+
+def close_fulltext_store() -> Optional[Dict[str, Any]]:
+    """Close the process-wide store and return its statistics (None if never used)."""
+    global _fulltext_store
+    if _fulltext_store is None:
+        return None
+    stats = _fulltext_store.stats()
+    _fulltext_store.close()
+    _fulltext_store = None
+    return stats
@@ -0,0 +1,301 @@
+# academic_claim_analyzer/job_queue.py
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import asyncio
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_POLL_INTERVAL = 5.0
+
+@dataclass
+class Job:
+    """A request leased from the queue."""
+    id: int
+    request_id: str
+    request: Dict[str, Any]
+    config: Dict[str, Any]
+    attempts: int
+    lease_token: str
+
+class JobQueue:
+    """
+    Durable queue of batch requests in a SQLite file, shared by any number of worker
+    processes on any host that can open the file, provided its filesystem supports
+    file locking across hosts.
+
+    A job moves from pending to leased when a worker takes it, and to done (with its
+    result) or failed. A lease lasts `lease_seconds` and is renewed by heartbeats
+    while the job runs; if the worker dies, the lease expires and the job is leased
+    again by another worker, up to `max_attempts` times. Every lease gets a unique
+    token, and heartbeats and completions only apply while that token still holds the
+    lease, so a worker (or a concurrent slot of one) that was presumed lost cannot
+    overwrite the result of the one that took over its job.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # Rollback journal rather than WAL: WAL needs shared memory, so it only works on one host
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, job_key TEXT UNIQUE NOT NULL, request_id TEXT NOT NULL, "
+            "request TEXT NOT NULL, config TEXT NOT NULL, priority REAL NOT NULL DEFAULT 0, "
+            "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "lease_owner TEXT, lease_expires REAL, result TEXT, error TEXT, "
+            "created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, priority DESC, id)")
+
+    def _transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can never lease the same job
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, jobs: List[Tuple[str, str, Dict[str, Any], Dict[str, Any], float]]) -> int:
+        now = time.time()
+        added = 0
+        for job_key, request_id, request, config, priority in jobs:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_key, request_id, request, config, priority, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_key, request_id, json.dumps(request, default=str), json.dumps(config, default=str),
+                 priority, now, now)
+            )
+            added += cursor.rowcount
+        return added
+
+    def enqueue(self, jobs: List[Tuple[str, str, Dict[str, Any], Dict[str, Any], float]]) -> int:
+        """
+        Add jobs given as (job_key, request_id, request, config, priority). Jobs whose
+        key is already in the queue, in any state, are left alone, so enqueueing the
+        same batch again is harmless. Returns the number of jobs added.
+        """
+        return self._transaction(lambda conn: self._insert(conn, jobs))
+
+    def replace(self, jobs: List[Tuple[str, str, Dict[str, Any], Dict[str, Any], float]]) -> int:
+        """
+        Start the queue afresh with `jobs`, discarding every job (and result) of earlier
+        runs. Raises RuntimeError if a run is still in progress, i.e. jobs are pending
+        or leased under an unexpired lease, so a worker joining a running batch cannot
+        wipe it. Returns the number of jobs added.
+        """
+        now = time.time()
+
+        def reset(conn: sqlite3.Connection) -> int:
+            active = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'pending' OR (status = 'leased' AND lease_expires >= ?)",
+                (now,)
+            ).fetchone()[0]
+            if active:
+                raise RuntimeError(
+                    f"Job queue {self.path} still has {active} unfinished jobs; resume to join that run, "
+                    "or delete the queue file to start over"
+                )
+            conn.execute("DELETE FROM jobs")
+            return self._insert(conn, jobs)
+
+        return self._transaction(reset)
+
+    def lease(self, owner: str) -> Optional[Job]:
+        """
+        Lease the highest-priority pending job (or one whose lease expired) to `owner`.
+        Returns None if no job is available right now. The returned job's `lease_token`
+        identifies this lease in heartbeat, complete and release.
+        """
+        now = time.time()
+        lease_token = f"{owner}:{uuid.uuid4().hex}"
+
+        def take(conn: sqlite3.Connection) -> Optional[Job]:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_owner = NULL, updated = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (f"Lease expired {self.max_attempts} times", now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT id, request_id, request, config, attempts FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY priority DESC, id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, request_id, request, config, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = ?, updated = ? "
+                "WHERE id = ?",
+                (lease_token, now + self.lease_seconds, attempts + 1, now, job_id)
+            )
+            return Job(job_id, request_id, json.loads(request), json.loads(config), attempts + 1, lease_token)
+
+        return self._transaction(take)
+
+    def _update_owned(self, job_id: int, lease_token: str, assignments: str, values: Tuple[Any, ...]) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                values + (time.time(), job_id, lease_token)
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: int, lease_token: str) -> bool:
+        """Renew the lease. Returns False if the lease `lease_token` was lost."""
+        return self._update_owned(job_id, lease_token, "lease_expires = ?", (time.time() + self.lease_seconds,))
+
+    def complete(self, job_id: int, lease_token: str, result: Any) -> bool:
+        """Store the result of a leased job. Returns False if the lease `lease_token` was lost."""
+        return self._update_owned(
+            job_id, lease_token, "status = 'done', lease_owner = NULL, result = ?",
+            (json.dumps(result, ensure_ascii=False, default=str),)
+        )
+
+    def release(self, job_id: int, lease_token: str, error: str) -> bool:
+        """
+        Give a job back after an unexpected error: it becomes pending again, or failed
+        once it has used up its attempts.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, error = ?, updated = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (self.max_attempts, error, time.time(), job_id, lease_token)
+            )
+        return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def is_drained(self) -> bool:
+        """True once every job is done or failed."""
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    def results(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (request_id, result) for every finished job in enqueue order, one row at
+        a time. Failed jobs yield {"error": ...}.
+        """
+        # A connection of its own, so the shared one is not held while the caller consumes rows
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            rows = conn.execute(
+                "SELECT request_id, status, result, error FROM jobs WHERE status IN ('done', 'failed') ORDER BY id"
+            )
+            for request_id, status, result, error in rows:
+                yield request_id, json.loads(result) if status == "done" else {"error": error}
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+async def run_queue_worker(
+    queue: JobQueue,
+    process: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]],
+    max_concurrent: int = 1,
+    worker_id: Optional[str] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> int:
+    """
+    Lease and process jobs until the queue is drained.
+
+    Up to `max_concurrent` jobs run at once, each with a heartbeat renewing its lease
+    every third of the lease time. A job whose lease is lost (e.g. the worker was
+    stalled past expiry and another worker took over) is cancelled. When no job is
+    available but others are still leased, the worker keeps polling, so it picks up
+    the jobs of workers that die. Queue calls run in a thread, so waiting for the
+    SQLite write lock held by another worker does not stall the jobs in flight here.
+
+    Args:
+        queue: The shared job queue
+        process: Coroutine function run as process(request, config) for each job
+        max_concurrent: Jobs processed at the same time by this worker
+        worker_id: Lease owner name, prefixed to each lease token (default: host name and process ID)
+        poll_interval: Seconds between polls while no job is available
+
+    Returns:
+        The number of jobs this worker completed
+    """
+    owner = worker_id or default_worker_id()
+    completed = 0
+
+    async def run_job(job: Job) -> None:
+        nonlocal completed
+        task = asyncio.ensure_future(process(job.request, job.config))
+        lost = False
+        while not task.done():
+            await asyncio.wait({task}, timeout=queue.lease_seconds / 3)
+            if not task.done() and not await asyncio.to_thread(queue.heartbeat, job.id, job.lease_token):
+                lost = True
+                task.cancel()
+        if lost:
+            logger.warning(f"Lost the lease on job {job.id} ('{job.request_id}'); another worker has taken it over")
+            return
+        try:
+            result = task.result()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} ('{job.request_id}') failed on attempt {job.attempts}: {str(e)}", exc_info=True)
+            await asyncio.to_thread(queue.release, job.id, job.lease_token, str(e))
+            return
+        if await asyncio.to_thread(queue.complete, job.id, job.lease_token, result):
+            completed += 1
+        else:
+            logger.warning(f"Discarding the result of job {job.id} ('{job.request_id}'): its lease had expired")
+
+    async def worker_slot() -> None:
+        while True:
+            job = await asyncio.to_thread(queue.lease, owner)
+            if job is None:
+                if await asyncio.to_thread(queue.is_drained):
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            logger.info(f"Worker {owner} leased job {job.id} ('{job.request_id}', attempt {job.attempts})")
+            await run_job(job)
+
+    await asyncio.gather(*(worker_slot() for _ in range(max(1, max_concurrent))))
+    counts = await asyncio.to_thread(queue.counts)
+    logger.info(f"Worker {owner} finished: {completed} jobs completed, queue status {counts}")
+    return completed
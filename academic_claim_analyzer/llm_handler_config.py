@@ -1,10 +1,216 @@
 # academic_claim_analyzer/llm_handler_config.py
 
 import os
-from llmhandler.api_handler import UnifiedLLMHandler
+import json
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
 
-# Initialize a global LLM handler with 1500 rpm and the model directly from env
-llm_handler = UnifiedLLMHandler(
-    requests_per_minute=1000, 
+from aiolimiter import AsyncLimiter
+from pydantic import BaseModel, ValidationError
+from llmhandler.api_handler import UnifiedLLMHandler, PromptResult
+from llmhandler._internal_models import UnifiedResponse
+
+from .cache_store import SQLiteBlobStore
+from .search.rate_limiter import stage_semaphore
+
+logger = logging.getLogger(__name__)
+
+# Stages that sample the model on purpose (ranking rounds re-rank random groups) are not cached by default
+DEFAULT_UNCACHED_STAGES = ("ranking",)
+
+LLM_REQUESTS_PER_MINUTE = 1000
+
+class CachedLLMHandler:
+    """
+    Wraps a UnifiedLLMHandler with a persistent cache of validated, typed responses.
+
+    Entries are keyed on the model, the response model's JSON schema, the system
+    message and the prompt text, so changing any of them is a miss. The cache is off
+    until configure() is called; while it is, process() returns exactly what the
+    wrapped handler would (a UnifiedResponse, with a list of PromptResult for a list
+    of prompts). Calls can opt out with cache=False or by passing a `stage` listed in
+    `uncached_stages`. Anything else (untyped prompts, batch mode) is passed through.
+    """
+
+    def __init__(self, handler: UnifiedLLMHandler):
+        self.handler = handler
+        self.store: Optional[SQLiteBlobStore] = None
+        self.uncached_stages = set(DEFAULT_UNCACHED_STAGES)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.handler, name)
+
+    def configure(
+        self,
+        path: str,
+        max_size_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        uncached_stages: Optional[Iterable[str]] = None
+    ) -> None:
+        """Enable the cache, backed by the SQLite file at `path`."""
+        self.close()
+        kwargs = {"max_size_bytes": max_size_bytes} if max_size_bytes else {}
+        self.store = SQLiteBlobStore(path, table="llm_responses", ttl_seconds=ttl_seconds, **kwargs)
+        if uncached_stages is not None:
+            self.uncached_stages = set(uncached_stages)
+        logger.info(f"LLM response cache enabled at {path}")
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Disable the cache and return its statistics (None if it was not enabled)."""
+        if self.store is None:
+            return None
+        stats = self.store.stats()
+        self.store.close()
+        self.store = None
+        return stats
+
+    def make_key(
+        self,
+        prompt: str,
+        model: Optional[str],
+        response_type: Type[BaseModel],
+        system_message: Union[str, Sequence[str]] = ()
+    ) -> str:
+        canonical = json.dumps(
+            [
+                model or self.handler.default_model,
+                response_type.model_json_schema(),
+                system_message if isinstance(system_message, str) else list(system_message),
+                prompt,
+            ],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str, response_type: Type[BaseModel]) -> Optional[BaseModel]:
+        value = self.store.get(key)
+        if value is None:
+            return None
+        try:
+            return response_type.model_validate_json(value)
+        except ValidationError:
+            # The schema changed shape without changing its JSON schema (e.g. a validator); refetch.
+            self.store.delete(key)
+            return None
+
+    def _remember(self, key: str, data: Any, response_type: Type[BaseModel]) -> None:
+        if isinstance(data, response_type):
+            self.store.set(key, data.model_dump_json().encode("utf-8"))
+
+    # The store does blocking SQLite I/O and (de)compression, so process() runs
+    # lookups and writes in a worker thread, one thread hop per call.
+    def _lookup_all(self, keys: List[str], response_type: Type[BaseModel]) -> List[Optional[BaseModel]]:
+        return [self._lookup(key, response_type) for key in keys]
+
+    def _remember_all(self, entries: List[Tuple[str, Any]], response_type: Type[BaseModel]) -> None:
+        for key, data in entries:
+            self._remember(key, data, response_type)
+
+    async def _call(self, prompts: Union[str, List[str]], **kwargs) -> Any:
+        # Calls from every request of a batch share the process-wide "llm" stage cap
+        async with stage_semaphore("llm"):
+            return await self.handler.process(prompts, **kwargs)
+
+    async def process(
+        self,
+        prompts: Union[str, List[str]],
+        model: Optional[str] = None,
+        response_type: Optional[Type[BaseModel]] = None,
+        *,
+        cache: bool = True,
+        stage: Optional[str] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Same contract as UnifiedLLMHandler.process, answering from the cache where possible.
+
+        Args:
+            prompts: The prompt or list of prompts to process
+            model: Model to use (defaults to the handler's default model)
+            response_type: Pydantic model for typed responses
+            cache: Set to False to bypass the cache for this call
+            stage: Pipeline stage name, checked against uncached_stages
+            **kwargs: Passed through to the wrapped handler
+        """
+        use_cache = (
+            cache
+            and self.store is not None
+            and stage not in self.uncached_stages
+            and isinstance(response_type, type)
+            and issubclass(response_type, BaseModel)
+            and not kwargs.get("batch_mode")
+        )
+        if not use_cache:
+            return await self._call(prompts, model=model, response_type=response_type, **kwargs)
+
+        system_message = kwargs.get("system_message", ())
+
+        if isinstance(prompts, str):
+            key = self.make_key(prompts, model, response_type, system_message)
+            cached = await asyncio.to_thread(self._lookup, key, response_type)
+            if cached is not None:
+                return UnifiedResponse(success=True, data=cached)
+            result = await self._call(prompts, model=model, response_type=response_type, **kwargs)
+            if getattr(result, "success", False):
+                await asyncio.to_thread(self._remember, key, result.data, response_type)
+            return result
+
+        keys = [self.make_key(p, model, response_type, system_message) for p in prompts]
+        results: List[Optional[PromptResult]] = []
+        missing: List[int] = []
+        found = await asyncio.to_thread(self._lookup_all, keys, response_type)
+        for index, (prompt, cached) in enumerate(zip(prompts, found)):
+            if cached is not None:
+                results.append(PromptResult(prompt=prompt, data=cached))
+            else:
+                results.append(None)
+                missing.append(index)
+
+        if missing:
+            fresh = await self._call(
+                [prompts[i] for i in missing], model=model, response_type=response_type, **kwargs
+            )
+            if not getattr(fresh, "success", False) or not isinstance(fresh.data, list):
+                if len(missing) == len(prompts):
+                    return fresh
+                error = getattr(fresh, "error", None) or "LLM call failed"
+                for index in missing:
+                    results[index] = PromptResult(prompt=prompts[index], error=error)
+            else:
+                for index, item in zip(missing, fresh.data):
+                    results[index] = item
+                await asyncio.to_thread(
+                    self._remember_all,
+                    [(keys[index], item.data) for index, item in zip(missing, fresh.data) if not item.error],
+                    response_type
+                )
+
+        logger.debug(f"LLM cache: {len(prompts) - len(missing)}/{len(prompts)} prompts answered from cache")
+        return UnifiedResponse(success=True, data=results)
+
+# Initialize a global LLM handler with LLM_REQUESTS_PER_MINUTE and the model directly from env
+llm_handler = CachedLLMHandler(UnifiedLLMHandler(
+    requests_per_minute=LLM_REQUESTS_PER_MINUTE,
     default_model=os.getenv("DEFAULT_LLM_MODEL")
-)
\ No newline at end of file
+))
+
+def configure_llm_rate_limit(requests_per_minute: float) -> None:
+    """Change the global handler's request rate, e.g. to one worker's share of the batch rate."""
+    llm_handler.handler.rate_limiter = AsyncLimiter(requests_per_minute, 60)
+
+def configure_llm_cache(
+    path: str,
+    max_size_bytes: Optional[int] = None,
+    ttl_seconds: Optional[float] = None,
+    uncached_stages: Optional[Iterable[str]] = None
+) -> CachedLLMHandler:
+    """Enable the persistent LLM response cache on the global handler."""
+    llm_handler.configure(path, max_size_bytes=max_size_bytes, ttl_seconds=ttl_seconds, uncached_stages=uncached_stages)
+    return llm_handler
+
+def close_llm_cache() -> Optional[Dict[str, Any]]:
+    """Disable the LLM response cache and return its statistics (None if it was not enabled)."""
+    return llm_handler.close()
@@ -56,6 +56,7 @@ class Paper(BaseModel, FlexibleNumericField):
 
 class RankedPaper(Paper):
     relevance_score: Optional[float] = None
+    relevance_uncertainty: Optional[float] = None
     analysis: Optional[str] = None
     relevant_quotes: List[str] = Field(default_factory=list)
     extraction_result: Optional[Dict[str, Any]] = None
@@ -93,11 +94,13 @@ class RequestAnalysis(BaseModel):
     def add_query(self, query: str, source: str):
         self.queries.append(SearchQuery(query=query, source=source))
 
-    def add_search_result(self, paper: Paper):
-        """Add search result with deduplication (by title)."""
+    def add_search_result(self, paper: Paper) -> bool:
+        """Add search result with deduplication (by title). Returns True if it was added."""
         existing_titles = {p.title.lower().strip() for p in self.search_results}
         if paper.title.lower().strip() not in existing_titles:
             self.search_results.append(paper)
+            return True
+        return False
 
     def add_ranked_paper(self, paper: RankedPaper):
         """Add ranked paper with deduplication."""
@@ -127,6 +130,7 @@ class RequestAnalysis(BaseModel):
                     'authors': p.authors,
                     'year': p.year,
                     'relevance_score': p.relevance_score,
+                    'relevance_uncertainty': p.relevance_uncertainty,
                     'analysis': p.analysis,
                     'relevant_quotes': p.relevant_quotes,
                     'extraction_result': {
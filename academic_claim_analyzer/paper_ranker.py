@@ -4,14 +4,31 @@ import random
 import math
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Type
+from typing import List, Dict, Any, Optional, Tuple, Type
 from pydantic import BaseModel, Field
 
 from .llm_handler_config import llm_handler
 from .models import Paper, RankedPaper
+from .context_packer import ContextPacker
+from .bradley_terry import BradleyTerryRatings
+from .passage_retriever import select_passages, BM25Index, DEFAULT_TOP_K
 
 logger = logging.getLogger(__name__)
 
+# Token budgets for paper content (see context_packer.py); overridable per request
+DEFAULT_RANKING_TOKENS_PER_PAPER = 2000
+DEFAULT_ANALYSIS_TOKEN_BUDGET = 12000
+
+# Lexical pre-ranking keeps max(PRERANK_MIN_CANDIDATES, PRERANK_FACTOR * top_n) papers by default
+PRERANK_MIN_CANDIDATES = 15
+PRERANK_FACTOR = 4
+PRERANK_MAX_WORDS = 5000  # words of full text indexed per paper
+
+# Adaptive ranking waves
+ADAPTIVE_INITIAL_ROUNDS = 2   # random rounds over all candidates before focusing
+ADAPTIVE_STABLE_WAVES = 2     # consecutive waves with an unchanged top-N set before stopping
+ADAPTIVE_Z = 1.5              # confidence-interval width, in standard errors
+
 # Ranking + Analysis Pydantic models
 class Ranking(BaseModel):
     paper_id: str = Field(description="Unique ID for the paper")
@@ -31,15 +48,23 @@ async def rank_papers(
     ranking_guidance: str,
     exclusion_schema: Optional[Type[BaseModel]] = None,
     data_extraction_schema: Optional[Type[BaseModel]] = None,
-    top_n: int = 5
+    top_n: int = 5,
+    ranking_tokens_per_paper: Optional[int] = None,
+    analysis_token_budget: Optional[int] = None,
+    context_stats: Optional[Dict[str, Any]] = None,
+    passage_top_k: Optional[int] = None,
+    prerank_top_m: Optional[int] = None,
+    adaptive_ranking: bool = False
 ) -> List[RankedPaper]:
     """
     Rank the given papers based on:
     - Relevance to 'query'
     - User-supplied 'ranking_guidance'
-    1) Do multi-round partial ranking (all rounds are run concurrently)
-    2) Sort by aggregated score
-    3) Do a deeper analysis pass for the top papers (also executed concurrently)
+    1) Keep only the top-M candidates by a local BM25 score (no LLM calls)
+    2) Do multi-round partial ranking (all rounds concurrently, or with
+       `adaptive_ranking` in waves that stop once the top-N set is stable)
+    3) Sort by Bradley-Terry rating fitted to the pairwise outcomes of all rounds
+    4) Do a deeper analysis pass for the top papers (also executed concurrently)
     
     Args:
         papers: List of papers to rank
@@ -48,6 +73,12 @@ async def rank_papers(
         exclusion_schema: Schema for excluding papers
         data_extraction_schema: Schema for extracting data from papers
         top_n: Number of top papers to return
+        ranking_tokens_per_paper: Token budget for each paper's content in a ranking prompt
+        analysis_token_budget: Token budget for a paper's content in its analysis prompt
+        context_stats: Optional dict filled with the tokens actually sent per stage
+        passage_top_k: Passages of a long paper sent for its analysis (0 sends packed full text)
+        prerank_top_m: Candidates kept for the LLM rounds after lexical pre-ranking (0 keeps all)
+        adaptive_ranking: Run ranking rounds in waves with early stopping
         
     Returns:
         List of RankedPaper objects
@@ -58,27 +89,45 @@ async def rank_papers(
     valid_papers = [p for p in papers if p.full_text and len(p.full_text.split()) >= 200]
     logger.info(f"{len(valid_papers)} papers have enough text for advanced ranking")
 
+    if prerank_top_m is None:
+        prerank_top_m = max(PRERANK_MIN_CANDIDATES, PRERANK_FACTOR * top_n)
+    if prerank_top_m and len(valid_papers) > prerank_top_m:
+        valid_papers = lexical_prerank(valid_papers, query, ranking_guidance, prerank_top_m)
+        logger.info(f"Lexical pre-ranking kept the top {len(valid_papers)} candidates for LLM ranking")
+
     num_rounds = calculate_ranking_rounds(len(valid_papers))
-    logger.info(f"Will run {num_rounds} ranking rounds")
+    logger.info(f"Will run {'up to ' if adaptive_ranking else ''}{num_rounds} ranking rounds")
 
-    paper_scores: Dict[str, List[float]] = {}
     for i, p in enumerate(valid_papers):
         p.id = f"paper_{i+1}"
-        paper_scores[p.id] = []
+    ratings = BradleyTerryRatings([p.id for p in valid_papers])
 
-    # Launch all ranking rounds concurrently
-    average_scores = await _conduct_ranking_rounds(valid_papers, query, ranking_guidance, num_rounds, paper_scores)
+    ranking_packer = ContextPacker(ranking_tokens_per_paper or DEFAULT_RANKING_TOKENS_PER_PAPER)
+    analysis_packer = ContextPacker(analysis_token_budget or DEFAULT_ANALYSIS_TOKEN_BUDGET)
+
+    scores = await _conduct_ranking_rounds(
+        valid_papers, query, ranking_guidance, num_rounds, ratings, ranking_packer,
+        top_n=top_n, adaptive=adaptive_ranking
+    )
+    uncertainties = ratings.uncertainties()
+    logger.info(f"Fitted Bradley-Terry ratings from {ratings.comparisons} pairwise comparisons")
 
     # Sort & pick top_n papers
     sorted_by_score = sorted(
         valid_papers,
-        key=lambda pp: average_scores.get(pp.id, 0.0),
+        key=lambda pp: scores.get(pp.id, 0.0),
         reverse=True
     )
     top_papers = sorted_by_score[:top_n]
 
     # Detailed analysis for each top paper executed concurrently
-    analysis_tasks = [_process_top_paper(paper, query, ranking_guidance, average_scores) for paper in top_papers]
+    analysis_tasks = [
+        _process_top_paper(
+            paper, query, ranking_guidance, scores, uncertainties, analysis_packer,
+            DEFAULT_TOP_K if passage_top_k is None else passage_top_k
+        )
+        for paper in top_papers
+    ]
     analysis_results = await asyncio.gather(*analysis_tasks, return_exceptions=True)
     ranked_results = []
     for result in analysis_results:
@@ -87,73 +136,199 @@ async def rank_papers(
         elif result is not None:
             ranked_results.append(result)
 
+    for stage, packer in (("ranking", ranking_packer), ("analysis", analysis_packer)):
+        stats = packer.stats()
+        logger.info(
+            f"Context packing ({stage}): sent {stats['tokens_sent']} of {stats['tokens_available']} "
+            f"paper tokens, {stats['papers_truncated']} paper contexts truncated"
+        )
+        if context_stats is not None:
+            context_stats[stage] = stats
+
     logger.info(f"Returning {len(ranked_results)} ranked papers")
     return ranked_results
 
+def lexical_prerank(papers: List[Paper], query: str, ranking_guidance: str, top_m: int) -> List[Paper]:
+    """
+    Score papers against the query with BM25 over title, abstract and the start of
+    the full text, and keep the `top_m` best (in score order). The query counts
+    double relative to the ranking guidance. Scores are stored in
+    paper.metadata["lexical_score"].
+    """
+    documents = []
+    for p in papers:
+        body = " ".join((p.full_text or "").split()[:PRERANK_MAX_WORDS])
+        # Title terms are repeated so a matching title outweighs a passing mention in the body
+        documents.append(f"{p.title} {p.title} {p.abstract or ''} {body}")
+    index = BM25Index(documents)
+    scores = 2 * index.score(query)
+    if ranking_guidance:
+        scores = scores + index.score(ranking_guidance)
+
+    for paper, score in zip(papers, scores):
+        paper.metadata["lexical_score"] = round(float(score), 4)
+    order = sorted(range(len(papers)), key=lambda i: -scores[i])
+    return [papers[i] for i in order[:top_m]]
+
 def calculate_ranking_rounds(num_papers: int) -> int:
     """Calculate the number of ranking rounds based on the number of papers."""
     if num_papers <= 8:
         return 3
     return min(8, math.floor(math.log(num_papers, 1.4)) + 2)
 
+async def _run_ranking_round(
+    groups: List[List[Paper]],
+    query: str,
+    ranking_guidance: str,
+    packer: Optional[ContextPacker],
+    label: str
+) -> List[List[str]]:
+    """
+    Rank each group with one LLM call (all groups of the round in one batch) and
+    return each group's paper IDs, best first.
+    """
+    orderings: List[List[str]] = []
+    logger.info(f"Ranking {label}: {len(groups)} groups")
+    prompts = [
+        _create_ranking_prompt(g, query, ranking_guidance, packer.pack_group(g) if packer else None)
+        for g in groups
+    ]
+
+    call_result = await llm_handler.process(
+        prompts=prompts,
+        response_type=RankingResponse,
+        stage="ranking"
+    )
+    if not call_result.success or not isinstance(call_result.data, list):
+        logger.error(f"{label} failed: {call_result.error}")
+        return orderings
+
+    for idx, item in enumerate(call_result.data):
+        if item.error:
+            logger.error(f"{label} Group {idx} error: {item.error}")
+            continue
+        ranking_resp = item.data
+        if not ranking_resp or not ranking_resp.rankings:
+            logger.error(f"{label} empty or invalid ranking response for group {idx}")
+            continue
+
+        ranked = sorted(ranking_resp.rankings, key=lambda r: r.rank)
+        orderings.append([rank_obj.paper_id for rank_obj in ranked])
+    return orderings
+
+def _uncertain_near_cutoff(ratings: BradleyTerryRatings, top_n: int) -> Tuple[List[str], List[str]]:
+    """
+    Return (current top-N IDs, IDs whose rating interval straddles the top-N cutoff),
+    both in descending rating order.
+    """
+    theta = dict(zip(ratings.ids, ratings.fit()))
+    errors = dict(zip(ratings.ids, ratings.standard_errors()))
+    ordered = ratings.ranked_ids()
+    top_ids = ordered[:top_n]
+    if len(ordered) <= top_n:
+        return top_ids, []
+    cutoff = (theta[ordered[top_n - 1]] + theta[ordered[top_n]]) / 2
+    uncertain = [pid for pid in ordered if abs(theta[pid] - cutoff) <= ADAPTIVE_Z * errors[pid]]
+    return top_ids, uncertain
+
+def _swiss_groups(ordered_ids: List[str], papers_by_id: Dict[str, Paper], offset: int) -> List[List[Paper]]:
+    """
+    Swiss-style pairing: group papers with their neighbours in the current standings,
+    shifting the group boundaries by `offset` so successive waves mix different neighbours.
+    """
+    ids = list(ordered_ids)
+    groups: List[List[Paper]] = []
+    if offset and len(ids) > offset + 1:
+        groups.append([papers_by_id[pid] for pid in ids[:offset]])
+        ids = ids[offset:]
+    groups.extend(create_balanced_groups([papers_by_id[pid] for pid in ids], 2, 5))
+    if len(groups[0]) < 2 and len(groups) > 1:
+        groups[1] = groups[0] + groups[1]
+        groups.pop(0)
+    return [g for g in groups if len(g) >= 2]
+
 async def _conduct_ranking_rounds(
     valid_papers: List[Paper],
     query: str,
     ranking_guidance: str,
     num_rounds: int,
-    paper_scores: Dict[str, List[float]]
+    ratings: BradleyTerryRatings,
+    packer: Optional[ContextPacker] = None,
+    top_n: Optional[int] = None,
+    adaptive: bool = True
 ) -> Dict[str, float]:
     """
     Conduct multiple rounds of ranking to determine paper relevance.
+
+    Every group ranking is added to `ratings` as pairwise outcomes, so a paper's
+    score reflects which papers it was ranked above or below.
+
+    In adaptive mode the first ADAPTIVE_INITIAL_ROUNDS rounds rank every paper in
+    random groups. After that, rounds run in waves: each wave only re-ranks the
+    papers whose rating is still uncertain near the top-N cutoff, grouped with their
+    neighbours in the standings (Swiss-style). Ranking stops once no paper is
+    uncertain, the top-N set has been stable for ADAPTIVE_STABLE_WAVES waves, or
+    `num_rounds` rounds have run. Otherwise all `num_rounds` random rounds run at once.
     
     Args:
         valid_papers: List of papers to rank
         query: User query
         ranking_guidance: Guidance for ranking
-        num_rounds: Number of ranking rounds to conduct
-        paper_scores: Dictionary to store scores
+        num_rounds: Number of ranking rounds to conduct (the upper bound in adaptive mode)
+        ratings: Bradley-Terry model the round results are added to
+        packer: Fits each group's paper content into its token budget
+        top_n: Size of the top set whose membership adaptive mode stabilizes
+        adaptive: Whether to run rounds in adaptive waves
         
     Returns:
-        Dictionary mapping paper IDs to average scores
+        Dictionary mapping paper IDs to scores
     """
-    async def run_round(round_idx: int) -> Dict[str, List[float]]:
-        round_scores = {}
-        logger.info(f"Ranking round {round_idx+1}/{num_rounds}")
-        shuffled = random.sample(valid_papers, len(valid_papers))
-        groups = create_balanced_groups(shuffled, 2, 5)
-        prompts = [_create_ranking_prompt(g, query, ranking_guidance) for g in groups]
-
-        call_result = await llm_handler.process(
-            prompts=prompts,
-            response_type=RankingResponse
-        )
-        if not call_result.success or not isinstance(call_result.data, list):
-            logger.error(f"Round {round_idx+1} failed: {call_result.error}")
-            return round_scores
-
-        for idx, item in enumerate(call_result.data):
-            if item.error:
-                logger.error(f"Round {round_idx+1} Group {idx} error: {item.error}")
-                continue
-            ranking_resp = item.data
-            if not ranking_resp or not ranking_resp.rankings:
-                logger.error(f"Round {round_idx+1} empty or invalid ranking response for group {idx}")
-                continue
-
-            group_size = len(ranking_resp.rankings)
-            for rank_obj in ranking_resp.rankings:
-                pid = rank_obj.paper_id
-                score = (group_size - rank_obj.rank + 1) / group_size
-                round_scores.setdefault(pid, []).append(score)
-        return round_scores
-
-    tasks = [run_round(i) for i in range(num_rounds)]
-    rounds_scores = await asyncio.gather(*tasks)
-    for round_dict in rounds_scores:
-        for pid, scores in round_dict.items():
-            paper_scores.setdefault(pid, []).extend(scores)
-    avg_scores = {pid: (sum(scores) / len(scores)) if scores else 0.0 for pid, scores in paper_scores.items()}
-    return avg_scores
+    def random_groups() -> List[List[Paper]]:
+        return create_balanced_groups(random.sample(valid_papers, len(valid_papers)), 2, 5)
+
+    def record(rounds: List[List[List[str]]]) -> None:
+        for orderings in rounds:
+            for ordering in orderings:
+                ratings.add_ranking(ordering)
+
+    if not adaptive or not top_n or len(valid_papers) <= top_n:
+        record(await asyncio.gather(*(
+            _run_ranking_round(random_groups(), query, ranking_guidance, packer, f"round {i+1}/{num_rounds}")
+            for i in range(num_rounds)
+        )))
+        return ratings.scores()
+
+    papers_by_id = {p.id: p for p in valid_papers}
+    initial = min(ADAPTIVE_INITIAL_ROUNDS, num_rounds)
+    record(await asyncio.gather(*(
+        _run_ranking_round(random_groups(), query, ranking_guidance, packer, f"round {i+1} (initial)")
+        for i in range(initial)
+    )))
+
+    rounds_done = initial
+    stable_waves = 0
+    previous_top, uncertain = _uncertain_near_cutoff(ratings, top_n)
+    while rounds_done < num_rounds and len(uncertain) >= 2:
+        groups = _swiss_groups(uncertain, papers_by_id, offset=(rounds_done % 2) * 2)
+        if not groups:
+            break
+        record([await _run_ranking_round(
+            groups, query, ranking_guidance, packer,
+            f"round {rounds_done+1} (wave over {len(uncertain)} uncertain papers)"
+        )])
+        rounds_done += 1
+
+        top_ids, uncertain = _uncertain_near_cutoff(ratings, top_n)
+        stable_waves = stable_waves + 1 if set(top_ids) == set(previous_top) else 0
+        previous_top = top_ids
+        if stable_waves >= ADAPTIVE_STABLE_WAVES:
+            break
+
+    logger.info(
+        f"Adaptive ranking stopped after {rounds_done}/{num_rounds} rounds "
+        f"({len(uncertain)} papers still uncertain near the top-{top_n} cutoff)"
+    )
+    return ratings.scores()
 
 def create_balanced_groups(papers: List[Paper], min_size: int, max_size: int) -> List[List[Paper]]:
     """
@@ -190,7 +365,12 @@ def create_balanced_groups(papers: List[Paper], min_size: int, max_size: int) ->
         logger.error(f"Error grouping papers: {str(e)}")
         return [papers]
 
-def _create_ranking_prompt(group: List[Paper], query: str, ranking_guidance: str) -> str:
+def _create_ranking_prompt(
+    group: List[Paper],
+    query: str,
+    ranking_guidance: str,
+    contents: Optional[Dict[str, str]] = None
+) -> str:
     """
     Create a prompt for ranking a group of papers.
     
@@ -198,13 +378,15 @@ def _create_ranking_prompt(group: List[Paper], query: str, ranking_guidance: str
         group: Group of papers to rank
         query: User query
         ranking_guidance: Guidance for ranking
+        contents: Packed content per paper ID (defaults to each paper's full text)
         
     Returns:
         Prompt for ranking
     """
     lines = []
     for p in group:
-        lines.append(f"Paper ID: {p.id}\nTitle: {p.title}\nContent: {p.full_text}\n")
+        content = contents.get(p.id, p.full_text) if contents else p.full_text
+        lines.append(f"Paper ID: {p.id}\nTitle: {p.title}\nContent: {content}\n")
     papers_block = "\n".join(lines)
 
     prompt = f"""
@@ -231,7 +413,13 @@ Ensure unique ranks from 1 to {len(group)} are used. Focus on clear, concise exp
 """
     return prompt.strip()
 
-async def _get_paper_analysis(paper: Paper, query: str, ranking_guidance: str) -> Optional[AnalysisResponse]:
+async def _get_paper_analysis(
+    paper: Paper,
+    query: str,
+    ranking_guidance: str,
+    packer: Optional[ContextPacker] = None,
+    passage_top_k: int = 0
+) -> Optional[AnalysisResponse]:
     """
     Get a detailed analysis of a paper's relevance to a query.
     
@@ -239,10 +427,20 @@ async def _get_paper_analysis(paper: Paper, query: str, ranking_guidance: str) -
         paper: Paper to analyze
         query: User query
         ranking_guidance: Guidance for analysis
+        packer: Fits the paper's content into the analysis token budget
+        passage_top_k: If > 0, send only this many query-relevant passages of a long paper
         
     Returns:
         AnalysisResponse object or None if analysis fails
     """
+    passages = select_passages(paper.full_text, [query, ranking_guidance], passage_top_k)
+    if passages:
+        # Passages are verbatim excerpts, so quotes taken from them are still exact
+        full_text = passages
+        if packer:
+            full_text = packer.pack(paper.model_copy(update={"full_text": passages}))
+    else:
+        full_text = packer.pack(paper) if packer else (paper.full_text or '')
     prompt = f"""
 You are an expert in academic literature analysis. Your task is to evaluate the relevance of a given paper to a specific research query and provide a detailed analysis.
 
@@ -251,7 +449,7 @@ Research Query: "{query}"
 User's Ranking Guidance: "{ranking_guidance}"
 
 Paper Title: {paper.title}
-Paper Full Text: {paper.full_text or ''}
+Paper Full Text: {full_text}
 
 Instructions:
 1. Understand the Research Query and User's Ranking Guidance.
@@ -270,14 +468,23 @@ Return a valid JSON object of type AnalysisResponse. Ensure that the JSON contai
 """
     single_result = await llm_handler.process(
         prompts=prompt,
-        response_type=AnalysisResponse
+        response_type=AnalysisResponse,
+        stage="analysis"
     )
     if not single_result.success:
         logger.error(f"Analysis error for {paper.title[:50]}: {single_result.error}")
         return None
     return single_result.data
 
-async def _process_top_paper(paper: Paper, query: str, ranking_guidance: str, average_scores: Dict[str, float]) -> Optional[RankedPaper]:
+async def _process_top_paper(
+    paper: Paper,
+    query: str,
+    ranking_guidance: str,
+    scores: Dict[str, float],
+    uncertainties: Dict[str, float],
+    packer: Optional[ContextPacker] = None,
+    passage_top_k: int = 0
+) -> Optional[RankedPaper]:
     """
     Process a top paper by analyzing it and creating a RankedPaper object.
     
@@ -285,19 +492,23 @@ async def _process_top_paper(paper: Paper, query: str, ranking_guidance: str, av
         paper: Paper to process
         query: User query
         ranking_guidance: Guidance for ranking
-        average_scores: Dictionary mapping paper IDs to scores
+        scores: Dictionary mapping paper IDs to scores
+        uncertainties: Dictionary mapping paper IDs to the standard error of their score
+        packer: Fits the paper's content into the analysis token budget
+        passage_top_k: Passages of a long paper to analyze instead of its full text
         
     Returns:
         RankedPaper object or None if processing fails
     """
     try:
-        analysis_obj = await _get_paper_analysis(paper, query, ranking_guidance)
+        analysis_obj = await _get_paper_analysis(paper, query, ranking_guidance, packer, passage_top_k)
         if not analysis_obj:
             return None
         final_bibtex = await _get_bibtex(paper)
         rp_dict = paper.model_dump()
         rp_dict.update({
-            'relevance_score': average_scores.get(paper.id, 0.0),
+            'relevance_score': scores.get(paper.id, 0.0),
+            'relevance_uncertainty': uncertainties.get(paper.id),
             'analysis': analysis_obj.analysis,
             'relevant_quotes': analysis_obj.relevant_quotes,
             'bibtex': final_bibtex or rp_dict.get('bibtex', ''),
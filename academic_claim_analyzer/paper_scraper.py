@@ -1,35 +1,33 @@
 import asyncio
 import random
 import aiohttp
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from fake_useragent import UserAgent
 import logging
 import sys
 import json
-import fitz  # PyMuPDF
 from bs4 import BeautifulSoup
-import requests
 from urllib.parse import urlparse
 
+from .search.search_config import GlobalSearchConfig
+from .browser_pool import get_browser_pool, shutdown_browser_pool
+from .pdf_extractor import extract_pdf_text, get_pdf_extractor, close_pdf_extractor
+from .search.rate_limiter import acquire_host
+
 class UnifiedWebScraper:
     def __init__(self, session, max_concurrent_tasks=5):
         self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
         self.user_agent = UserAgent()
-        self.browser = None
         self.session = session
         self.logger = logging.getLogger(__name__)
 
     async def initialize(self):
-        try:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(headless=True)
-        except Exception as e:
-            self.logger.error(f"Failed to initialize browser: {str(e)}")
-            raise
+        """Kept for API compatibility; browsers come from the shared pool on demand."""
+        get_browser_pool()
 
     async def close(self):
-        if self.browser:
-            await self.browser.close()
+        """The browser pool outlives individual scrapers; see browser_pool.shutdown_browser_pool()."""
+        pass
 
     def normalize_url(self, url):
         if url.startswith("10.") or url.startswith("doi:"):
@@ -39,8 +37,10 @@ class UnifiedWebScraper:
             return f"http://{url}"
         return url
 
-    async def scrape(self, url, min_words=700, max_retries=3):
+    async def scrape(self, url, min_words=700, max_retries=3, mode=None):
         normalized_url = self.normalize_url(url)
+        if (mode or GlobalSearchConfig.scrape_mode) == "hedged":
+            return await self.scrape_hedged(normalized_url, min_words)
 
         scraping_methods = [
             self.scrape_with_requests,
@@ -66,41 +66,136 @@ class UnifiedWebScraper:
 
         return best_result[0]
 
+    async def _attempt(self, method, url):
+        try:
+            return await method(url) or ""
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.debug(f"{method.__name__} failed for {url}: {str(e)}")
+            return ""
+
+    async def scrape_hedged(self, url, min_words=700):
+        """
+        Race the scraping strategies instead of running them one after another.
+
+        The plain HTTP fetch starts immediately; the browser (and, for PDF links, the
+        direct PDF download) joins after GlobalSearchConfig.scrape_hedge_delay seconds,
+        or as soon as the fetch finishes without enough text. The first result with at
+        least `min_words` words wins and the other attempts are cancelled. After
+        scrape_deadline seconds the longest text seen so far is returned.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        hedge_at = started + GlobalSearchConfig.scrape_hedge_delay
+        deadline = started + GlobalSearchConfig.scrape_deadline
+
+        hedges = [self.scrape_with_playwright]
+        if url.lower().endswith('.pdf'):
+            hedges.append(self.scrape_pdf)
+
+        pending = {asyncio.create_task(self._attempt(self.scrape_with_requests, url))}
+        hedged = False
+        best = ("", 0)
+        try:
+            while True:
+                now = loop.time()
+                if not hedged and (now >= hedge_at or not pending):
+                    pending |= {asyncio.create_task(self._attempt(method, url)) for method in hedges}
+                    hedged = True
+                if not pending or now >= deadline:
+                    break
+
+                wait_until = deadline if hedged else min(hedge_at, deadline)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0, wait_until - now),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    content = task.result()
+                    word_count = len(content.split())
+                    if word_count >= min_words:
+                        return content
+                    if word_count > best[1]:
+                        best = (content, word_count)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if loop.time() >= deadline:
+            self.logger.debug(f"Scrape deadline reached for {url}; returning best partial result")
+        return best[0]
+
     async def scrape_with_requests(self, url):
-        response = requests.get(url, headers={"User-Agent": self.user_agent.random})
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, "html.parser")
-            main_content = soup.find("div", id="abstract") or soup.find("main") or soup.find("body")
-            if main_content:
-                for script in main_content(["script", "style"]):
-                    script.decompose()
-                return main_content.get_text(separator="\n", strip=True)
+        """
+        Plain HTTP fetch over the shared aiohttp session. The body is streamed with a
+        size cap and parsed in a worker thread, so a slow or huge page never blocks
+        the event loop.
+        """
+        timeout = aiohttp.ClientTimeout(total=GlobalSearchConfig.scrape_timeout_seconds)
+        await acquire_host(url)
+        async with self.session.get(
+            url,
+            headers={"User-Agent": self.user_agent.random},
+            timeout=timeout
+        ) as response:
+            if response.status != 200:
+                return ""
+            content_type = response.headers.get("Content-Type", "").lower()
+            content = await self._read_capped(response)
+
+        if not content:
+            return ""
+        if "application/pdf" in content_type:
+            return await get_pdf_extractor().extract_text(content)
+        return await asyncio.to_thread(self.extract_main_text, content)
+
+    async def _read_capped(self, response):
+        """Read a response body in chunks, stopping at GlobalSearchConfig.scrape_max_bytes."""
+        max_bytes = GlobalSearchConfig.scrape_max_bytes
+        chunks = []
+        total = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_bytes:
+                self.logger.debug(f"Response from {response.url} truncated at {max_bytes} bytes")
+                break
+        return b"".join(chunks)[:max_bytes]
+
+    @staticmethod
+    def extract_main_text(html_bytes):
+        soup = BeautifulSoup(html_bytes, "html.parser")
+        main_content = soup.find("div", id="abstract") or soup.find("main") or soup.find("body")
+        if main_content:
+            for script in main_content(["script", "style"]):
+                script.decompose()
+            return main_content.get_text(separator="\n", strip=True)
         return ""
 
     async def scrape_with_playwright(self, url):
-        if not self.browser:
-            await self.initialize()
-        context = await self.browser.new_context(
-            user_agent=self.user_agent.random,
-            viewport={"width": 1920, "height": 1080},
-            ignore_https_errors=True,
-        )
-        page = await context.new_page()
-        try:
-            await page.goto(url, wait_until="networkidle", timeout=15000)
-            content = await self.extract_text_content(page)
-            return content
-        except PlaywrightTimeoutError:
-            return ""
-        finally:
-            await page.close()
+        async with get_browser_pool().page(user_agent=self.user_agent.random) as page:
+            try:
+                await acquire_host(url)
+                await page.goto(url, wait_until="networkidle", timeout=15000)
+                content = await self.extract_text_content(page)
+                return content
+            except PlaywrightTimeoutError:
+                return ""
 
     async def scrape_pdf(self, url):
-        async with self.session.get(url) as response:
-            if response.status == 200:
-                pdf_bytes = await response.read()
-                return self.extract_text_from_pdf(pdf_bytes)
-        return ""
+        timeout = aiohttp.ClientTimeout(total=GlobalSearchConfig.scrape_timeout_seconds)
+        await acquire_host(url)
+        async with self.session.get(url, timeout=timeout) as response:
+            if response.status != 200:
+                return ""
+            pdf_bytes = await self._read_capped(response)
+        if not pdf_bytes:
+            return ""
+        return await get_pdf_extractor().extract_text(pdf_bytes)
 
     async def extract_text_content(self, page):
         try:
@@ -116,14 +211,8 @@ class UnifiedWebScraper:
             return ""
 
     def extract_text_from_pdf(self, pdf_bytes):
-        try:
-            document = fitz.open("pdf", pdf_bytes)
-            text = ""
-            for page in document:
-                text += page.get_text()
-            return text.strip()
-        except Exception:
-            return ""
+        """Synchronous extraction; coroutines should use get_pdf_extractor().extract_text()."""
+        return extract_pdf_text(pdf_bytes, GlobalSearchConfig.pdf_max_pages)
 
 async def main():
     logging.basicConfig(
@@ -188,6 +277,8 @@ async def main():
         print(f"Failed scrapes: {failure_count}")
 
         await scraper.close()
+        await shutdown_browser_pool()
+        close_pdf_extractor()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
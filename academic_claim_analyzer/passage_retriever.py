@@ -0,0 +1,143 @@
+# academic_claim_analyzer/passage_retriever.py
+
+import re
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_WORDS = 200
+DEFAULT_CHUNK_OVERLAP = 40
+DEFAULT_TOP_K = 8
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it its
+may more most no not of on or our such than that the their them then there these they this those to was
+we were what when where which while who whom why will with would you your paper study studies does
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with common English stopwords removed."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+def chunk_text(text: str, chunk_words: int = DEFAULT_CHUNK_WORDS, overlap: int = DEFAULT_CHUNK_OVERLAP) -> List[str]:
+    """Split text into overlapping windows of `chunk_words` words."""
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, chunk_words - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+class BM25Index:
+    """
+    Okapi BM25 over a small set of documents, with the term-frequency matrix held
+    in NumPy so scoring a query against every document is a few vector operations.
+    """
+
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+
+        tokenized = [tokenize(doc) for doc in self.documents]
+        self.vocabulary: Dict[str, int] = {}
+        for tokens in tokenized:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        self.tf = np.zeros((len(self.documents), max(1, len(self.vocabulary))), dtype=np.float32)
+        for row, tokens in enumerate(tokenized):
+            if tokens:
+                columns, counts = np.unique([self.vocabulary[t] for t in tokens], return_counts=True)
+                self.tf[row, columns] = counts
+
+        self.doc_lengths = self.tf.sum(axis=1)
+        self.avg_length = float(self.doc_lengths.mean()) if len(self.documents) else 0.0
+        doc_freq = (self.tf > 0).sum(axis=0)
+        n = len(self.documents)
+        self.idf = np.log1p((n - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        # Length-normalized term weights only depend on the corpus, so compute them once
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / max(self.avg_length, 1e-9))
+        self.weights = self.tf * (self.k1 + 1) / (self.tf + norm[:, None])
+
+    def score(self, query: str) -> np.ndarray:
+        """BM25 score of every document for `query` (zeros if no query term is known)."""
+        columns = [self.vocabulary[t] for t in set(tokenize(query)) if t in self.vocabulary]
+        if not columns or not len(self.documents):
+            return np.zeros(len(self.documents), dtype=np.float32)
+        return self.weights[:, columns] @ self.idf[columns]
+
+class PassageIndex:
+    """
+    A per-paper passage index: the full text is chunked into overlapping windows and
+    indexed with BM25 so only the passages relevant to a request are put in a prompt.
+    """
+
+    def __init__(self, text: str, chunk_words: int = DEFAULT_CHUNK_WORDS, overlap: int = DEFAULT_CHUNK_OVERLAP):
+        self.passages = chunk_text(text, chunk_words, overlap)
+        self.index = BM25Index(self.passages)
+
+    def top_passages(self, queries: Sequence[str], k: int = DEFAULT_TOP_K, include_lead: bool = True) -> List[str]:
+        """
+        Select up to `k` passages covering all `queries`.
+
+        Passages are picked round-robin from each query's ranking, so every query
+        (e.g. each exclusion criterion) gets its best evidence in before any query
+        gets its second-best. The selection is returned in document order.
+
+        Args:
+            queries: Texts to retrieve evidence for (request query, field descriptions, ...)
+            k: Maximum number of passages
+            include_lead: Always include the first passage (usually title/abstract/introduction)
+
+        Returns:
+            The selected passages
+        """
+        if len(self.passages) <= k:
+            return list(self.passages)
+
+        selected: List[int] = [0] if include_lead else []
+        rankings = []
+        for query in queries:
+            scores = self.index.score(query)
+            if scores.any():
+                order = np.argsort(-scores, kind="stable")
+                rankings.append([int(i) for i in order if scores[i] > 0])
+
+        position = 0
+        while len(selected) < k and any(position < len(r) for r in rankings):
+            for ranking in rankings:
+                if position < len(ranking) and ranking[position] not in selected:
+                    selected.append(ranking[position])
+                    if len(selected) >= k:
+                        break
+            position += 1
+
+        return [self.passages[i] for i in sorted(selected)]
+
+def select_passages(
+    text: Optional[str],
+    queries: Sequence[str],
+    k: int = DEFAULT_TOP_K,
+    chunk_words: int = DEFAULT_CHUNK_WORDS
+) -> Optional[str]:
+    """
+    Return the top-k passages of `text` for `queries`, joined with "[...]" markers, or
+    None when retrieval would not shrink the text (short papers, k <= 0).
+    """
+    if not text or k <= 0 or len(text.split()) <= k * chunk_words:
+        return None
+    queries = [q for q in queries if q and q.strip()]
+    if not queries:
+        return None
+    passages = PassageIndex(text, chunk_words).top_passages(queries, k)
+    return "\n[...]\n".join(passages)
@@ -0,0 +1,180 @@
+# academic_claim_analyzer/pdf_extractor.py
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+from .search.search_config import GlobalSearchConfig
+
+logger = logging.getLogger(__name__)
+
+def extract_pdf_text(pdf_bytes: bytes, max_pages: Optional[int] = None) -> str:
+    """
+    Extract the text of a PDF with PyMuPDF. Runs inside the worker processes, but is
+    also safe to call directly.
+
+    Args:
+        pdf_bytes: Raw PDF document
+        max_pages: Stop after this many pages (None for all)
+
+    Returns:
+        The page texts joined by newlines, or "" if the document cannot be parsed
+    """
+    try:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as document:
+            pages = []
+            for index, page in enumerate(document):
+                if max_pages and index >= max_pages:
+                    break
+                pages.append(page.get_text())
+        return "\n".join(pages).strip()
+    except Exception:
+        return ""
+
+def _being_cancelled() -> bool:
+    """Whether the current task has a pending cancellation (always assumed before Python 3.11)."""
+    cancelling = getattr(asyncio.current_task(), "cancelling", None)
+    return cancelling() > 0 if cancelling is not None else True
+
+class PDFExtractor:
+    """
+    Shared PDF text extraction service backed by a process pool, so parsing large
+    PDFs uses every core and never blocks the event loop.
+
+    At most `max_pending` documents are queued at once (callers wait for a slot),
+    only the first `max_pages` pages are read, and a document that takes longer than
+    `timeout` seconds is given up on. With `workers=0` extraction runs in a thread.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.workers = GlobalSearchConfig.pdf_workers if workers is None else workers
+        self.max_pending = max_pending or GlobalSearchConfig.pdf_max_pending
+        self.max_pages = GlobalSearchConfig.pdf_max_pages if max_pages is None else max_pages
+        self.timeout = timeout or GlobalSearchConfig.pdf_timeout
+        self.documents = 0
+        self.timeouts = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Optional[asyncio.Semaphore] = None
+        self._pending_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # spawn, not fork: the parent holds threads (SQLite, Playwright, aiohttp resolver)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _get_pending(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._pending is None or self._pending_loop is not loop:
+            self._pending = asyncio.Semaphore(self.max_pending)
+            self._pending_loop = loop
+        return self._pending
+
+    def _recycle_executor(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        """
+        Terminate the worker processes of `executor` and let the next extraction start
+        a new pool. Only the current pool is recycled, so callers whose pool was
+        already replaced do not kill the new one.
+        """
+        if executor is None or executor is not self._executor:
+            return
+        self._executor = None
+        # shutdown() alone leaves a running worker parsing; terminating it frees its slot.
+        # Documents still queued on the pool fail with BrokenProcessPool and are retried.
+        # The worker processes are private to ProcessPoolExecutor, so if they cannot be
+        # read the pool is abandoned instead: its running worker finishes on its own and
+        # queued documents are cancelled, then retried on the new pool.
+        try:
+            workers = list(executor._processes.values())
+        except (AttributeError, RuntimeError):
+            logger.warning("Cannot reach the PDF worker processes; abandoning the pool without terminating them")
+            executor.shutdown(wait=False, cancel_futures=True)
+            return
+        for process in workers:
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    async def extract_text(self, pdf_bytes: bytes) -> str:
+        """
+        Extract text from PDF bytes off the event loop.
+
+        A document that times out has its worker process terminated (the pool is
+        recycled), since an abandoned worker would keep parsing it and hold a slot.
+        Other documents in flight on that pool are then retried once on the new pool.
+
+        Args:
+            pdf_bytes: Raw PDF document
+
+        Returns:
+            The extracted text, or "" on parse failure or timeout
+        """
+        if not pdf_bytes:
+            return ""
+        loop = asyncio.get_running_loop()
+        async with self._get_pending():
+            self.documents += 1
+            for attempt in range(2):
+                executor = self._get_executor()
+                future = loop.run_in_executor(executor, extract_pdf_text, pdf_bytes, self.max_pages)
+                try:
+                    return await asyncio.wait_for(future, timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    logger.warning(f"PDF extraction timed out after {self.timeout}s ({len(pdf_bytes)} bytes)")
+                    self._recycle_executor(executor)
+                    return ""
+                except BrokenProcessPool:
+                    if executor is self._executor:
+                        logger.error("PDF worker pool crashed; restarting it")
+                        self._recycle_executor(executor)
+                        return ""
+                    if attempt:
+                        return ""
+                    # The pool was recycled after another document timed out
+                    logger.debug("PDF worker pool was recycled; retrying extraction")
+                except asyncio.CancelledError:
+                    # An abandoned pool cancels its queued documents; anything else is our own cancellation
+                    if executor is self._executor or attempt or _being_cancelled():
+                        raise
+                    logger.debug("PDF worker pool was abandoned; retrying extraction")
+                except Exception as e:
+                    logger.error(f"PDF extraction failed: {str(e)}")
+                    return ""
+            return ""
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+# Process-wide extractor; its worker processes start on first use.
+_pdf_extractor: Optional[PDFExtractor] = None
+
+def get_pdf_extractor() -> PDFExtractor:
+    global _pdf_extractor
+    if _pdf_extractor is None:
+        _pdf_extractor = PDFExtractor()
+    return _pdf_extractor
+
+def close_pdf_extractor() -> None:
+    """Shut down the worker processes of the process-wide extractor."""
+    global _pdf_extractor
+    if _pdf_extractor is not None:
+        _pdf_extractor.close()
+        _pdf_extractor = None
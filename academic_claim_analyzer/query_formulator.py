@@ -1,8 +1,11 @@
 # academic_claim_analyzer/query_formulator.py
 
-from typing import List
+import asyncio
 import logging
-from pydantic import BaseModel, Field
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, Field, create_model
 
 from .llm_handler_config import llm_handler
 logger = logging.getLogger(__name__)
@@ -171,26 +174,119 @@ Example JSON Output:
 Generate {NUM_QUERIES} high-quality, diverse search queries that are optimized for academic literature databases and tailored to the Search Platform Guidance provided. Focus on creating queries that are precise, comprehensive, and effective in retrieving relevant research articles for the User Research Query.
 """
 
+GENERATE_MULTI_PLATFORM_QUERIES = """
+You are an expert in academic literature search query formulation. Your task is to generate optimized search queries for several academic databases at once, to find research articles relevant to a user's research query.
+
+User Research Query:
+{QUERY}
+
+Number of Queries to Generate per Platform: {NUM_QUERIES}
+
+Platforms and their Search Platform Guidance:
+{PLATFORM_SECTIONS}
+
+Instructions:
+1. Understand the User Research Query. Identify the core concepts, keywords, and nuances of the research topic.
+2. For each platform above, review its Search Platform Guidance. Each guidance gives the specific syntax, operators, and best practices for that platform only; never use one platform's syntax in another platform's queries.
+3. Generate {NUM_QUERIES} distinct search queries for each platform. Each query should represent a unique approach to searching for relevant articles. Consider variations in:
+    - Keywords: Use synonyms, related terms, and broader or narrower concepts.
+    - Phrase variations: Explore different phrasing and combinations of keywords.
+    - Boolean operators: Strategically use AND, OR, NOT to refine search focus.
+    - Field codes (if applicable): Utilize field codes (e.g., TITLE, ABS, KEY) as per the platform guidance to target specific document sections.
+4. Ensure each generated query is syntactically correct and optimized for its platform, adhering to that platform's guidance.
+5. Aim for diversity in the generated queries to comprehensively cover the research topic from multiple angles.
+6. Output a single JSON object with one list of query strings per platform, using exactly these keys: {PLATFORM_KEYS}. If any query string contains double quotes, escape them with backslashes (\\").
+
+Generate {NUM_QUERIES} high-quality, diverse search queries for every platform listed. Focus on creating queries that are precise, comprehensive, and effective in retrieving relevant research articles for the User Research Query.
+"""
+
+PLATFORM_GUIDES = {
+    "scopus": SCOPUS_SEARCH_GUIDE,
+    "openalex": OPENALEX_SEARCH_GUIDE,
+    "arxiv": ARXIV_SEARCH_GUIDE,
+    "core": CORE_SEARCH_GUIDE,
+    "semantic_scholar": SEMANTIC_SCHOLAR_SEARCH_GUIDE,
+}
+
+QUERY_CACHE_MAX_ENTRIES = 1024
+
 class QueryResponse(BaseModel):
     queries: List[str] = Field(..., description="List of generated search queries")
 
+class QueryCache:
+    """
+    In-process LRU cache of formulated queries keyed by (user query, platform,
+    number of queries), so a query that reappears in a batch (or in several
+    entries of a multi-query request) is only formulated once per platform.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, int], List[str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(user_query: str, platform: str, num_queries: int) -> Tuple[str, str, int]:
+        return " ".join(user_query.split()), platform.lower(), num_queries
+
+    def get(self, user_query: str, platform: str, num_queries: int) -> Optional[List[str]]:
+        key = self.make_key(user_query, platform, num_queries)
+        queries = self._entries.get(key)
+        if queries is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(queries)
+
+    def set(self, user_query: str, platform: str, num_queries: int, queries: List[str]) -> None:
+        if not queries:
+            return
+        key = self.make_key(user_query, platform, num_queries)
+        self._entries[key] = list(queries)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+_query_cache = QueryCache()
+
+def get_query_cache() -> QueryCache:
+    return _query_cache
+
+@lru_cache(maxsize=None)
+def multi_platform_response_model(platforms: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response model with one required list of queries per platform."""
+    fields = {
+        platform: (List[str], Field(..., description=f"Search queries for {platform}"))
+        for platform in platforms
+    }
+    return create_model("MultiPlatformQueryResponse", **fields)
+
 async def formulate_queries(user_query: str, num_queries: int, query_type: str) -> List[str]:
     """
     Generate search queries for a specific platform (scopus, openalex, arxiv, core, semantic_scholar).
     """
-    if query_type.lower() == 'scopus':
-        search_guidance = SCOPUS_SEARCH_GUIDE
-    elif query_type.lower() == 'openalex':
-        search_guidance = OPENALEX_SEARCH_GUIDE
-    elif query_type.lower() == 'arxiv':
-        search_guidance = ARXIV_SEARCH_GUIDE
-    elif query_type.lower() == 'core':
-        search_guidance = CORE_SEARCH_GUIDE
-    elif query_type.lower() == 'semantic_scholar':
-        search_guidance = SEMANTIC_SCHOLAR_SEARCH_GUIDE
-    else:
+    search_guidance = PLATFORM_GUIDES.get(query_type.lower())
+    if search_guidance is None:
         raise ValueError(f"Unsupported query type: {query_type}")
 
+    cached = _query_cache.get(user_query, query_type, num_queries)
+    if cached is not None:
+        return cached
+    return await _formulate_uncached(user_query, num_queries, query_type)
+
+async def _formulate_uncached(user_query: str, num_queries: int, query_type: str) -> List[str]:
+    """The LLM call behind formulate_queries, for callers that already missed the cache."""
+    search_guidance = PLATFORM_GUIDES[query_type.lower()]
     prompt = GENERATE_QUERIES.format(
         QUERY=user_query,
         SEARCH_GUIDANCE=search_guidance,
@@ -199,12 +295,81 @@ async def formulate_queries(user_query: str, num_queries: int, query_type: str)
 
     result = await llm_handler.process(
         prompts=prompt,
-
-        response_type=QueryResponse
+        response_type=QueryResponse,
+        stage="query_formulation"
     )
 
     if not result.success:
         logger.error(f"Failed to formulate queries: {result.error}")
         return []
 
-    return result.data.queries
\ No newline at end of file
+    _query_cache.set(user_query, query_type, num_queries, result.data.queries)
+    return result.data.queries
+
+async def formulate_queries_multi(user_query: str, num_queries: int, platforms: List[str]) -> Dict[str, List[str]]:
+    """
+    Generate search queries for several platforms with a single LLM call.
+
+    Platforms already in the query cache are not asked for again. Platforms the
+    combined call fails to cover (call error, or an empty list) are formulated
+    with a per-platform call instead.
+    
+    Args:
+        user_query: The user's research query
+        num_queries: Number of queries to generate per platform
+        platforms: Platform names (scopus, openalex, arxiv, core, semantic_scholar)
+        
+    Returns:
+        Dictionary mapping each platform to its queries
+    """
+    platforms = [p.lower() for p in platforms]
+    for platform in platforms:
+        if platform not in PLATFORM_GUIDES:
+            raise ValueError(f"Unsupported query type: {platform}")
+
+    queries: Dict[str, List[str]] = {}
+    missing = []
+    for platform in platforms:
+        cached = _query_cache.get(user_query, platform, num_queries)
+        if cached is not None:
+            queries[platform] = cached
+        else:
+            missing.append(platform)
+
+    if len(missing) > 1:
+        sections = "\n".join(
+            f"### Platform: {platform}\n{PLATFORM_GUIDES[platform]}" for platform in missing
+        )
+        prompt = GENERATE_MULTI_PLATFORM_QUERIES.format(
+            QUERY=user_query,
+            NUM_QUERIES=num_queries,
+            PLATFORM_SECTIONS=sections,
+            PLATFORM_KEYS=", ".join(missing)
+        )
+        result = await llm_handler.process(
+            prompts=prompt,
+            response_type=multi_platform_response_model(tuple(missing)),
+            stage="query_formulation"
+        )
+        if result.success:
+            for platform in missing:
+                platform_queries = getattr(result.data, platform, None) or []
+                if platform_queries:
+                    queries[platform] = platform_queries
+                    _query_cache.set(user_query, platform, num_queries, platform_queries)
+        else:
+            logger.warning(f"Combined query formulation failed, falling back to per-platform calls: {result.error}")
+
+    fallback = [p for p in missing if p not in queries]
+    if fallback:
+        results = await asyncio.gather(
+            *(_formulate_uncached(user_query, num_queries, platform) for platform in fallback),
+            return_exceptions=True
+        )
+        for platform, result in zip(fallback, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error formulating queries for {platform}: {str(result)}")
+            else:
+                queries[platform] = result
+
+    return {platform: queries.get(platform, []) for platform in platforms}
@@ -2,16 +2,20 @@
 
 import asyncio
 import logging
-from typing import List
 
 from .models import RequestAnalysis
-from .query_formulator import formulate_queries
+from .query_formulator import formulate_queries, formulate_queries_multi
 
 logger = logging.getLogger(__name__)
 
+SUPPORTED_PLATFORMS = ["openalex", "scopus", "core", "arxiv", "semantic_scholar"]
+
 async def formulate_queries_for_platforms(analysis: RequestAnalysis) -> None:
     """
     Formulate queries for each platform based on the user query.
+
+    By default each platform gets its own LLM call; with `combined_query_formulation`
+    in the analysis parameters, all platforms are covered by one combined call.
     
     Args:
         analysis: The RequestAnalysis object containing the user query
@@ -20,29 +24,28 @@ async def formulate_queries_for_platforms(analysis: RequestAnalysis) -> None:
         "platforms", 
         ["openalex", "scopus", "core", "arxiv", "semantic_scholar"]
     )
-    tasks = []
     num_queries = analysis.parameters["num_queries"]
 
-    if "openalex" in chosen_platforms:
-        tasks.append(formulate_queries(analysis.query, num_queries, "openalex"))
-    if "scopus" in chosen_platforms:
-        tasks.append(formulate_queries(analysis.query, num_queries, "scopus"))
-    if "core" in chosen_platforms:
-        tasks.append(formulate_queries(analysis.query, num_queries, "core"))
-    if "arxiv" in chosen_platforms:
-        tasks.append(formulate_queries(analysis.query, num_queries, "arxiv"))
-    if "semantic_scholar" in chosen_platforms:
-        tasks.append(formulate_queries(analysis.query, num_queries, "semantic_scholar"))
+    # Get the platforms we're actually using
+    appended_platforms = [p for p in SUPPORTED_PLATFORMS if p in chosen_platforms]
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if analysis.parameters.get("combined_query_formulation", False):
+        try:
+            queries = await formulate_queries_multi(analysis.query, num_queries, appended_platforms)
+        except Exception as e:
+            logger.error(f"Error formulating queries, falling back to per-platform calls: {str(e)}")
+        else:
+            for platform in appended_platforms:
+                for q in queries.get(platform, []):
+                    analysis.add_query(q, platform)
+            return
 
-    # Get the platforms we're actually using
-    appended_platforms = [p for p in chosen_platforms 
-                         if p in ["openalex", "scopus", "core", "arxiv", "semantic_scholar"]]
+    tasks = [formulate_queries(analysis.query, num_queries, platform) for platform in appended_platforms]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
 
     for platform, result in zip(appended_platforms, results):
         if isinstance(result, Exception):
             logger.error(f"Error formulating queries for {platform}: {str(result)}")
         else:
             for q in result:
-                analysis.add_query(q, platform)
\ No newline at end of file
+                analysis.add_query(q, platform)
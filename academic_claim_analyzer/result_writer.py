@@ -0,0 +1,129 @@
+# academic_claim_analyzer/result_writer.py
+
+import os
+import json
+import shutil
+import time
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FSYNC_EVERY = 16
+DEFAULT_FSYNC_INTERVAL = 5.0
+
+class JSONLResultWriter:
+    """
+    Append-only JSON Lines file of batch results, one {"request_id", "result"} record
+    per line, written as each request completes.
+
+    Every record is flushed to the OS immediately, but fsync is batched: it runs after
+    `fsync_every` records or `fsync_interval` seconds, whichever comes first, and on
+    close. A crash can therefore lose at most the last unsynced records, and the
+    record cut off mid-line is skipped by jsonl_to_json.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_every: int = DEFAULT_FSYNC_EVERY,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL
+    ):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.written = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, request_id: str, result: Any) -> None:
+        line = json.dumps({"request_id": request_id, "result": result}, ensure_ascii=False, default=str)
+        self._file.write(line + "\n")
+        self._file.flush()
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush and fsync everything written so far."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "JSONLResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _index_records(jsonl_path: str) -> Dict[str, int]:
+    """
+    Map each request ID to the byte offset of its last record, in order of first
+    appearance (as repeated assignment to a dict would). Unreadable lines are skipped.
+    """
+    offsets: Dict[str, int] = {}
+    with open(jsonl_path, 'rb') as f:
+        offset = 0
+        for line_number, line in enumerate(f, start=1):
+            try:
+                request_id = json.loads(line)["request_id"]
+            except (ValueError, KeyError, TypeError):
+                if line.strip():
+                    logger.warning(f"Skipping unreadable record on line {line_number} of {jsonl_path}")
+            else:
+                offsets[str(request_id)] = offset
+            offset += len(line)
+    return offsets
+
+def jsonl_to_json(jsonl_path: str, json_path: str) -> int:
+    """
+    Convert a results JSONL file into the pretty-printed {request_id: result} JSON
+    file, byte-for-byte as json.dump(..., indent=2) would write it, while holding only
+    one record in memory at a time.
+
+    Args:
+        jsonl_path: File written by JSONLResultWriter
+        json_path: Output JSON file
+
+    Returns:
+        The number of requests written
+    """
+    offsets = _index_records(jsonl_path)
+    with open(jsonl_path, 'rb') as source, open(json_path, 'w', encoding='utf-8') as out:
+        out.write("{")
+        for i, (request_id, offset) in enumerate(offsets.items()):
+            source.seek(offset)
+            result = json.loads(source.readline())["result"]
+            value = json.dumps(result, ensure_ascii=False, indent=2, default=str).replace("\n", "\n  ")
+            out.write(("," if i else "") + "\n  " + json.dumps(request_id, ensure_ascii=False) + ": " + value)
+        out.write("\n}" if offsets else "}")
+    return len(offsets)
+
+def merge_jsonl(paths: List[str], out_path: str) -> None:
+    """
+    Concatenate results JSONL files (e.g. one per worker process) into `out_path`,
+    streaming. A missing file is skipped; a file whose last record was cut off still
+    ends with a line break, so the next file's first record stays readable.
+    """
+    with open(out_path, 'wb') as out:
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as source:
+                shutil.copyfileobj(source, out)
+                if source.tell() > 0:
+                    source.seek(-1, os.SEEK_END)
+                    if source.read(1) != b"\n":
+                        out.write(b"\n")
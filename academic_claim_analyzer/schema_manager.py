@@ -142,4 +142,97 @@ def create_combined_schema(
         }
     }
 
-    return type("CombinedSchema", (BaseModel,), namespace)
\ No newline at end of file
+    return type("CombinedSchema", (BaseModel,), namespace)
+
+def create_screening_schema(exclusion_schema: Optional[Type[BaseModel]]) -> Type[BaseModel]:
+    """
+    Creates the schema used for abstract-level pre-screening: every exclusion
+    criterion plus an `is_relevant` relevance gate.
+    
+    Args:
+        exclusion_schema: Pydantic model for exclusion criteria (may be None)
+        
+    Returns:
+        A Pydantic model with one boolean field per criterion and `is_relevant`
+    """
+    annotations = {}
+    fields = {}
+    properties = {}
+
+    if exclusion_schema:
+        for name, field in exclusion_schema.model_fields.items():
+            description = field.description or f"Exclusion: {name}"
+            annotations[name] = bool
+            fields[name] = Field(description=description)
+            properties[name] = {'type': 'boolean', 'description': description}
+
+    relevance_description = (
+        "Could this paper plausibly be relevant to the research query? "
+        "False only if the title and abstract show it is clearly off-topic."
+    )
+    annotations['is_relevant'] = bool
+    fields['is_relevant'] = Field(description=relevance_description)
+    properties['is_relevant'] = {'type': 'boolean', 'description': relevance_description}
+
+    namespace = {
+        '__annotations__': annotations,
+        **fields,
+        'model_config': {
+            'json_schema_extra': {
+                'type': 'object',
+                'required': list(annotations.keys()),
+                'additionalProperties': False,
+                'properties': properties
+            }
+        }
+    }
+
+    return type("ScreeningSchema", (BaseModel,), namespace)
+
+def create_batch_schema(item_schema: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Creates the response schema for evaluating several papers in one call: a
+    `results` list with one `item_schema` object per paper, tagged with its `paper_id`.
+
+    Entries are typed as plain dicts so that one malformed entry does not fail the
+    whole response; callers validate each entry against `item_schema` themselves.
+    The advertised JSON schema still describes the full entry shape.
+    
+    Args:
+        item_schema: Pydantic model for a single paper's result
+        
+    Returns:
+        A Pydantic model with a `results` list field
+    """
+    item_json = item_schema.model_json_schema()
+    item_properties = {
+        'paper_id': {'type': 'string', 'description': "The Paper ID given for the paper"},
+        **item_json.get('properties', {})
+    }
+    results_description = "One entry per paper, in the order the papers were given"
+
+    namespace = {
+        '__annotations__': {'results': List[Dict[str, Any]]},
+        'results': Field(description=results_description),
+        'model_config': {
+            'json_schema_extra': {
+                'type': 'object',
+                'required': ['results'],
+                'additionalProperties': False,
+                'properties': {
+                    'results': {
+                        'type': 'array',
+                        'description': results_description,
+                        'items': {
+                            'type': 'object',
+                            'required': list(item_properties.keys()),
+                            'additionalProperties': False,
+                            'properties': item_properties
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    return type(f"{item_schema.__name__}Batch", (BaseModel,), namespace)
@@ -3,30 +3,37 @@
 import aiohttp
 import asyncio
 import logging
-import fitz  # PyMuPDF
 import xml.etree.ElementTree as ET
 import html
-from typing import List, Optional
+from typing import Any, List, Optional
 from .base import BaseSearch
 from ..models import Paper
+from ..fulltext_store import get_fulltext_store, normalize_fulltext_key
 from ..search.search_config import GlobalSearchConfig, calculate_backoff
+from .response_cache import cached_fetch
+from .rate_limiter import acquire_host
 
 logger = logging.getLogger(__name__)
 
+def _pdf_extractor():
+    # Imported lazily: pdf_extractor imports search_config, which initializes this package
+    from ..pdf_extractor import get_pdf_extractor
+    return get_pdf_extractor()
+
 class ArxivSearch(BaseSearch):
     """
     Perform a search against the arXiv API using natural language queries.
 
-    This class fetches the arXiv RSS/Atom feed, downloads each paper's PDF 
-    directly from arXiv, extracts text in-memory with PyMuPDF, and returns 
-    fully populated Paper objects. 
+    This class fetches the arXiv RSS/Atom feed and returns metadata-only Paper
+    objects. Full text is filled in later by fetch_full_text, which downloads the
+    PDF directly from arXiv and extracts text in-memory with PyMuPDF.
     """
+    concurrency_setting = "arxiv_concurrency"
 
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         # Overridden concurrency from GlobalSearchConfig
         self.base_url = "http://export.arxiv.org/api/query"
-        # Must keep concurrency=1 if we want strict 1 request at a time
-        self.semaphore = asyncio.Semaphore(GlobalSearchConfig.arxiv_concurrency)
 
     async def search(self, query: str, limit: int = 30) -> List[Paper]:
         """
@@ -38,8 +45,8 @@ class ArxivSearch(BaseSearch):
 
         # We'll add a simple retry/backoff loop around the entire feed fetch
         max_attempts = GlobalSearchConfig.max_retries
-        for attempt in range(max_attempts):
-            async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
+            for attempt in range(max_attempts):
                 async with self.semaphore:
                     try:
                         # Enforce an inter-request interval if needed
@@ -50,10 +57,6 @@ class ArxivSearch(BaseSearch):
                             logger.warning(f"Arxiv: Retrying feed fetch, backoff={backoff_time:.1f}s (attempt {attempt}/{max_attempts})")
                             await asyncio.sleep(backoff_time)
 
-                        # Also ensure the mandatory 1 request / 3 seconds overall
-                        # We'll do a quick sleep before each attempt
-                        await asyncio.sleep(GlobalSearchConfig.arxiv_request_interval)
-
                         arxiv_url = (
                             f"{self.base_url}"
                             f"?search_query=all:{self._escape_query(query)}"
@@ -61,27 +64,33 @@ class ArxivSearch(BaseSearch):
                         )
 
                         logger.debug(f"Arxiv: URL => {arxiv_url}")
-                        async with session.get(arxiv_url) as response:
-                            if response.status != 200:
-                                text_resp = await response.text()
-                                logger.error(f"Arxiv: API request failed ({response.status}): {text_resp[:500]}")
-                                # if 5xx or similar, we might want to retry
-                                if 500 <= response.status < 600 and attempt < max_attempts - 1:
-                                    continue
-                                return []
-
-                            data = await response.text()
-                            entries = self._parse_atom_feed(data)
-                            logger.info(f"Arxiv: Retrieved {len(entries)} entries from the feed")
-
-                            results = []
-                            for entry in entries:
-                                paper_obj = await self._build_paper_from_entry(entry, session)
-                                if paper_obj and (paper_obj.abstract or paper_obj.full_text):
-                                    results.append(paper_obj)
-
-                            logger.info(f"Arxiv: Final result count => {len(results)}")
-                            return results
+                        # arXiv allows 1 request / 3 seconds; the shared arxiv.org bucket enforces it
+                        # (cached feeds skip the wait since they never reach arXiv)
+                        status, data = await cached_fetch(
+                            session,
+                            "GET",
+                            arxiv_url,
+                            is_valid=lambda text: "<feed" in text,
+                            before_request=lambda: acquire_host(arxiv_url)
+                        )
+                        if status != 200:
+                            logger.error(f"Arxiv: API request failed ({status}): {data[:500]}")
+                            # if 5xx or similar, we might want to retry
+                            if 500 <= status < 600 and attempt < max_attempts - 1:
+                                continue
+                            return []
+
+                        entries = self._parse_atom_feed(data)
+                        logger.info(f"Arxiv: Retrieved {len(entries)} entries from the feed")
+
+                        results = []
+                        for entry in entries:
+                            paper_obj = self._build_paper_from_entry(entry)
+                            if paper_obj and (paper_obj.abstract or paper_obj.pdf_link):
+                                results.append(paper_obj)
+
+                        logger.info(f"Arxiv: Final result count => {len(results)}")
+                        return results
 
                     except Exception as ex:
                         logger.error(f"Arxiv: Unexpected error in search => {str(ex)}", exc_info=True)
@@ -146,9 +155,9 @@ class ArxivSearch(BaseSearch):
             })
         return entries
 
-    async def _build_paper_from_entry(self, entry: dict, session: aiohttp.ClientSession) -> Optional[Paper]:
+    def _build_paper_from_entry(self, entry: dict) -> Optional[Paper]:
         """
-        Download PDF (if available), extract text, and build a Paper object.
+        Build a metadata-only Paper object from a parsed feed entry.
         """
         title = entry.get('title') or ""
         pdf_url = entry.get('pdf_url') or ""
@@ -157,10 +166,6 @@ class ArxivSearch(BaseSearch):
         doi = entry.get('doi', "")
         published_year = self._extract_year(entry.get('published', ""))
 
-        full_text = ""
-        if pdf_url:
-            pdf_text = await self._download_and_extract_pdf(pdf_url, session)
-            full_text = pdf_text.strip()
 
         paper_obj = Paper(
             doi=doi,
@@ -169,7 +174,6 @@ class ArxivSearch(BaseSearch):
             year=published_year,
             abstract=summary,
             source="arXiv",
-            full_text=full_text,
             pdf_link=pdf_url,
             metadata={
                 "arxiv_id": entry.get('id', ""),
@@ -179,6 +183,24 @@ class ArxivSearch(BaseSearch):
         )
         return paper_obj
 
+    async def fetch_full_text(self, paper: Paper, scraper: Any) -> Optional[str]:
+        """
+        Download the paper's arXiv PDF (reusing a stored copy if available) and
+        return its text. Falls back to the default scraping for entries without a PDF.
+        """
+        if not paper.pdf_link:
+            return await super().fetch_full_text(paper, scraper)
+
+        async def download() -> str:
+            async with self._session_scope() as session:
+                return await self._download_and_extract_pdf(paper.pdf_link, session)
+
+        pdf_text = await get_fulltext_store().get_or_fetch(
+            normalize_fulltext_key(doi=paper.doi, url=paper.pdf_link),
+            download
+        )
+        return (pdf_text or "").strip()
+
     def _extract_year(self, date_str: str) -> int:
         """
         Parse out a year from a date like '2023-02-13T12:34:56Z' or '2020-11-02'.
@@ -201,27 +223,17 @@ class ArxivSearch(BaseSearch):
         """
         max_attempts = GlobalSearchConfig.max_retries
         for attempt in range(max_attempts):
+            pdf_bytes = None
             try:
-                # Wait for concurrency + forcibly wait 3s per request as well
+                # PDF downloads draw from the same arxiv.org bucket as API calls. The slot
+                # is only held for the download; extraction and backoff happen outside it.
                 async with self.semaphore:
-                    await asyncio.sleep(GlobalSearchConfig.arxiv_request_interval)
+                    await acquire_host(pdf_url)
 
                     async with session.get(pdf_url) as response:
-                        if response.status == 200:
+                        status = response.status
+                        if status == 200:
                             pdf_bytes = await response.read()
-                            if not pdf_bytes:
-                                logger.warning(f"Arxiv: PDF at {pdf_url} is empty.")
-                                return ""
-                            return self._extract_text_from_pdf_bytes(pdf_bytes)
-                        else:
-                            logger.warning(f"Arxiv: Unable to fetch PDF (status={response.status}) => {pdf_url}")
-                            if 500 <= response.status < 600 and attempt < max_attempts - 1:
-                                # retry
-                                backoff_time = calculate_backoff(attempt)
-                                logger.warning(f"Arxiv PDF: 5xx error, backoff={backoff_time:.1f}s attempt={attempt}")
-                                await asyncio.sleep(backoff_time)
-                                continue
-                            return ""
             except Exception as ex:
                 logger.error(f"Arxiv: Error downloading PDF => {str(ex)}")
                 if attempt < max_attempts - 1:
@@ -230,18 +242,28 @@ class ArxivSearch(BaseSearch):
                     await asyncio.sleep(backoff_time)
                     continue
                 return ""
+
+            if status == 200:
+                if not pdf_bytes:
+                    logger.warning(f"Arxiv: PDF at {pdf_url} is empty.")
+                    return ""
+                return await self._extract_text_from_pdf_bytes(pdf_bytes)
+
+            logger.warning(f"Arxiv: Unable to fetch PDF (status={status}) => {pdf_url}")
+            if 500 <= status < 600 and attempt < max_attempts - 1:
+                # retry
+                backoff_time = calculate_backoff(attempt)
+                logger.warning(f"Arxiv PDF: 5xx error, backoff={backoff_time:.1f}s attempt={attempt}")
+                await asyncio.sleep(backoff_time)
+                continue
+            return ""
         return ""
 
-    def _extract_text_from_pdf_bytes(self, pdf_bytes: bytes) -> str:
+    async def _extract_text_from_pdf_bytes(self, pdf_bytes: bytes) -> str:
         """
-        Extract text from PDF bytes using PyMuPDF.
+        Extract text from PDF bytes in the shared PDF worker pool.
         """
-        try:
-            document = fitz.open("pdf", pdf_bytes)
-            text = ""
-            for page in document:
-                text += page.get_text()
-            return text.strip()
-        except Exception as ex:
-            logger.error(f"Arxiv: Error parsing PDF in memory => {str(ex)}")
-            return ""
+        text = await _pdf_extractor().extract_text(pdf_bytes)
+        if not text:
+            logger.error(f"Arxiv: Could not extract text from PDF ({len(pdf_bytes)} bytes)")
+        return text
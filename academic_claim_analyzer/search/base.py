@@ -1,10 +1,45 @@
 # src/academic_claim_analyzer/search/base.py
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+import aiohttp
+
 from ..models import Paper
+from ..fulltext_store import get_fulltext_store
+from .http_client import create_http_session
+from .rate_limiter import shared_semaphore
+from .search_config import GlobalSearchConfig
 
 class BaseSearch(ABC):
+    # GlobalSearchConfig attribute holding this module's concurrency limit
+    concurrency_setting: Optional[str] = None
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Args:
+            session: Shared aiohttp session to issue requests on. If omitted, each
+                search opens (and closes) its own pooled session.
+        """
+        self.session = session
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit shared by every instance of this module in the process."""
+        name = self.concurrency_setting or type(self).__name__
+        return shared_semaphore(name, getattr(GlobalSearchConfig, name, 1))
+
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the shared session, or a temporary one if none was provided."""
+        if self.session is not None and not self.session.closed:
+            yield self.session
+            return
+        async with create_http_session() as session:
+            yield session
+
     @abstractmethod
     async def search(self, query: str, limit: int) -> List[Paper]:
         """
@@ -17,4 +52,37 @@ class BaseSearch(ABC):
         Returns:
             List[Paper]: A list of search results.
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def search_stream(self, query: str, limit: int) -> AsyncIterator[List[Paper]]:
+        """
+        Yield search results in batches as soon as they are parsed, so downstream
+        stages can start before the whole search has finished.
+
+        The default yields everything search() returns as one batch; modules that
+        fetch several result pages override this to yield page by page.
+
+        Args:
+            query (str): The search query.
+            limit (int): The maximum number of results to return in total.
+        """
+        results = await self.search(query, limit)
+        if results:
+            yield results
+
+    async def fetch_full_text(self, paper: Paper, scraper: Any) -> Optional[str]:
+        """
+        Retrieve full text for a paper this module returned. Called by the hydration
+        stage after cross-source deduplication, never during search().
+
+        The default scrapes the paper's DOI landing page (or PDF link) through the
+        shared full-text store; modules with a better source override this.
+
+        Args:
+            paper: A metadata-only Paper produced by this module's search()
+            scraper: The UnifiedWebScraper shared by the hydration stage
+
+        Returns:
+            The full text, or None/"" if it could not be retrieved
+        """
+        return await get_fulltext_store().fetch_paper_text(paper, scraper)
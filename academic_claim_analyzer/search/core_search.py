@@ -8,26 +8,28 @@ from datetime import datetime
 from dotenv import load_dotenv
 from .base import BaseSearch
 from ..models import Paper
-from ..paper_scraper import UnifiedWebScraper
 import logging
 import json
 import asyncio
 import time
 
 from ..search.search_config import GlobalSearchConfig, calculate_backoff
+from .response_cache import cached_fetch, is_json
+from .rate_limiter import acquire_host
 
 logger = logging.getLogger(__name__)
 
 load_dotenv(override=True)
 
 class CORESearch(BaseSearch):
-    def __init__(self):
+    concurrency_setting = "core_concurrency"
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.api_key = os.getenv("CORE_API_KEY")
         if not self.api_key:
             raise ValueError("CORE_API_KEY not found in environment variables")
         self.base_url = "https://api.core.ac.uk/v3"
-        # concurrency from global config
-        self.semaphore = asyncio.Semaphore(GlobalSearchConfig.core_concurrency)
 
     async def search(self, query: str, limit: int) -> List[Paper]:
         """Execute search against CORE API with exponential backoff on 500 or JSON parse failures."""
@@ -48,52 +50,55 @@ class CORESearch(BaseSearch):
 
         max_attempts = GlobalSearchConfig.max_retries
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             for attempt in range(max_attempts):
                 async with self.semaphore:
                     try:
-                        async with session.post(
+                        status, resp_text = await cached_fetch(
+                            session,
+                            "POST",
                             f"{self.base_url}/search/works",
+                            json_body=params,
                             headers=headers,
-                            json=params
-                        ) as response:
-                            resp_text = await response.text()
-                            logger.debug(f"CORE API raw response (attempt {attempt+1}): {resp_text[:500]}")
-
-                            if response.status == 200:
-                                try:
-                                    data = json.loads(resp_text)
-                                except json.JSONDecodeError as e:
-                                    logger.error(f"Failed to parse CORE API response: {str(e)}")
-                                    if attempt < max_attempts - 1:
-                                        backoff = calculate_backoff(attempt)
-                                        logger.warning(f"CORE: JSON parse error. backoff={backoff:.1f}s attempt={attempt}")
-                                        await asyncio.sleep(backoff)
-                                        continue
-                                    return []
-
-                                total_results = data.get("totalHits", 0)
-                                logger.info(f"CORE: Found {total_results} total matches")
-
-                                if not total_results:
-                                    logger.info("CORE: No results found for query")
-                                    return []
-
-                                results = await self._parse_results(data, session, limit)
-                                logger.info(f"CORE: Successfully retrieved {len(results)} valid papers")
-                                return results
-
-                            else:
-                                logger.error(f"CORE: API error {response.status}")
-                                logger.error(f"CORE: Response: {resp_text[:500]}")
-                                # Retry if 5xx
-                                if 500 <= response.status < 600 and attempt < max_attempts - 1:
+                            is_valid=is_json,
+                            before_request=lambda: acquire_host(self.base_url)
+                        )
+                        logger.debug(f"CORE API raw response (attempt {attempt+1}): {resp_text[:500]}")
+
+                        if status == 200:
+                            try:
+                                data = json.loads(resp_text)
+                            except json.JSONDecodeError as e:
+                                logger.error(f"Failed to parse CORE API response: {str(e)}")
+                                if attempt < max_attempts - 1:
                                     backoff = calculate_backoff(attempt)
-                                    logger.warning(f"CORE: 5xx error. backoff={backoff:.1f}s attempt={attempt}")
+                                    logger.warning(f"CORE: JSON parse error. backoff={backoff:.1f}s attempt={attempt}")
                                     await asyncio.sleep(backoff)
                                     continue
-                                else:
-                                    return []
+                                return []
+
+                            total_results = data.get("totalHits", 0)
+                            logger.info(f"CORE: Found {total_results} total matches")
+
+                            if not total_results:
+                                logger.info("CORE: No results found for query")
+                                return []
+
+                            results = self._parse_results(data, limit)
+                            logger.info(f"CORE: Successfully retrieved {len(results)} valid papers")
+                            return results
+
+                        else:
+                            logger.error(f"CORE: API error {status}")
+                            logger.error(f"CORE: Response: {resp_text[:500]}")
+                            # Retry if 5xx
+                            if 500 <= status < 600 and attempt < max_attempts - 1:
+                                backoff = calculate_backoff(attempt)
+                                logger.warning(f"CORE: 5xx error. backoff={backoff:.1f}s attempt={attempt}")
+                                await asyncio.sleep(backoff)
+                                continue
+                            else:
+                                return []
                     except Exception as e:
                         logger.error(f"CORE: Unexpected error - {str(e)}")
                         if attempt < max_attempts - 1:
@@ -150,12 +155,12 @@ class CORESearch(BaseSearch):
         except (ValueError, IndexError, TypeError):
             return -1
 
-    async def _parse_results(self, data: Dict[str, Any], session: aiohttp.ClientSession, limit: int) -> List[Paper]:
+    def _parse_results(self, data: Dict[str, Any], limit: int) -> List[Paper]:
+        """Build metadata-only Paper records; full text is hydrated after cross-source dedup."""
         results = []
         valid_count = 0
         invalid_count = 0
-        scraper = UnifiedWebScraper(session)
-        
+
         try:
             entries = data.get('results', [])
             logger.info(f"CORE: Processing {len(entries)} results")
@@ -200,16 +205,8 @@ class CORESearch(BaseSearch):
                         }
                     )
 
-                    try:
-                        if paper.doi:
-                            paper.full_text = await scraper.scrape(f"https://doi.org/{paper.doi}")
-                        elif paper.pdf_link:
-                            paper.full_text = await scraper.scrape(paper.pdf_link)
-                    except Exception as e:
-                        logger.debug(f"Failed to get full text for {paper.title}: {str(e)}")
-                        paper.full_text = None
-
-                    if paper.abstract or paper.full_text:
+                    # Keep papers that have content now or can be hydrated later
+                    if paper.abstract or paper.doi or paper.pdf_link:
                         results.append(paper)
                         valid_count += 1
                         if valid_count >= limit:
@@ -229,5 +226,3 @@ class CORESearch(BaseSearch):
         except Exception as e:
             logger.error(f"CORE: Results parsing failed - {str(e)}")
             return []
-        finally:
-            await scraper.close()
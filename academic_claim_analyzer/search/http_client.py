@@ -0,0 +1,39 @@
+# academic_claim_analyzer/search/http_client.py
+
+import aiohttp
+from typing import Optional
+
+from .search_config import GlobalSearchConfig
+
+def create_http_session(
+    timeout: Optional[aiohttp.ClientTimeout] = None,
+    **session_kwargs
+) -> aiohttp.ClientSession:
+    """
+    Create a pooled aiohttp session configured from GlobalSearchConfig.
+
+    The connector keeps connections alive per host and caches DNS lookups, so
+    reusing one session across all search modules and the scraper avoids paying
+    TCP+TLS setup on every request. Must be called from within a running event loop;
+    the caller owns the session and is responsible for closing it.
+
+    Args:
+        timeout: Optional override for the default client timeout
+        **session_kwargs: Extra keyword arguments passed to aiohttp.ClientSession
+
+    Returns:
+        A new aiohttp.ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=GlobalSearchConfig.http_max_connections,
+        limit_per_host=GlobalSearchConfig.http_max_connections_per_host,
+        keepalive_timeout=GlobalSearchConfig.http_keepalive_timeout,
+        ttl_dns_cache=GlobalSearchConfig.http_dns_cache_ttl,
+    )
+    if timeout is None:
+        timeout = aiohttp.ClientTimeout(
+            total=GlobalSearchConfig.http_total_timeout,
+            connect=GlobalSearchConfig.http_connect_timeout,
+            sock_read=GlobalSearchConfig.http_read_timeout,
+        )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, **session_kwargs)
@@ -6,23 +6,25 @@ import os
 import asyncio
 import urllib.parse
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from .base import BaseSearch
 from ..models import Paper
-from ..paper_scraper import UnifiedWebScraper
 import logging
 import json
 
 from ..search.search_config import GlobalSearchConfig, calculate_backoff
+from .response_cache import cached_fetch, is_json
+from .rate_limiter import acquire_host
 
 logger = logging.getLogger(__name__)
 
 class OpenAlexSearch(BaseSearch):
-    def __init__(self, email: str):
+    concurrency_setting = "openalex_concurrency"
+
+    def __init__(self, email: str, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.base_url = "https://api.openalex.org"
         self.email = email
-        # concurrency from global config
-        self.semaphore = asyncio.Semaphore(GlobalSearchConfig.openalex_concurrency)
 
     def _validate_url(self, url: str) -> bool:
         parsed = urllib.parse.urlparse(url)
@@ -44,7 +46,7 @@ class OpenAlexSearch(BaseSearch):
         logger.debug(f"OpenAlex URL: {url}")
 
         max_attempts = GlobalSearchConfig.max_retries
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             for attempt in range(max_attempts):
                 async with self.semaphore:
                     try:
@@ -53,42 +55,47 @@ class OpenAlexSearch(BaseSearch):
                             logger.warning(f"OpenAlex: Retrying fetch, backoff={backoff_time:.1f}s attempt={attempt}")
                             await asyncio.sleep(backoff_time)
 
-                        async with session.get(url) as response:
-                            response_text = await response.text()
-
-                            if response.status != 200:
-                                logger.error(f"OpenAlex error {response.status}: {response_text[:500]}")
-                                if 500 <= response.status < 600 and attempt < max_attempts - 1:
-                                    continue
-                                return []
-
-                            try:
-                                data = json.loads(response_text)
-                            except json.JSONDecodeError as e:
-                                logger.error(f"OpenAlex JSON parse error: {str(e)}")
-                                if attempt < max_attempts - 1:
-                                    continue
-                                return []
-
-                            total_results = data.get("meta", {}).get("count", 0)
-                            if total_results == 0:
-                                logger.info("OpenAlex: No results found")
-                                logger.debug(f"Empty response for URL: {url}")
-                                return []
-
-                            results = data.get("results", [])
-                            logger.info(f"OpenAlex: Found {total_results} matches, processing top {limit} results")
-
-                            sorted_results = sorted(
-                                results,
-                                key=lambda x: x.get("relevance_score", 0) or 0,
-                                reverse=True
-                            )
-                            top_results = sorted_results[:limit]
-
-                            papers = await self._parse_results(top_results, session)
-                            logger.info(f"OpenAlex: Successfully processed {len(papers)} papers")
-                            return papers
+                        status, response_text = await cached_fetch(
+                            session,
+                            "GET",
+                            url,
+                            is_valid=is_json,
+                            before_request=lambda: acquire_host(url)
+                        )
+
+                        if status != 200:
+                            logger.error(f"OpenAlex error {status}: {response_text[:500]}")
+                            if 500 <= status < 600 and attempt < max_attempts - 1:
+                                continue
+                            return []
+
+                        try:
+                            data = json.loads(response_text)
+                        except json.JSONDecodeError as e:
+                            logger.error(f"OpenAlex JSON parse error: {str(e)}")
+                            if attempt < max_attempts - 1:
+                                continue
+                            return []
+
+                        total_results = data.get("meta", {}).get("count", 0)
+                        if total_results == 0:
+                            logger.info("OpenAlex: No results found")
+                            logger.debug(f"Empty response for URL: {url}")
+                            return []
+
+                        results = data.get("results", [])
+                        logger.info(f"OpenAlex: Found {total_results} matches, processing top {limit} results")
+
+                        sorted_results = sorted(
+                            results,
+                            key=lambda x: x.get("relevance_score", 0) or 0,
+                            reverse=True
+                        )
+                        top_results = sorted_results[:limit]
+
+                        papers = self._parse_results(top_results)
+                        logger.info(f"OpenAlex: Successfully processed {len(papers)} papers")
+                        return papers
 
                     except Exception as e:
                         logger.error(f"OpenAlex search failed: {str(e)}")
@@ -99,10 +106,9 @@ class OpenAlexSearch(BaseSearch):
                         return []
             return []
 
-    async def _parse_results(self, results: List[dict], session: aiohttp.ClientSession) -> List[Paper]:
+    def _parse_results(self, results: List[dict]) -> List[Paper]:
+        """Build metadata-only Paper records; full text is hydrated after cross-source dedup."""
         papers = []
-        scraper = UnifiedWebScraper(session)
-        
         try:
             for result in results:
                 try:
@@ -164,15 +170,6 @@ class OpenAlexSearch(BaseSearch):
                         }
                     )
 
-                    try:
-                        if paper.doi:
-                            paper.full_text = await scraper.scrape(f"https://doi.org/{paper.doi}")
-                        elif paper.pdf_link:
-                            paper.full_text = await scraper.scrape(paper.pdf_link)
-                    except Exception as e:
-                        logger.debug(f"Failed to get full text for {paper.title}: {str(e)}")
-                        paper.full_text = None
-
                     papers.append(paper)
                     logger.debug(f"Processed paper: {paper.title}")
 
@@ -185,6 +182,3 @@ class OpenAlexSearch(BaseSearch):
         except Exception as e:
             logger.error(f"OpenAlex results parsing failed: {str(e)}")
             return []
-            
-        finally:
-            await scraper.close()
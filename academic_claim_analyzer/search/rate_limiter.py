@@ -0,0 +1,177 @@
+# academic_claim_analyzer/search/rate_limiter.py
+
+import os
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from aiolimiter import AsyncLimiter
+
+from .search_config import GlobalSearchConfig
+
+logger = logging.getLogger(__name__)
+
+class HostRateLimiter:
+    """
+    Process-wide token buckets keyed by host, plus named concurrency limits.
+
+    A host uses the most specific entry of GlobalSearchConfig.host_rate_limits that it
+    equals or is a subdomain of, so e.g. export.arxiv.org and arxiv.org share the one
+    "arxiv.org" bucket. Hosts without an entry get default_host_rate_limit each.
+    Everything is shared by all search modules and scrapers in the process, so the
+    allowed rate holds across every concurrent request of a batch.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._limiters: Dict[str, AsyncLimiter] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _check_loop(self) -> None:
+        # Limiters and semaphores hold futures bound to one loop; start fresh on a new one.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._limiters = {}
+            self._semaphores = {}
+
+    @staticmethod
+    def bucket_for(host: str) -> Tuple[str, Tuple[float, float]]:
+        """Return the bucket name and (max_rate, period_seconds) applying to `host`."""
+        host = host.lower()
+        best = None
+        for domain in GlobalSearchConfig.host_rate_limits:
+            if host == domain or host.endswith("." + domain):
+                if best is None or len(domain) > len(best):
+                    best = domain
+        if best is None:
+            return host, GlobalSearchConfig.default_host_rate_limit
+        return best, GlobalSearchConfig.host_rate_limits[best]
+
+    def limiter_for(self, host: str) -> AsyncLimiter:
+        self._check_loop()
+        bucket, (max_rate, period) = self.bucket_for(host)
+        limiter = self._limiters.get(bucket)
+        if limiter is None:
+            limiter = AsyncLimiter(max_rate, period)
+            self._limiters[bucket] = limiter
+        return limiter
+
+    async def acquire(self, url: str) -> None:
+        """Wait for a token for the host of `url` (a bare host name is accepted too)."""
+        host = urlparse(url).hostname or url
+        await self.limiter_for(host).acquire()
+
+    def semaphore(self, name: str, limit: int) -> asyncio.Semaphore:
+        """A concurrency limit shared by every user of `name` on the running loop."""
+        self._check_loop()
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[name] = semaphore
+        return semaphore
+
+    def discard_semaphore(self, name: str) -> None:
+        """Forget the semaphore for `name`, so the next user creates one with its new limit."""
+        self._semaphores.pop(name, None)
+
+class SharedHostRateLimiter(HostRateLimiter):
+    """
+    HostRateLimiter whose token buckets live in a SQLite file, so every process using
+    the same file (the workers of a multi-process batch) shares one rate per bucket.
+
+    Each acquire takes a token in a short write transaction, run in a thread so the
+    event loop is not blocked; when the bucket is empty it sleeps until the next token
+    is due and tries again. Named semaphores stay per process.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared between threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _take(self, bucket: str, max_rate: float, period: float) -> float:
+        """Take one token from `bucket`; return 0, or the seconds until one is due (nothing taken)."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (bucket,)).fetchone()
+            now = time.time()
+            tokens = max_rate if row is None else min(max_rate, row[0] + (now - row[1]) * max_rate / period)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) * period / max_rate
+            conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (bucket, tokens, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    async def acquire(self, url: str) -> None:
+        host = urlparse(url).hostname or url
+        bucket, (max_rate, period) = self.bucket_for(host)
+        while True:
+            wait = await asyncio.to_thread(self._take, bucket, max_rate, period)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+_rate_limiter = HostRateLimiter()
+
+def get_rate_limiter() -> HostRateLimiter:
+    return _rate_limiter
+
+def configure_shared_rate_limits(path: str) -> HostRateLimiter:
+    """Share the per-host rate limits with other processes through the SQLite file at `path`."""
+    global _rate_limiter
+    _rate_limiter = SharedHostRateLimiter(path)
+    logger.info(f"Host rate limits shared through {path}")
+    return _rate_limiter
+
+async def acquire_host(url: str) -> None:
+    """Wait until a request to the host of `url` is allowed by its rate limit."""
+    await _rate_limiter.acquire(url)
+
+def shared_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    """Process-wide concurrency limit for `name` (e.g. one per search platform)."""
+    return _rate_limiter.semaphore(name, limit)
+
+def stage_semaphore(stage: str) -> asyncio.Semaphore:
+    """
+    Process-wide concurrency cap for a pipeline stage ("search", "scrape", "llm"),
+    sized by GlobalSearchConfig.stage_concurrency.
+    """
+    return _rate_limiter.semaphore(f"stage:{stage}", GlobalSearchConfig.stage_concurrency[stage])
+
+def configure_stage_limits(**limits: Optional[int]) -> None:
+    """
+    Set the per-stage caps, e.g. configure_stage_limits(search=8, llm=4). None leaves
+    a stage unchanged. Call it before the stages start: a semaphore already handed
+    out keeps its old size.
+    """
+    for stage, limit in limits.items():
+        if stage not in GlobalSearchConfig.stage_concurrency:
+            raise ValueError(f"Unknown pipeline stage: {stage}")
+        if limit is not None:
+            GlobalSearchConfig.stage_concurrency[stage] = int(limit)
+            _rate_limiter.discard_semaphore(f"stage:{stage}")
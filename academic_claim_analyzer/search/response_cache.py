@@ -0,0 +1,151 @@
+# academic_claim_analyzer/search/response_cache.py
+
+import json
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+from ..cache_store import SQLiteBlobStore
+from .search_config import GlobalSearchConfig
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """
+    Persistent cache of successful search API responses.
+
+    Entries are content-addressed by method, URL, query params and request body.
+    Request headers are deliberately left out of the key so API keys never end up
+    in it and rotating a key does not invalidate the cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        max_size_bytes: Optional[int] = None
+    ):
+        self.store = SQLiteBlobStore(
+            path,
+            table="http_responses",
+            max_size_bytes=max_size_bytes or GlobalSearchConfig.http_cache_max_size_mb * 1024 * 1024,
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else GlobalSearchConfig.http_cache_ttl_seconds
+        )
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> str:
+        canonical = json.dumps(
+            [method.upper(), url, sorted((params or {}).items()), body],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.store.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, text: str) -> None:
+        self.store.set(key, text.encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+    def close(self) -> None:
+        self.store.close()
+
+# Process-wide cache; None means caching is disabled (the default).
+_response_cache: Optional[ResponseCache] = None
+
+def configure_response_cache(
+    path: str,
+    ttl_seconds: Optional[float] = None,
+    max_size_bytes: Optional[int] = None
+) -> ResponseCache:
+    """Enable the search API response cache, backed by the SQLite file at `path`."""
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = ResponseCache(path, ttl_seconds=ttl_seconds, max_size_bytes=max_size_bytes)
+    logger.info(f"HTTP response cache enabled at {path}")
+    return _response_cache
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _response_cache
+
+def close_response_cache() -> Optional[Dict[str, Any]]:
+    """Disable the cache and return its final hit/miss statistics (None if it was not enabled)."""
+    global _response_cache
+    if _response_cache is None:
+        return None
+    stats = _response_cache.stats()
+    _response_cache.close()
+    _response_cache = None
+    return stats
+
+def is_json(text: str) -> bool:
+    try:
+        json.loads(text)
+        return True
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+async def cached_fetch(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json_body: Any = None,
+    is_valid: Optional[Callable[[str], bool]] = None,
+    before_request: Optional[Callable[[], Awaitable[Any]]] = None,
+    **request_kwargs
+) -> Tuple[int, str]:
+    """
+    Issue a request through the response cache.
+
+    Only 200 responses whose body passes `is_valid` (if given) are stored, so
+    transient errors and truncated payloads are retried against the live API.
+    Rate-limit waits belong in `before_request`, which only runs on a cache miss.
+
+    Args:
+        session: The aiohttp session to use on a cache miss
+        method: HTTP method, e.g. "GET" or "POST"
+        url: Request URL
+        params: Query-string parameters
+        json_body: JSON request body
+        is_valid: Optional predicate deciding whether a 200 body is worth caching
+        before_request: Optional coroutine function awaited before hitting the network
+        **request_kwargs: Extra arguments for the request (headers, timeout, ...)
+
+    Returns:
+        Tuple of (status code, response text)
+    """
+    cache = _response_cache
+    key = None
+    if cache is not None:
+        key = cache.make_key(method, url, params, json_body)
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            logger.debug(f"HTTP cache hit: {method.upper()} {url}")
+            return 200, cached
+
+    if params is not None:
+        request_kwargs["params"] = params
+    if json_body is not None:
+        request_kwargs["json"] = json_body
+
+    if before_request is not None:
+        await before_request()
+
+    request = getattr(session, method.lower())
+    async with request(url, **request_kwargs) as response:
+        status = response.status
+        text = await response.text()
+
+    if cache is not None and status == 200 and (is_valid is None or is_valid(text)):
+        await asyncio.to_thread(cache.set, key, text)
+    return status, text
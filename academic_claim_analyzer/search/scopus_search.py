@@ -4,32 +4,31 @@
 import aiohttp
 import asyncio
 import os
-from typing import List
-from collections import deque
-import time
+from typing import List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 from .base import BaseSearch
 from ..models import Paper
-from ..paper_scraper import UnifiedWebScraper
 import logging
 import json
 
 from ..search.search_config import GlobalSearchConfig, calculate_backoff
+from .response_cache import cached_fetch, is_json
+from .rate_limiter import acquire_host
 
 logger = logging.getLogger(__name__)
 
 load_dotenv(override=True)
 
 class ScopusSearch(BaseSearch):
-    def __init__(self):
+    concurrency_setting = "scopus_concurrency"
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.api_key = os.getenv("SCOPUS_API_KEY")
         if not self.api_key:
             raise ValueError("SCOPUS_API_KEY not found in environment variables")
         self.base_url = "http://api.elsevier.com/content/search/scopus"
-        # concurrency from global config
-        self.semaphore = asyncio.Semaphore(GlobalSearchConfig.scopus_concurrency)
-        self.request_times = deque(maxlen=6)
 
     def _validate_query(self, query: str) -> bool:
         invalid_patterns = [
@@ -60,7 +59,7 @@ class ScopusSearch(BaseSearch):
         }
 
         max_attempts = GlobalSearchConfig.max_retries
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             for attempt in range(max_attempts):
                 async with self.semaphore:
                     try:
@@ -69,28 +68,33 @@ class ScopusSearch(BaseSearch):
                             logger.warning(f"Scopus: Retrying search, backoff={backoff_time:.1f}s attempt={attempt}")
                             await asyncio.sleep(backoff_time)
 
-                        await self._wait_for_rate_limit()
-                        
-                        async with session.get(self.base_url, headers=headers, params=params) as response:
-                            response_text = await response.text()
-                            
-                            if response.status == 200:
-                                data = json.loads(response_text)
-                                total_results = int(data.get("search-results", {}).get("opensearch:totalResults", 0))
-                                logger.info(f"Scopus: Found {total_results} total matches")
-
-                                if not total_results:
-                                    logger.info("Scopus: No results found for query")
-                                    return []
-
-                                return await self._parse_results(data, session, limit)
-                            else:
-                                logger.error(f"Scopus: API error {response.status}")
-                                logger.error(f"Scopus: Response: {response_text[:500]}")
-                                # Retry if 5xx
-                                if 500 <= response.status < 600 and attempt < max_attempts - 1:
-                                    continue
+                        status, response_text = await cached_fetch(
+                            session,
+                            "GET",
+                            self.base_url,
+                            params=params,
+                            headers=headers,
+                            is_valid=is_json,
+                            before_request=lambda: acquire_host(self.base_url)
+                        )
+
+                        if status == 200:
+                            data = json.loads(response_text)
+                            total_results = int(data.get("search-results", {}).get("opensearch:totalResults", 0))
+                            logger.info(f"Scopus: Found {total_results} total matches")
+
+                            if not total_results:
+                                logger.info("Scopus: No results found for query")
                                 return []
+
+                            return self._parse_results(data, limit)
+                        else:
+                            logger.error(f"Scopus: API error {status}")
+                            logger.error(f"Scopus: Response: {response_text[:500]}")
+                            # Retry if 5xx
+                            if 500 <= status < 600 and attempt < max_attempts - 1:
+                                continue
+                            return []
                     except json.JSONDecodeError as e:
                         logger.error(f"Scopus: Invalid JSON response - {str(e)}")
                         if attempt < max_attempts - 1:
@@ -103,19 +107,10 @@ class ScopusSearch(BaseSearch):
                         return []
             return []
 
-    async def _wait_for_rate_limit(self):
-        """Handle rate limiting with improved logging; keep shape from original code."""
-        current_time = time.time()
-        if self.request_times and current_time - self.request_times[0] < 1:
-            wait_time = 1 - (current_time - self.request_times[0])
-            logger.debug(f"Scopus: Rate limit wait {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
-        self.request_times.append(current_time)
-
-    async def _parse_results(self, data: dict, session: aiohttp.ClientSession, limit: int) -> List[Paper]:
+    def _parse_results(self, data: dict, limit: int) -> List[Paper]:
+        """Build metadata-only Paper records; full text is hydrated after cross-source dedup."""
         results = []
-        scraper = UnifiedWebScraper(session)
-        
+
         try:
             entries = data.get("search-results", {}).get("entry", [])
             logger.info(f"Scopus: Processing {min(len(entries), limit)} results")
@@ -169,14 +164,8 @@ class ScopusSearch(BaseSearch):
                         }
                     )
 
-                    if result.doi:
-                        try:
-                            result.full_text = await scraper.scrape(f"https://doi.org/{result.doi}")
-                        except Exception as e:
-                            logger.debug(f"Failed to get full text for {result.title}: {str(e)}")
-                            result.full_text = None
-
-                    if result.title and (result.abstract or result.full_text):
+                    # Keep papers that have content now or can be hydrated later
+                    if result.title and (result.abstract or result.doi):
                         results.append(result)
                     else:
                         logger.debug(f"Scopus: Skipping paper with insufficient data: {result.title}")
@@ -189,7 +178,5 @@ class ScopusSearch(BaseSearch):
             
         except Exception as e:
             logger.error(f"Scopus: Results parsing failed - {str(e)}")
-        finally:
-            await scraper.close()
             
         return results
@@ -1,5 +1,6 @@
 # academic_claim_analyzer/search/search_config.py
 
+import os
 import random
 import logging
 
@@ -25,9 +26,62 @@ class GlobalSearchConfig:
 
     # Special or additional rate-limit intervals
     # e.g., Arxiv states 1 request every ~3 seconds
-    # We'll enforce this post-request as well:
     arxiv_request_interval = 3.0
 
+    # Per-host token buckets (search/rate_limiter.py): host -> (max requests, per seconds).
+    # Subdomains share their parent's bucket; every module and the scraper draw from these.
+    host_rate_limits = {
+        "api.elsevier.com": (6, 1.0),
+        "arxiv.org": (1, arxiv_request_interval),
+        "api.semanticscholar.org": (1, 1.0),
+        "api.openalex.org": (10, 1.0),
+        "api.core.ac.uk": (5, 10.0),
+    }
+    default_host_rate_limit = (10, 1.0)  # any other host (publishers, doi.org, PDF mirrors)
+
+    # Shared HTTP client (see search/http_client.py)
+    # One pooled session is created per search run and handed to every module.
+    http_max_connections = 100           # total open connections across all hosts
+    http_max_connections_per_host = 10   # keep-alive pool size per host
+    http_keepalive_timeout = 30          # seconds an idle connection is kept open
+    http_dns_cache_ttl = 300             # seconds DNS lookups are cached
+    http_total_timeout = 120             # seconds for a whole request/response
+    http_connect_timeout = 15            # seconds to establish a connection
+    http_read_timeout = 60               # seconds between reads of the body
+
+    # Web scraper (paper_scraper.py)
+    scrape_timeout_seconds = 20          # per plain HTTP fetch of a landing page or PDF
+    scrape_max_bytes = 20 * 1024 * 1024  # stop reading response bodies beyond this size
+    scrape_mode = "sequential"           # "sequential" tries strategies in turn with retries; "hedged" races them
+    scrape_hedge_delay = 2.0             # seconds before the browser path joins a still-running HTTP fetch
+    scrape_deadline = 45.0               # overall seconds allowed per URL in hedged mode
+
+    # PDF text extraction process pool (pdf_extractor.py)
+    pdf_workers = min(4, os.cpu_count() or 1)  # worker processes; 0 extracts in a thread instead
+    pdf_max_pending = 16                 # documents queued or in flight at once
+    pdf_max_pages = 80                   # pages read per document (0 for all)
+    pdf_timeout = 60                     # seconds allowed per document
+
+    # Shared headless browser pool (browser_pool.py)
+    browser_pool_size = 2                # Chromium instances per process
+    browser_pages_per_browser = 4        # pages open at once in each browser
+    browser_context_max_uses = 25        # pages served by a context before it is recycled
+    browser_blocked_resource_types = ("image", "font", "media")
+
+    # Full-text hydration (runs after cross-source deduplication)
+    hydration_concurrency = 8            # papers scraped at the same time per search run
+
+    # Process-wide caps per pipeline stage, shared by every request of a batch (rate_limiter.stage_semaphore)
+    stage_concurrency = {
+        "search": 16,                    # search API calls / result pages in flight
+        "scrape": 16,                    # papers being hydrated with full text
+        "llm": 8,                        # LLM handler calls (each may carry a batch of prompts)
+    }
+
+    # Persistent search API response cache (opt-in, see search/response_cache.py)
+    http_cache_ttl_seconds = 7 * 24 * 3600
+    http_cache_max_size_mb = 512
+
 def calculate_backoff(attempt: int) -> float:
     """
     Given a 0-based retry 'attempt' index,
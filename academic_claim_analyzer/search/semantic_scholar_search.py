@@ -1,44 +1,55 @@
 # academic_claim_analyzer/search/semantic_scholar_search.py
 
 import os
+import json
 import logging
 import asyncio
-from typing import List, Optional, Dict
+from typing import Any, AsyncIterator, List, Optional, Dict
 
 import aiohttp
-import fitz  # PyMuPDF for PDF parsing
 
 from .base import BaseSearch
 from ..models import Paper
+from ..fulltext_store import get_fulltext_store, normalize_fulltext_key
 from ..search.search_config import GlobalSearchConfig, calculate_backoff
+from .response_cache import cached_fetch, is_json
+from .rate_limiter import acquire_host
 
+def _pdf_extractor():
+    # Imported lazily: pdf_extractor imports search_config, which initializes this package
+    from ..pdf_extractor import get_pdf_extractor
+    return get_pdf_extractor()
 
 class SemanticScholarSearch(BaseSearch):
     """
     A search module integrating with the Semantic Scholar API.
     """
+    concurrency_setting = "semanticscholar_concurrency"
 
     SEMANTIC_SCHOLAR_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
 
-    def __init__(self):
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(session)
         self.api_key = os.environ.get("SEMANTIC_SCHOLAR_KEY", None)
-        # concurrency from global config
-        self.semaphore = asyncio.Semaphore(GlobalSearchConfig.semanticscholar_concurrency)
 
     async def search(self, query: str, limit: int) -> List[Paper]:
         """
         Perform a Semantic Scholar search for 'query', returning up to 'limit' results.
         We'll fetch in pages of up to 100, halting at offset=1000 or after 'limit' is reached.
-        Then we'll fetch PDFs (where available) concurrently.
+        PDFs are fetched later by fetch_full_text, once duplicates have been dropped.
         """
         all_papers: List[Paper] = []
-        offset = 0
+        async for page in self.search_stream(query, limit):
+            all_papers.extend(page)
+        return all_papers[:limit]
 
-        # Decide normal delay between successive search requests
-        delay_between_requests = 1.0 if self.api_key else 2.0
+    async def search_stream(self, query: str, limit: int) -> AsyncIterator[List[Paper]]:
+        """Yield the results of 'query' one API page at a time (see search())."""
+        fetched = 0
+        offset = 0
 
-        while len(all_papers) < limit and offset < 1000:
-            to_fetch = min(100, limit - len(all_papers))
+        while fetched < limit and offset < 1000:
+            to_fetch = min(100, limit - fetched)
             data = await self._fetch_search_page(query, offset, to_fetch)
             if not data:
                 break
@@ -47,8 +58,9 @@ class SemanticScholarSearch(BaseSearch):
             if not papers_json:
                 break
 
-            new_papers = self._json_to_papers(papers_json)
-            all_papers.extend(new_papers)
+            new_papers = self._json_to_papers(papers_json)[:limit - fetched]
+            fetched += len(new_papers)
+            yield new_papers
 
             if "next" in data:
                 offset = data["next"]
@@ -58,18 +70,6 @@ class SemanticScholarSearch(BaseSearch):
             if offset >= 1000:
                 break
 
-            await asyncio.sleep(delay_between_requests)
-
-        # fetch PDFs in parallel
-        tasks = []
-        for p in all_papers:
-            if p.pdf_link:
-                tasks.append(self._fetch_and_parse_pdf(p))
-        if tasks:
-            await asyncio.gather(*tasks)
-
-        return all_papers[:limit]
-
     async def _fetch_search_page(self, query: str, offset: int, limit: int) -> Optional[dict]:
         """
         Fetch one page of results from the Semantic Scholar search API,
@@ -88,8 +88,8 @@ class SemanticScholarSearch(BaseSearch):
         max_attempts = GlobalSearchConfig.max_retries
         backoff_seconds = 2.0
 
-        for attempt in range(max_attempts):
-            async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
+            for attempt in range(max_attempts):
                 async with self.semaphore:
                     try:
                         if attempt > 0:
@@ -98,32 +98,35 @@ class SemanticScholarSearch(BaseSearch):
                             logging.warning(f"SemanticScholar: Retry fetch page offset={offset}, backoff={backoff_time:.1f}s attempt={attempt}")
                             await asyncio.sleep(backoff_time)
 
-                        async with session.get(
+                        status, text = await cached_fetch(
+                            session,
+                            "GET",
                             self.SEMANTIC_SCHOLAR_SEARCH_URL,
                             params=params,
                             headers=headers,
-                            timeout=30
-                        ) as resp:
-                            if resp.status == 200:
-                                return await resp.json()
-                            elif resp.status == 429:
-                                if attempt < max_attempts - 1:
-                                    logging.warning(
-                                        f"429 from Semantic Scholar. attempt {attempt}/{max_attempts}."
-                                    )
-                                    continue
-                                else:
-                                    logging.warning("429 on final retry; giving up.")
-                                    return None
-                            elif resp.status in (401, 403):
-                                logging.warning(f"Unauthorized/Forbidden ({resp.status}).")
-                                return None
-                            else:
-                                text = await resp.text()
+                            timeout=aiohttp.ClientTimeout(total=30),
+                            is_valid=is_json,
+                            before_request=lambda: acquire_host(self.SEMANTIC_SCHOLAR_SEARCH_URL)
+                        )
+                        if status == 200:
+                            return json.loads(text)
+                        elif status == 429:
+                            if attempt < max_attempts - 1:
                                 logging.warning(
-                                    f"Unexpected status {resp.status} from Semantic Scholar. Body: {text}"
+                                    f"429 from Semantic Scholar. attempt {attempt}/{max_attempts}."
                                 )
+                                continue
+                            else:
+                                logging.warning("429 on final retry; giving up.")
                                 return None
+                        elif status in (401, 403):
+                            logging.warning(f"Unauthorized/Forbidden ({status}).")
+                            return None
+                        else:
+                            logging.warning(
+                                f"Unexpected status {status} from Semantic Scholar. Body: {text}"
+                            )
+                            return None
                     except Exception as ex:
                         logging.error(
                             f"Exception on attempt {attempt}/{max_attempts} for offset {offset}: {ex}"
@@ -170,32 +173,40 @@ class SemanticScholarSearch(BaseSearch):
             results.append(paper_obj)
         return results
 
-    async def _fetch_and_parse_pdf(self, paper: Paper) -> None:
+    async def fetch_full_text(self, paper: Paper, scraper: Any) -> Optional[str]:
+        """
+        Return the text of the paper's open-access PDF, reusing a stored copy if this
+        DOI / PDF URL has already been fetched. Papers without a PDF link get none.
+        """
+        if not paper.pdf_link:
+            return None
+        return await get_fulltext_store().get_or_fetch(
+            normalize_fulltext_key(doi=paper.doi, url=paper.pdf_link),
+            lambda: self._download_pdf_text(paper)
+        )
+
+    async def _download_pdf_text(self, paper: Paper) -> Optional[str]:
         """
         Download and parse the PDF for the given paper concurrently.
         Up to max_retries with exponential backoff if fails.
         """
         max_attempts = GlobalSearchConfig.max_retries
-        for attempt in range(max_attempts):
-            async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
+            for attempt in range(max_attempts):
                 try:
+                    await acquire_host(paper.pdf_link)
                     async with session.get(paper.pdf_link, timeout=60) as resp:
                         if resp.status == 200:
                             pdf_bytes = await resp.read()
-                            try:
-                                with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-                                    extracted_texts = [page.get_text() for page in doc]
-                                paper.full_text = "\n".join(extracted_texts)
-                            except Exception as parse_err:
-                                logging.warning(
-                                    f"Failed to parse PDF for '{paper.title}': {parse_err}"
-                                )
-                            return
+                            text = await _pdf_extractor().extract_text(pdf_bytes)
+                            if not text:
+                                logging.warning(f"Failed to parse PDF for '{paper.title}'")
+                            return text or None
                         else:
                             logging.warning(
                                 f"PDF download failed (status {resp.status}) for '{paper.title}'. "
                             )
-                            return
+                            return None
                 except Exception as e:
                     logging.warning(
                         f"Exception fetching PDF for '{paper.title}' from '{paper.pdf_link}': {e}"
@@ -205,4 +216,5 @@ class SemanticScholarSearch(BaseSearch):
                         logging.warning(f"SemanticScholar PDF: backoff={backoff_time:.1f}s attempt={attempt}")
                         await asyncio.sleep(backoff_time)
                         continue
-                    return
+                    return None
+        return None
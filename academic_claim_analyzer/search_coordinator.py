@@ -2,7 +2,9 @@
 
 import asyncio
 import logging
-from typing import List
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
 
 from .models import RequestAnalysis, Paper
 from .search import (
@@ -13,67 +15,94 @@ from .search import (
     SemanticScholarSearch, 
     BaseSearch
 )
+from .search.http_client import create_http_session
+from .search.search_config import GlobalSearchConfig
+from .search.rate_limiter import stage_semaphore
+from .paper_scraper import UnifiedWebScraper
+from .fulltext_store import get_fulltext_store
 
 logger = logging.getLogger(__name__)
 
-async def perform_searches(analysis: RequestAnalysis) -> None:
+ALL_PLATFORMS = ["openalex", "scopus", "core", "arxiv", "semantic_scholar"]
+
+def create_search_module(platform: str, session: Optional[aiohttp.ClientSession] = None) -> BaseSearch:
+    """
+    Instantiate the search module for a platform name.
+
+    Raises:
+        ValueError: If the platform is unknown or its API key is missing
+    """
+    if platform == "openalex":
+        return OpenAlexSearch("youremail@example.com", session=session)
+    elif platform == "scopus":
+        return ScopusSearch(session=session)
+    elif platform == "core":
+        return CORESearch(session=session)
+    elif platform == "arxiv":
+        return ArxivSearch(session=session)
+    elif platform == "semantic_scholar":
+        return SemanticScholarSearch(session=session)
+    raise ValueError(f"Unsupported search platform: {platform}")
+
+def plan_searches(analysis: RequestAnalysis, session: aiohttp.ClientSession) -> List[Tuple[BaseSearch, str, str]]:
+    """
+    List the (search module, platform, query) searches to run for the analysis's
+    formulated queries, one module instance per enabled platform.
+    """
+    chosen_platforms = analysis.parameters.get("platforms", ALL_PLATFORMS)
+    searches = []
+    for platform in ALL_PLATFORMS:
+        if platform not in chosen_platforms:
+            continue
+        platform_queries = [q for q in analysis.queries if q.source == platform]
+        if not platform_queries:
+            continue
+        try:
+            search_module = create_search_module(platform, session)
+        except ValueError as e:
+            logger.error(f"Skipping {platform}: {str(e)}")
+            continue
+        for query in platform_queries:
+            searches.append((search_module, platform, query.query))
+    return searches
+
+async def perform_searches(
+    analysis: RequestAnalysis,
+    session: Optional[aiohttp.ClientSession] = None,
+    hydrate: bool = True
+) -> None:
     """
     Perform searches across all enabled platforms and add results to the analysis object.
+
+    Searches return metadata-only papers, which are deduplicated across platforms as
+    they are added; full text is then hydrated only for the papers that survived.
+    A single pooled HTTP session is shared by every search module (and the scraper
+    they use) for the whole run, so connections are reused across platforms.
     
     Args:
         analysis: The RequestAnalysis object containing search queries and configuration
+        session: Optional shared aiohttp session; one is created for this run if omitted
+        hydrate: Whether to run the full-text hydration stage after searching
     """
-    chosen_platforms = analysis.parameters.get(
-        "platforms", 
-        ["openalex", "scopus", "core", "arxiv", "semantic_scholar"]
-    )
-    search_tasks = []
-    papers_per_query = analysis.parameters["papers_per_query"]
-
-    if "openalex" in chosen_platforms:
-        openalex_search = OpenAlexSearch("youremail@example.com")
-        openalex_queries = [q for q in analysis.queries if q.source == "openalex"]
-        for query in openalex_queries:
-            search_tasks.append(
-                _search_and_add_results(openalex_search, query.query, papers_per_query, analysis)
-            )
-
-    if "scopus" in chosen_platforms:
-        scopus_search = ScopusSearch()
-        scopus_queries = [q for q in analysis.queries if q.source == "scopus"]
-        for query in scopus_queries:
-            search_tasks.append(
-                _search_and_add_results(scopus_search, query.query, papers_per_query, analysis)
-            )
-
-    if "core" in chosen_platforms:
-        core_search = CORESearch()
-        core_queries = [q for q in analysis.queries if q.source == "core"]
-        for query in core_queries:
-            search_tasks.append(
-                _search_and_add_results(core_search, query.query, papers_per_query, analysis)
-            )
-
-    if "arxiv" in chosen_platforms:
-        arxiv_search = ArxivSearch()
-        arxiv_queries = [q for q in analysis.queries if q.source == "arxiv"]
-        for query in arxiv_queries:
-            search_tasks.append(
-                _search_and_add_results(arxiv_search, query.query, papers_per_query, analysis)
-            )
-            
-    if "semantic_scholar" in chosen_platforms:
-        semantic_scholar_search = SemanticScholarSearch()
-        semantic_scholar_queries = [q for q in analysis.queries if q.source == "semantic_scholar"]
-        for query in semantic_scholar_queries:
-            search_tasks.append(
-                _search_and_add_results(semantic_scholar_search, query.query, papers_per_query, analysis)
-            )
+    if session is None:
+        async with create_http_session() as run_session:
+            await perform_searches(analysis, run_session, hydrate)
+        return
 
+    papers_per_query = analysis.parameters["papers_per_query"]
+    search_tasks = [
+        _search_and_add_results(search_module, platform, query, papers_per_query, analysis)
+        for search_module, platform, query in plan_searches(analysis, session)
+    ]
     await asyncio.gather(*search_tasks)
 
+    if hydrate:
+        await hydrate_full_texts(analysis.search_results, session)
+        analysis.search_results = drop_papers_without_content(analysis.search_results)
+
 async def _search_and_add_results(
     search_module: BaseSearch,
+    platform: str,
     query: str,
     limit: int,
     analysis: RequestAnalysis
@@ -83,15 +112,111 @@ async def _search_and_add_results(
     
     Args:
         search_module: The search module to use
+        platform: Platform name, recorded on each paper for the hydration stage
         query: The query string
         limit: Maximum number of results to retrieve
         analysis: The RequestAnalysis object to store results in
     """
     try:
-        results = await search_module.search(query, limit)
+        async with stage_semaphore("search"):
+            results = await search_module.search(query, limit)
         if results and isinstance(results, list):
+            added = 0
             for paper in results:
                 if isinstance(paper, Paper):
-                    analysis.add_search_result(paper)
+                    paper.metadata["search_platform"] = platform
+                    if analysis.add_search_result(paper):
+                        added += 1
+            logger.info(f"{search_module.__class__.__name__}: kept {added}/{len(results)} papers after deduplication")
     except Exception as e:
-        logger.error(f"Error during search with {search_module.__class__.__name__}: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error during search with {search_module.__class__.__name__}: {str(e)}")
+
+async def hydrate_full_texts(
+    papers: List[Paper],
+    session: Optional[aiohttp.ClientSession] = None,
+    concurrency: Optional[int] = None
+) -> None:
+    """
+    Fill in full text for papers that don't have it yet, with bounded concurrency
+    (see FullTextHydrator).
+
+    Args:
+        papers: Papers to hydrate in place
+        session: Optional shared aiohttp session; one is created if omitted
+        concurrency: Max papers hydrated at once (defaults to GlobalSearchConfig)
+    """
+    pending = [p for p in papers if not p.full_text]
+    if not pending:
+        return
+    if session is None:
+        async with create_http_session() as run_session:
+            await hydrate_full_texts(papers, run_session, concurrency)
+        return
+
+    semaphore = asyncio.Semaphore(concurrency or GlobalSearchConfig.hydration_concurrency)
+    hydrator = FullTextHydrator(session)
+
+    async def hydrate(paper: Paper) -> None:
+        async with semaphore:
+            await hydrator.hydrate(paper)
+
+    logger.info(f"Hydrating full text for {len(pending)} papers")
+    try:
+        await asyncio.gather(*(hydrate(p) for p in pending))
+    finally:
+        await hydrator.close()
+    hydrated = sum(1 for p in pending if p.full_text)
+    logger.info(f"Full text retrieved for {hydrated}/{len(pending)} papers")
+
+def has_content(paper: Paper) -> bool:
+    """Whether a paper has an abstract or full text for the LLM stages to work on."""
+    return bool(paper.abstract or paper.full_text)
+
+def drop_papers_without_content(papers: List[Paper]) -> List[Paper]:
+    """
+    Papers are kept after search if they can be hydrated later (e.g. they have a DOI);
+    once hydration has run, those whose scrape failed and that have no abstract are
+    dropped here.
+    """
+    kept = [p for p in papers if has_content(p)]
+    if len(kept) < len(papers):
+        logger.info(f"Dropped {len(papers) - len(kept)} papers with neither abstract nor full text")
+    return kept
+
+class FullTextHydrator:
+    """
+    Fills in a paper's full text through the module that found it (e.g. arXiv
+    downloads its PDF), falling back to plain DOI/PDF scraping. Lookups go through
+    the shared full-text store, so papers already scraped in this run (or a cached
+    one) cost nothing.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
+        self.scraper = UnifiedWebScraper(session)
+        self._modules: Dict[Optional[str], Optional[BaseSearch]] = {}
+
+    def module_for(self, paper: Paper) -> Optional[BaseSearch]:
+        platform = paper.metadata.get("search_platform")
+        if platform not in self._modules:
+            try:
+                self._modules[platform] = create_search_module(platform, self.session) if platform else None
+            except ValueError:
+                self._modules[platform] = None
+        return self._modules[platform]
+
+    async def hydrate(self, paper: Paper) -> None:
+        try:
+            module = self.module_for(paper)
+            async with stage_semaphore("scrape"):
+                if module is not None:
+                    text = await module.fetch_full_text(paper, self.scraper)
+                else:
+                    text = await get_fulltext_store().fetch_paper_text(paper, self.scraper)
+            paper.full_text = text or None
+        except Exception as e:
+            logger.debug(f"Failed to get full text for {paper.title}: {str(e)}")
+            paper.full_text = None
+
+    async def close(self) -> None:
+        await self.scraper.close()
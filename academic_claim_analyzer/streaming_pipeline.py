@@ -0,0 +1,291 @@
+# academic_claim_analyzer/streaming_pipeline.py
+
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .models import RequestAnalysis, Paper
+from .search.base import BaseSearch
+from .search.search_config import GlobalSearchConfig
+from .search.rate_limiter import stage_semaphore
+from .search_coordinator import FullTextHydrator, has_content, plan_searches
+from .exclusion_processor import apply_exclusion_criteria, apply_abstract_screening, mark_unevaluated
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 32
+SCREENING_BATCH_SIZE = 16
+EXCLUSION_BATCH_SIZE = 8
+MAX_CONCURRENT_EXCLUSION_CALLS = 2
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+async def _next_batch(queue: asyncio.Queue, max_items: int) -> Tuple[List[Any], int]:
+    """
+    Wait for one queue item, then take whatever else is already queued (up to
+    `max_items` items). Returns the items and the number of end markers seen.
+    """
+    items: List[Any] = []
+    done = 0
+    item = await queue.get()
+    while True:
+        if item is _DONE:
+            done += 1
+        else:
+            items.append(item)
+        if len(items) >= max_items:
+            break
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+    return items, done
+
+def _title_key(paper: Paper) -> str:
+    return paper.title.lower().strip()
+
+class StreamingPipeline:
+    """
+    Search, screening, full-text hydration and exclusion for one request, run as
+    concurrent stages connected by bounded queues instead of one stage after another.
+
+    Papers flow to the next stage as soon as their search page is parsed, so a slow
+    platform only delays its own papers. Screening and exclusion take whatever has
+    queued up as one batch, which keeps LLM calls batched under load. The bounded
+    queues stop fast searches from running far ahead of scraping.
+
+    With a `deadline`, the pool is handed to ranking once `deadline` seconds have
+    passed and at least `quorum` papers were accepted; work still in flight is
+    cancelled. Without one, the pipeline runs until every stage has drained.
+
+    A batch whose exclusion call raises is kept with its papers marked unevaluated,
+    as apply_exclusion_criteria does when the LLM fails. The accepted pool is put
+    back in search order (planned search, then position in its results) whichever
+    batch finished first, so ranking sees the same input on every run.
+    """
+
+    def __init__(
+        self,
+        analysis: RequestAnalysis,
+        session: aiohttp.ClientSession,
+        quorum: Optional[int] = None,
+        deadline: Optional[float] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        hydration_workers: Optional[int] = None
+    ):
+        self.analysis = analysis
+        self.session = session
+        self.quorum = analysis.parameters.get("num_papers_to_return", 1) if quorum is None else quorum
+        self.deadline = deadline
+        self.queue_size = queue_size
+        self.hydration_workers = hydration_workers or GlobalSearchConfig.hydration_concurrency
+        self.accepted: List[Paper] = []
+        self.found = 0
+        # Search order of every paper kept, by normalized title
+        self._order: Dict[str, Tuple[int, int]] = {}
+        self._quorum_reached = asyncio.Event()
+
+    async def run(self) -> List[Paper]:
+        """Run all stages and store the accepted papers in analysis.search_results."""
+        started = time.monotonic()
+        found = asyncio.Queue(self.queue_size)
+        to_hydrate = asyncio.Queue(self.queue_size)
+        ready = asyncio.Queue(self.queue_size)
+        hydrator = FullTextHydrator(self.session)
+
+        tasks = [
+            asyncio.create_task(self._search_all(found)),
+            asyncio.create_task(self._screen(found, to_hydrate)),
+            asyncio.create_task(self._exclude(ready)),
+        ]
+        tasks += [
+            asyncio.create_task(self._hydrate(to_hydrate, ready, hydrator))
+            for _ in range(self.hydration_workers)
+        ]
+
+        try:
+            await self._wait_for_pool(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await hydrator.close()
+
+        logger.info(
+            f"Streaming pipeline: {len(self.accepted)} of {self.found} papers accepted "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+        self.accepted.sort(key=lambda p: self._order.get(_title_key(p), (len(self._order), 0)))
+        self.analysis.search_results = self.accepted
+        return self.accepted
+
+    async def _wait_for_pool(self, tasks: List[asyncio.Task]) -> None:
+        """Wait until every stage has drained, or the deadline has passed with a quorum accepted."""
+        loop = asyncio.get_running_loop()
+        deadline_at = None if self.deadline is None else loop.time() + self.deadline
+        pending = set(tasks)
+        quorum = asyncio.ensure_future(self._quorum_reached.wait())
+        try:
+            while pending:
+                waiting = set(pending)
+                timeout = None
+                if deadline_at is not None:
+                    if loop.time() >= deadline_at:
+                        if quorum.done():
+                            logger.info(
+                                f"Streaming deadline reached with {len(self.accepted)} papers accepted; "
+                                f"cancelling the remaining searches and scrapes"
+                            )
+                            return
+                        waiting.add(quorum)
+                    else:
+                        timeout = deadline_at - loop.time()
+                done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is not quorum:
+                        pending.discard(task)
+                        task.result()  # a stage failing outright fails the run
+        finally:
+            quorum.cancel()
+
+    def _accept(self, papers: List[Paper]) -> None:
+        self.accepted.extend(papers)
+        if len(self.accepted) >= self.quorum:
+            self._quorum_reached.set()
+
+    async def _search_all(self, found: asyncio.Queue) -> None:
+        papers_per_query = self.analysis.parameters["papers_per_query"]
+        await asyncio.gather(*(
+            self._search_one(index, search_module, platform, query, papers_per_query, found)
+            for index, (search_module, platform, query) in enumerate(plan_searches(self.analysis, self.session))
+        ))
+        await found.put(_DONE)
+
+    async def _search_one(
+        self,
+        search_index: int,
+        search_module: BaseSearch,
+        platform: str,
+        query: str,
+        limit: int,
+        found: asyncio.Queue
+    ) -> None:
+        kept = total = 0
+        stream = search_module.search_stream(query, limit)
+        try:
+            while True:
+                # Hold the search stage slot only while fetching, not while downstream applies backpressure
+                async with stage_semaphore("search"):
+                    try:
+                        batch = await stream.__anext__()
+                    except StopAsyncIteration:
+                        break
+                for paper in batch:
+                    if not isinstance(paper, Paper):
+                        continue
+                    total += 1
+                    key = _title_key(paper)
+                    if key in self._order:
+                        continue
+                    self._order[key] = (search_index, total)
+                    paper.metadata["search_platform"] = platform
+                    kept += 1
+                    self.found += 1
+                    await found.put(paper)
+        except Exception as e:
+            logger.error(f"Error during search with {search_module.__class__.__name__}: {str(e)}")
+        logger.info(f"{search_module.__class__.__name__}: kept {kept}/{total} papers after deduplication")
+
+    async def _screen(self, found: asyncio.Queue, to_hydrate: asyncio.Queue) -> None:
+        screening = self.analysis.parameters.get("abstract_screening")
+        finished = False
+        while not finished:
+            papers, done = await _next_batch(found, SCREENING_BATCH_SIZE)
+            finished = done > 0
+            if papers and screening:
+                papers = await self._run_on_batch(apply_abstract_screening, papers)
+            for paper in papers:
+                await to_hydrate.put(paper)
+        for _ in range(self.hydration_workers):
+            await to_hydrate.put(_DONE)
+
+    async def _hydrate(self, to_hydrate: asyncio.Queue, ready: asyncio.Queue, hydrator: FullTextHydrator) -> None:
+        while True:
+            paper = await to_hydrate.get()
+            if paper is _DONE:
+                await ready.put(_DONE)
+                return
+            if not paper.full_text:
+                await hydrator.hydrate(paper)
+            if not has_content(paper):
+                logger.debug(f"Dropping paper with neither abstract nor full text: {paper.title}")
+                continue
+            await ready.put(paper)
+
+    async def _exclude(self, ready: asyncio.Queue) -> None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EXCLUSION_CALLS)
+        calls = []
+
+        async def evaluate(papers: List[Paper]) -> None:
+            try:
+                self._accept(await self._run_on_batch(apply_exclusion_criteria, papers, mark_failed=True))
+            finally:
+                semaphore.release()
+
+        finished_workers = 0
+        try:
+            while finished_workers < self.hydration_workers:
+                # Only pull the next batch once a call slot is free; papers keep queuing up
+                # meanwhile, so busy periods produce larger batches.
+                await semaphore.acquire()
+                try:
+                    papers, done = await _next_batch(ready, EXCLUSION_BATCH_SIZE)
+                except BaseException:
+                    semaphore.release()
+                    raise
+                finished_workers += done
+                if papers:
+                    calls.append(asyncio.create_task(evaluate(papers)))
+                else:
+                    semaphore.release()
+            await asyncio.gather(*calls)
+        finally:
+            for call in calls:
+                call.cancel()
+
+    async def _run_on_batch(self, stage, papers: List[Paper], mark_failed: bool = False) -> List[Paper]:
+        """
+        Run a whole-analysis stage (screening, exclusion) on a batch of papers. If the
+        stage raises, the papers are kept (marked unevaluated with `mark_failed`).
+        """
+        batch_analysis = self.analysis.model_copy(update={"search_results": list(papers)})
+        try:
+            await stage(batch_analysis)
+        except Exception as e:
+            logger.error(f"{stage.__name__} failed for a batch of {len(papers)} papers: {str(e)}")
+            return mark_unevaluated(list(papers), str(e)) if mark_failed else list(papers)
+        return batch_analysis.search_results
+
+async def run_streaming_pipeline(
+    analysis: RequestAnalysis,
+    session: aiohttp.ClientSession,
+    quorum: Optional[int] = None,
+    deadline: Optional[float] = None
+) -> List[Paper]:
+    """
+    Search, screen, hydrate and exclude papers for the analysis's formulated queries
+    as one streaming pipeline (see StreamingPipeline).
+
+    Args:
+        analysis: The RequestAnalysis object with formulated queries
+        session: Shared aiohttp session for searching and scraping
+        quorum: Papers that must be accepted before the deadline may cut the run short
+        deadline: Seconds after which ranking starts on the accepted pool (None waits for all)
+
+    Returns:
+        The accepted papers (also stored in analysis.search_results)
+    """
+    return await StreamingPipeline(analysis, session, quorum=quorum, deadline=deadline).run()
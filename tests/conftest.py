@@ -0,0 +1,40 @@
+# tests/conftest.py
+
+import pytest
+from types import SimpleNamespace
+
+class LLMFailure(Exception):
+    """Raised by a FakeLLM responder to make the whole call fail."""
+
+class FakeLLM:
+    """
+    Stand-in for llm_handler. Each prompt is answered with respond(prompt, response_type),
+    wrapped the way llm_handler.process returns it: the data itself for a single prompt,
+    one item per prompt for a list. A responder raising LLMFailure fails the whole call.
+    """
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []  # (response_type, prompts) of every call
+        self.prompts = []
+
+    async def process(self, prompts, response_type, **kwargs):
+        self.calls.append((response_type, prompts))
+        batch = [prompts] if isinstance(prompts, str) else list(prompts)
+        self.prompts.extend(batch)
+        try:
+            answers = [self.respond(prompt, response_type) for prompt in batch]
+        except LLMFailure as e:
+            return SimpleNamespace(success=False, data=None, error=str(e))
+        if isinstance(prompts, str):
+            return SimpleNamespace(success=True, data=answers[0], error=None)
+        items = [SimpleNamespace(data=answer, error=None) for answer in answers]
+        return SimpleNamespace(success=True, data=items, error=None)
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """fake_llm(module, respond) installs a FakeLLM as module.llm_handler and returns it."""
+    def install(module, respond):
+        fake = FakeLLM(respond)
+        monkeypatch.setattr(module, "llm_handler", fake)
+        return fake
+    return install
@@ -0,0 +1,48 @@
+# tests/test_analyzer.py
+
+import asyncio
+import pytest
+
+from academic_claim_analyzer import analyzer
+from academic_claim_analyzer.models import RequestAnalysis, Paper
+
+@pytest.mark.asyncio
+async def test_sub_queries_run_concurrently_and_merge_without_duplicates(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_search_and_exclude(sub_analysis):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        sub_analysis.add_query(f"{sub_analysis.query} formulated", "arxiv")
+        sub_analysis.metadata["searched"] = sub_analysis.query
+        for title in (f"Only {sub_analysis.query}", "Shared paper"):
+            sub_analysis.add_search_result(Paper(title=title, authors=["A"], doi=title))
+
+    monkeypatch.setattr(analyzer, "_search_and_exclude", fake_search_and_exclude)
+    analysis = RequestAnalysis(query="(multiple user queries)", parameters={"subquery_concurrency": 2})
+
+    await analyzer._search_sub_queries(analysis, ["q1", "q2", "q3"])
+
+    assert peak == 2
+    assert [q.query for q in analysis.queries] == ["q1 formulated", "q2 formulated", "q3 formulated"]
+    assert [p.title for p in analysis.search_results] == ["Only q1", "Shared paper", "Only q2", "Only q3"]
+    assert analysis.query == "(multiple user queries)"
+    assert analysis.metadata["sub_queries"] == {q: {"searched": q} for q in ("q1", "q2", "q3")}
+
+@pytest.mark.asyncio
+async def test_failed_sub_query_does_not_drop_the_others(monkeypatch):
+    async def fake_search_and_exclude(sub_analysis):
+        if sub_analysis.query == "bad":
+            raise RuntimeError("search failed")
+        sub_analysis.add_search_result(Paper(title=sub_analysis.query, authors=["A"], doi="1"))
+
+    monkeypatch.setattr(analyzer, "_search_and_exclude", fake_search_and_exclude)
+    analysis = RequestAnalysis(query="(multiple user queries)")
+
+    await analyzer._search_sub_queries(analysis, ["good", "bad"])
+
+    assert [p.title for p in analysis.search_results] == ["good"]
@@ -0,0 +1,104 @@
+# tests/test_batch_processor.py
+
+import asyncio
+import pytest
+
+from academic_claim_analyzer import batch_processor
+from academic_claim_analyzer.batch_processor import BatchProcessorConfig, RequestScheduler, request_priority
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_in_flight_jobs_and_starts_by_priority():
+    started = []
+    running = 0
+    peak = 0
+
+    def job(name):
+        async def run():
+            nonlocal running, peak
+            started.append(name)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return name.upper()
+        return run
+
+    names = ["a", "b", "c", "d", "e"]
+    results = await RequestScheduler(2).run([job(n) for n in names], [0, 5, 0, 9, 1])
+
+    assert peak == 2
+    assert started == ["d", "b", "e", "a", "c"]
+    assert results == ["A", "B", "C", "D", "E"]
+
+def test_invalid_priority_falls_back_to_zero():
+    assert request_priority({"priority": "2.5"}) == 2.5
+    assert request_priority({"priority": "urgent"}) == 0.0
+    assert request_priority({}) == 0.0
+
+@pytest.mark.asyncio
+async def test_batch_runs_requests_through_the_scheduler(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def fake_analyze_single_request(req_data, global_config):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return req_data["id"], {"query": req_data["query"]}
+
+    async def fake_shutdown_browser_pool():
+        return None
+
+    monkeypatch.setattr(batch_processor, "analyze_single_request", fake_analyze_single_request)
+    monkeypatch.setattr(batch_processor, "shutdown_browser_pool", fake_shutdown_browser_pool)
+    config = BatchProcessorConfig({"scheduler": {"max_concurrent_requests": 3}})
+    requests_data = [{"id": f"r{i}", "query": f"q{i}"} for i in range(8)]
+
+    results = await batch_processor.process_all_requests_parallel(requests_data, config)
+
+    assert peak == 3
+    assert list(results) == [f"r{i}" for i in range(8)]
+
+@pytest.mark.asyncio
+async def test_results_are_streamed_as_requests_complete(monkeypatch):
+    async def fake_analyze_single_request(req_data, global_config):
+        await asyncio.sleep(req_data["delay"])
+        return req_data["id"], {"query": req_data["id"]}
+
+    async def fake_shutdown_browser_pool():
+        return None
+
+    monkeypatch.setattr(batch_processor, "analyze_single_request", fake_analyze_single_request)
+    monkeypatch.setattr(batch_processor, "shutdown_browser_pool", fake_shutdown_browser_pool)
+    config = BatchProcessorConfig({"scheduler": {"max_concurrent_requests": 2}})
+    requests_data = [{"id": "slow", "delay": 0.05}, {"id": "fast", "delay": 0.0}]
+    streamed = []
+
+    results = await batch_processor.process_all_requests_parallel(
+        requests_data, config, on_result=lambda request_id, result: streamed.append(request_id)
+    )
+
+    assert streamed == ["fast", "slow"]
+    assert results == {}
+
+def test_shards_get_an_even_mix_of_priorities():
+    requests_data = [{"id": f"r{i}", "priority": p} for i, p in enumerate([0, 0, 3, 2, 1])]
+
+    shards = batch_processor.shard_requests(requests_data, 2)
+
+    assert [[r["id"] for r in shard] for shard in shards] == [["r2", "r4", "r1"], ["r3", "r0"]]
+    assert len(batch_processor.shard_requests(requests_data[:1], 4)) == 1
+
+def test_command_line_options(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        batch_processor, "batch_analyze_requests",
+        lambda yaml_file, resume, workers, queue_path: calls.append((yaml_file, resume, workers, queue_path))
+    )
+
+    batch_processor.main(["requests.yaml", "--workers", "8", "--resume"])
+    batch_processor.main(["requests.yaml", "--queue", "jobs.sqlite"])
+
+    assert calls == [("requests.yaml", True, 8, None), ("requests.yaml", False, 1, "jobs.sqlite")]
@@ -0,0 +1,57 @@
+# tests/test_bradley_terry.py
+
+import pytest
+
+from academic_claim_analyzer.bradley_terry import BradleyTerryRatings
+
+def test_ratings_follow_pairwise_outcomes():
+    ratings = BradleyTerryRatings(["a", "b", "c", "d"])
+    for _ in range(3):
+        ratings.add_ranking(["a", "b", "c"])
+        ratings.add_ranking(["b", "c", "d"])
+
+    assert ratings.ranked_ids() == ["a", "b", "c", "d"]
+    scores = ratings.scores()
+    assert all(0.0 < s < 1.0 for s in scores.values())
+    assert ratings.comparisons == 18
+
+def test_opponent_strength_matters():
+    # "x" and "y" both win once and lose to "top" once, but "x" beat a strong paper
+    # while "y" beat a weak one.
+    ratings = BradleyTerryRatings(["top", "strong", "weak", "x", "y"])
+    for _ in range(3):
+        ratings.add_ranking(["strong", "weak"])
+    ratings.add_ranking(["x", "strong"])
+    ratings.add_ranking(["y", "weak"])
+    ratings.add_ranking(["top", "x"])
+    ratings.add_ranking(["top", "y"])
+
+    scores = ratings.scores()
+    assert scores["x"] > scores["y"]
+
+def test_uncertainty_shrinks_with_more_comparisons():
+    ratings = BradleyTerryRatings(["a", "b", "c"])
+    ratings.add_ranking(["a", "b", "c"])
+    before = ratings.uncertainties()
+
+    for _ in range(5):
+        ratings.add_ranking(["b", "c", "a"])
+        ratings.add_ranking(["c", "a", "b"])
+        ratings.add_ranking(["a", "b", "c"])
+    after = ratings.uncertainties()
+
+    assert after["b"] < before["b"]
+
+def test_unknown_and_repeated_ids_are_ignored():
+    ratings = BradleyTerryRatings(["a", "b"])
+    ratings.add_ranking(["a", "ghost", "a", "b"])
+    assert ratings.comparisons == 1
+
+    ratings.add_ranking(["ghost"])
+    assert ratings.comparisons == 1
+    assert ratings.scores()["a"] > ratings.scores()["b"]
+
+def test_unranked_items_stay_at_the_reference():
+    ratings = BradleyTerryRatings(["a", "b", "c"])
+    ratings.add_ranking(["a", "b"])
+    assert ratings.scores()["c"] == pytest.approx(0.5)
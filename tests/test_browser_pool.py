@@ -0,0 +1,115 @@
+# tests/test_browser_pool.py
+
+import asyncio
+import pytest
+
+from academic_claim_analyzer import browser_pool
+from academic_claim_analyzer.browser_pool import BrowserPool, should_block_request
+
+class _FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    async def new_page(self):
+        return _FakePage()
+
+    async def close(self):
+        self.closed = True
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = _FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+class _FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.stopped = False
+        self.chromium = self
+
+    async def launch(self, headless=True):
+        browser = _FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        self.stopped = True
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    driver = _FakePlaywright()
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: driver)
+    return driver
+
+def test_should_block_request():
+    assert should_block_request("image", "https://example.org/figure.png")
+    assert should_block_request("script", "https://www.googletagmanager.com/gtm.js")
+    assert not should_block_request("document", "https://doi.org/10.1000/abc")
+
+@pytest.mark.asyncio
+async def test_pool_reuses_contexts_and_recycles_after_max_uses(fake_playwright):
+    pool = BrowserPool(size=1, pages_per_browser=2, context_max_uses=2)
+
+    pages = []
+    for _ in range(3):
+        async with pool.page() as page:
+            pages.append(page)
+
+    assert len(fake_playwright.browsers) == 1
+    assert pages[0] is pages[1]
+    assert pages[2] is not pages[0]
+    assert fake_playwright.browsers[0].contexts[0].closed
+    assert fake_playwright.browsers[0].contexts[0].routes == ["**/*"]
+
+    await pool.close()
+    assert fake_playwright.stopped
+
+@pytest.mark.asyncio
+async def test_pool_relaunches_crashed_browser_and_bounds_concurrency(fake_playwright):
+    pool = BrowserPool(size=1, pages_per_browser=2, context_max_uses=10)
+
+    async with pool.page():
+        pass
+    fake_playwright.browsers[0].connected = False
+
+    active = 0
+    peak = 0
+
+    async def use_page():
+        nonlocal active, peak
+        async with pool.page():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(use_page() for _ in range(6)))
+
+    assert pool.launches == 2
+    assert peak == 2
+    await pool.close()
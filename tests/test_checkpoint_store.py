@@ -0,0 +1,88 @@
+# tests/test_checkpoint_store.py
+
+import pytest
+
+from academic_claim_analyzer import analyzer, batch_processor
+from academic_claim_analyzer.checkpoint_store import (
+    CheckpointStore, RequestCheckpoint, close_checkpoint_store, configure_checkpoint_store,
+    dump_papers, load_papers, use_checkpoint
+)
+from academic_claim_analyzer.models import Paper, RankedPaper
+
+def test_papers_round_trip_with_their_type():
+    papers = [
+        Paper(title="Plain", authors=["A"], doi="1", year=2020, metadata={"search_platform": "arxiv"}),
+        RankedPaper(title="Screened", authors=["B"], doi="2", exclusion_criteria_result={"is_review": False}),
+    ]
+
+    restored = load_papers(dump_papers(papers))
+
+    assert type(restored[0]) is Paper and type(restored[1]) is RankedPaper
+    assert restored[0].metadata == {"search_platform": "arxiv"}
+    assert restored[1].exclusion_criteria_result == {"is_review": False}
+
+@pytest.mark.asyncio
+async def test_resumed_request_skips_finished_stages(monkeypatch, tmp_path):
+    calls = []
+
+    async def fake_formulate(analysis):
+        calls.append("queries")
+        analysis.add_query("formulated", "arxiv")
+
+    async def fake_pipeline(analysis, session, quorum=None, deadline=None):
+        calls.append("search")
+        analysis.search_results = [RankedPaper(title="Kept", authors=["A"], doi="1")]
+
+    async def failing_rank(**kwargs):
+        calls.append("rank")
+        raise RuntimeError("crashed while ranking")
+
+    async def fake_rank(papers, **kwargs):
+        calls.append("rank")
+        return [RankedPaper(title=p.title, authors=p.authors, doi=p.doi, relevance_score=0.9) for p in papers]
+
+    monkeypatch.setattr(analyzer, "formulate_queries_for_platforms", fake_formulate)
+    monkeypatch.setattr(analyzer, "run_streaming_pipeline", fake_pipeline)
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    streaming = {"processing": {"streaming_pipeline": True}}
+
+    monkeypatch.setattr(analyzer, "rank_papers", failing_rank)
+    with use_checkpoint(RequestCheckpoint(store, "req")):
+        first = await analyzer.analyze_request("q", num_papers_to_return=1, config=streaming)
+    assert first.ranked_papers == []
+
+    monkeypatch.setattr(analyzer, "rank_papers", fake_rank)
+    with use_checkpoint(RequestCheckpoint(store, "req")):
+        second = await analyzer.analyze_request("q", num_papers_to_return=1, config=streaming)
+    store.close()
+
+    assert calls == ["queries", "search", "rank", "rank"]
+    assert [q.query for q in second.queries] == ["formulated"]
+    assert [p.title for p in second.ranked_papers] == ["Kept"]
+
+@pytest.mark.asyncio
+async def test_completed_requests_are_not_analyzed_again(monkeypatch, tmp_path):
+    analyzed = []
+
+    async def fake_analyze_request(query, **kwargs):
+        analyzed.append(query)
+        return {"query": query}
+
+    monkeypatch.setattr(batch_processor, "analyze_request", fake_analyze_request)
+    global_config = {"processing": {"num_queries": 1, "papers_per_query": 1, "num_papers_to_return": 1}}
+    path = str(tmp_path / "checkpoints.sqlite")
+    try:
+        configure_checkpoint_store(path)
+        await batch_processor.analyze_single_request({"id": "a", "query": "first"}, global_config)
+
+        configure_checkpoint_store(path, resume=True)
+        result = await batch_processor.analyze_single_request({"id": "a", "query": "first", "priority": 3}, global_config)
+        await batch_processor.analyze_single_request({"id": "a", "query": "edited"}, global_config)
+
+        configure_checkpoint_store(path)
+        await batch_processor.analyze_single_request({"id": "a", "query": "first"}, global_config)
+    finally:
+        close_checkpoint_store()
+
+    assert result == ("a", {"query": "first"})
+    assert analyzed == ["first", "edited", "first"]
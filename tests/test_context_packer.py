@@ -0,0 +1,51 @@
+# tests/test_context_packer.py
+
+from academic_claim_analyzer.context_packer import ContextPacker, count_tokens, pack_paper, split_sections
+from academic_claim_analyzer.models import Paper
+
+BODY = "Introduction\n" + "Background sentence about irrigation scheduling. " * 400
+CONCLUSIONS = "Soil moisture sensors cut water use by 30 percent in all trials."
+FULL_TEXT = f"{BODY}\n5. Conclusions\n{CONCLUSIONS}\nReferences\n[1] Someone et al. 2020."
+
+def _paper(full_text=FULL_TEXT, pid="paper_1"):
+    return Paper(
+        id=pid,
+        title="Sensors",
+        authors=["A"],
+        doi="10.1/x",
+        abstract="We test sensor-driven irrigation.",
+        full_text=full_text
+    )
+
+def test_split_sections_finds_conclusions_and_drops_references():
+    sections = split_sections(FULL_TEXT)
+    assert sections["conclusions"] == CONCLUSIONS
+    assert sections["body"].startswith("Introduction")
+
+def test_short_papers_pass_through_unchanged():
+    paper = _paper(full_text="A short paper.")
+    packed = pack_paper(paper, 500)
+    assert packed.text == "A short paper."
+    assert not packed.truncated
+
+def test_long_papers_keep_abstract_and_conclusions_within_budget():
+    packed = pack_paper(_paper(), 300)
+
+    assert packed.truncated
+    assert packed.tokens <= 300
+    assert packed.text.startswith("Abstract: We test sensor-driven irrigation.")
+    assert packed.text.endswith(CONCLUSIONS)
+    assert "[...]" in packed.text
+    assert "Someone et al." not in packed.text
+
+def test_group_packing_redistributes_unused_budget():
+    short = _paper(full_text="Tiny.", pid="short")
+    long = _paper(pid="long")
+    packer = ContextPacker(tokens_per_paper=300)
+
+    packed = packer.pack_group([long, short])
+
+    assert packed["short"] == "Tiny."
+    assert 300 < count_tokens(packed["long"]) <= 600
+    assert packer.stats()["tokens_sent"] == count_tokens(packed["short"]) + count_tokens(packed["long"])
+    assert packer.stats()["papers_truncated"] == 1
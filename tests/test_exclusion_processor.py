@@ -0,0 +1,105 @@
+# tests/test_exclusion_processor.py
+
+import re
+import pytest
+
+from academic_claim_analyzer import exclusion_processor
+from academic_claim_analyzer.models import RequestAnalysis, Paper
+from academic_claim_analyzer.schema_manager import create_model_from_schema
+from tests.conftest import LLMFailure
+
+def _verdicts(verdicts):
+    """Responder returning a canned screening verdict per paper title."""
+    def respond(prompt, response_type):
+        title = next(t for t in verdicts if f"Title: {t}\n" in prompt)
+        return response_type(**verdicts[title])
+    return respond
+
+def _fail(prompt, response_type):
+    raise LLMFailure("boom")
+
+def _analysis():
+    analysis = RequestAnalysis(query="soil moisture sensors for irrigation")
+    analysis.exclusion_schema = create_model_from_schema(
+        "ExclusionCriteria", {"is_review": {"type": "boolean", "description": "Is it a review?"}}
+    )
+    analysis.search_results = [
+        Paper(title="Keep", authors=["A"], doi="1", abstract="Field trial of sensors."),
+        Paper(title="Review", authors=["A"], doi="2", abstract="A review of sensors."),
+        Paper(title="Off topic", authors=["A"], doi="3", abstract="Galaxy formation."),
+        Paper(title="No abstract", authors=["A"], doi="4"),
+    ]
+    return analysis
+
+@pytest.mark.asyncio
+async def test_abstract_screening_drops_only_clear_exclusions(fake_llm):
+    fake = fake_llm(exclusion_processor, _verdicts({
+        "Keep": {"is_review": False, "is_relevant": True},
+        "Review": {"is_review": True, "is_relevant": True},
+        "Off topic": {"is_review": False, "is_relevant": False},
+    }))
+    analysis = _analysis()
+
+    await exclusion_processor.apply_abstract_screening(analysis)
+
+    assert [p.title for p in analysis.search_results] == ["Keep", "No abstract"]
+    assert len(fake.prompts) == 3
+    assert analysis.search_results[0].metadata["abstract_screening"] == {"is_review": False, "is_relevant": True}
+
+@pytest.mark.asyncio
+async def test_abstract_screening_keeps_everything_on_failure(fake_llm):
+    fake_llm(exclusion_processor, _fail)
+    analysis = _analysis()
+    await exclusion_processor.apply_abstract_screening(analysis)
+    assert len(analysis.search_results) == 4
+
+def _batched_verdicts(prompt, response_type):
+    """Responder answering batched prompts with one entry per paper; 'Bad' papers get an invalid entry."""
+    if "results" in response_type.model_fields:
+        entries = []
+        for pid, title in re.findall(r"Paper ID: (\S+)\nTitle: (.+)\n", prompt):
+            value = "not a bool" if title == "Bad" else title == "Review"
+            entries.append({"paper_id": pid, "is_review": value})
+        return response_type(results=entries)
+    title = re.search(r"Title: (.+)\n", prompt).group(1)
+    return response_type(is_review=title == "Review")
+
+def test_plan_batches_respects_size_and_tokens():
+    assert exclusion_processor.plan_batches([10, 10, 10, 10, 10], 2, 100) == [[0, 1], [2, 3], [4]]
+    assert exclusion_processor.plan_batches([10, 80, 10, 30], 4, 100) == [[0, 2, 3], [1]]
+    assert exclusion_processor.plan_batches([10, 10], 1, 100) == [[0], [1]]
+
+@pytest.mark.asyncio
+async def test_batched_exclusion_falls_back_to_single_calls(fake_llm):
+    fake = fake_llm(exclusion_processor, _batched_verdicts)
+    analysis = _analysis()
+    analysis.parameters["exclusion_batch_size"] = 3
+    analysis.search_results.append(Paper(title="Bad", authors=["A"], doi="5", full_text="Unclear."))
+    for p in analysis.search_results:
+        p.full_text = p.full_text or p.abstract or "No text."
+
+    await exclusion_processor.apply_exclusion_criteria(analysis)
+
+    assert [(t.__name__, len(prompts)) for t, prompts in fake.calls] == [("CombinedSchemaBatch", 2), ("CombinedSchema", 1)]
+    assert [p.title for p in analysis.search_results] == ["Keep", "Off topic", "No abstract", "Bad"]
+    assert analysis.search_results[-1].exclusion_criteria_result == {"is_review": False}
+
+@pytest.mark.asyncio
+async def test_papers_whose_evaluation_failed_are_kept_and_marked(fake_llm):
+    def failing_singles(prompt, response_type):
+        if "results" not in response_type.model_fields:
+            raise LLMFailure("boom")
+        return _batched_verdicts(prompt, response_type)
+
+    fake_llm(exclusion_processor, failing_singles)
+    analysis = _analysis()
+    analysis.parameters["exclusion_batch_size"] = 3
+    analysis.search_results.append(Paper(title="Bad", authors=["A"], doi="5", full_text="Unclear."))
+    for p in analysis.search_results:
+        p.full_text = p.full_text or p.abstract or "No text."
+
+    await exclusion_processor.apply_exclusion_criteria(analysis)
+
+    assert [p.title for p in analysis.search_results] == ["Keep", "Off topic", "No abstract", "Bad"]
+    unevaluated = [p.title for p in analysis.search_results if exclusion_processor.UNEVALUATED_KEY in p.metadata]
+    assert unevaluated == ["Bad"]
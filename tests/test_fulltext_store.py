@@ -0,0 +1,64 @@
+# tests/test_fulltext_store.py
+
+import asyncio
+import pytest
+
+from academic_claim_analyzer.fulltext_store import FullTextStore, normalize_fulltext_key
+from academic_claim_analyzer.models import Paper
+
+class _CountingScraper:
+    def __init__(self, text="full text " * 50, delay=0.01):
+        self.text = text
+        self.delay = delay
+        self.urls = []
+
+    async def scrape(self, url):
+        self.urls.append(url)
+        await asyncio.sleep(self.delay)
+        return self.text
+
+def _paper(doi="", pdf_link=None):
+    return Paper(title="T", authors=["A"], doi=doi, pdf_link=pdf_link)
+
+def test_normalize_fulltext_key():
+    assert normalize_fulltext_key(doi="https://doi.org/10.1000/ABC") == "doi:10.1000/abc"
+    assert normalize_fulltext_key(doi=" doi:10.1000/abc ") == "doi:10.1000/abc"
+    assert normalize_fulltext_key(url="HTTPS://Example.org/paper.pdf#page=2") == "url:https://example.org/paper.pdf"
+    assert normalize_fulltext_key(doi="", url="not a url") is None
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_scrape():
+    store = FullTextStore()
+    scraper = _CountingScraper()
+    papers = [_paper("10.1000/abc"), _paper("https://doi.org/10.1000/ABC"), _paper("10.1000/abc")]
+
+    texts = await asyncio.gather(*(store.fetch_paper_text(p, scraper) for p in papers))
+
+    assert len(scraper.urls) == 1
+    assert all(t == scraper.text for t in texts)
+    assert store.stats()["coalesced"] == 2
+
+@pytest.mark.asyncio
+async def test_disk_store_survives_new_instance(tmp_path):
+    path = str(tmp_path / "ft.sqlite")
+    scraper = _CountingScraper()
+    first = FullTextStore(path)
+    await first.fetch_paper_text(_paper(pdf_link="https://x.org/a.pdf"), scraper)
+    first.close()
+
+    second = FullTextStore(path)
+    text = await second.fetch_paper_text(_paper(pdf_link="https://x.org/a.pdf"), scraper)
+    assert text == scraper.text
+    assert len(scraper.urls) == 1
+    second.close()
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_not_stored():
+    store = FullTextStore()
+
+    async def boom():
+        raise RuntimeError("network down")
+
+    with pytest.raises(RuntimeError):
+        await store.get_or_fetch("doi:10.1/x", boom)
+    assert store.get("doi:10.1/x") is None
@@ -0,0 +1,137 @@
+# tests/test_job_queue.py
+
+import time
+import asyncio
+import pytest
+
+from academic_claim_analyzer import batch_processor
+from academic_claim_analyzer.batch_processor import BatchProcessorConfig, enqueue_requests
+from academic_claim_analyzer.job_queue import JobQueue, run_queue_worker
+
+def _job(request_id, priority=0):
+    return (f"{request_id}:key", request_id, {"id": request_id, "query": f"{request_id} query"}, {}, priority)
+
+def test_leases_by_priority_and_expired_leases_are_taken_over(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.05, max_attempts=2)
+    assert queue.enqueue([_job("low"), _job("high", priority=5)]) == 2
+    assert queue.enqueue([_job("low")]) == 0
+
+    first = queue.lease("worker-1")
+    second = queue.lease("worker-1")
+    assert (first.request_id, second.request_id) == ("high", "low")
+    # Leases taken by the same owner are still told apart
+    assert first.lease_token != second.lease_token
+    assert not queue.heartbeat(first.id, second.lease_token)
+    assert queue.lease("worker-2") is None
+
+    time.sleep(0.1)  # worker-1 dies: its leases expire
+    retaken = queue.lease("worker-2")
+    assert retaken.request_id == "high" and retaken.attempts == 2
+    assert queue.complete(retaken.id, retaken.lease_token, {"ok": True})
+    # The presumed-lost worker can no longer renew or overwrite the job
+    assert not queue.heartbeat(first.id, first.lease_token)
+    assert not queue.complete(first.id, first.lease_token, {"ok": False})
+
+    queue.lease("worker-2")  # "low", second attempt
+    time.sleep(0.1)
+    assert queue.lease("worker-3") is None  # out of attempts
+    assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+    assert list(queue.results()) == [("low", {"error": "Lease expired 2 times"}), ("high", {"ok": True})]
+    queue.close()
+
+@pytest.mark.asyncio
+async def test_workers_share_the_queue_and_retry_failures(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    queue = JobQueue(path, lease_seconds=0.15)
+    config = BatchProcessorConfig({})
+    requests_data = [{"id": f"r{i}", "query": f"query {i}", "priority": i} for i in range(6)]
+    assert enqueue_requests(queue, requests_data, config) == 6
+    assert enqueue_requests(queue, requests_data, config) == 0
+
+    calls = []
+
+    async def process(req_data, global_config):
+        calls.append(req_data["id"])
+        if req_data["id"] == "r3" and calls.count("r3") == 1:
+            raise RuntimeError("transient failure")
+        # Longer than the lease: only the heartbeats keep other workers off the job
+        await asyncio.sleep(0.3 if req_data["id"] == "r5" else 0.01)
+        return {"query": req_data["query"], "processing": global_config["processing"]["num_queries"]}
+
+    other = JobQueue(path, lease_seconds=0.15)
+    done = await asyncio.gather(
+        run_queue_worker(queue, process, max_concurrent=2, worker_id="a", poll_interval=0.02),
+        run_queue_worker(other, process, max_concurrent=2, worker_id="b", poll_interval=0.02),
+    )
+
+    assert sum(done) == 6
+    assert sorted(calls) == ["r0", "r1", "r2", "r3", "r3", "r4", "r5"]
+    results = dict(queue.results())
+    assert results["r3"] == {"query": "query 3", "processing": 5}
+    assert queue.counts()["done"] == 6
+    queue.close()
+    other.close()
+
+@pytest.mark.asyncio
+async def test_error_results_are_released_for_retry(tmp_path, monkeypatch):
+    attempts = []
+
+    async def fake_analyze_single_request(req_data, global_config):
+        attempts.append(req_data["id"])
+        if len(attempts) == 1:
+            return req_data["id"], {"error": "transient failure"}
+        return req_data["id"], {"query": req_data["query"]}
+
+    async def fake_shutdown_browser_pool():
+        return None
+
+    monkeypatch.setattr(batch_processor, "analyze_single_request", fake_analyze_single_request)
+    monkeypatch.setattr(batch_processor, "shutdown_browser_pool", fake_shutdown_browser_pool)
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    config = BatchProcessorConfig({"queue": {"poll_interval": 0.01}})
+    enqueue_requests(queue, [{"id": "r0", "query": "query 0"}], config)
+
+    assert await batch_processor.process_queue(queue, config) == 1
+    assert attempts == ["r0", "r0"]
+    assert list(queue.results()) == [("r0", {"query": "query 0"})]
+    queue.close()
+
+def test_runs_without_resume_start_a_fresh_queue(tmp_path, monkeypatch):
+    analyzed = []
+
+    async def fake_analyze_single_request(req_data, global_config):
+        analyzed.append(req_data["id"])
+        return req_data["id"], {"query": req_data["query"], "run": len(analyzed)}
+
+    async def fake_shutdown_browser_pool():
+        return None
+
+    monkeypatch.setattr(batch_processor, "analyze_single_request", fake_analyze_single_request)
+    monkeypatch.setattr(batch_processor, "shutdown_browser_pool", fake_shutdown_browser_pool)
+    queue_path = str(tmp_path / "jobs.sqlite")
+    config = BatchProcessorConfig({"queue": {"poll_interval": 0.01}})
+    requests_data = [{"id": "r0", "query": "query 0"}]
+
+    def run(resume):
+        try:
+            batch_processor._run_queue(
+                queue_path, requests_data, config, str(tmp_path), resume, 1,
+                str(tmp_path / "full.jsonl"), str(tmp_path / "concise.jsonl")
+            )
+        finally:
+            batch_processor._close_run_resources()
+
+    run(resume=False)
+    run(resume=True)
+    assert analyzed == ["r0"]
+    run(resume=False)
+    assert analyzed == ["r0", "r0"]
+    queue = JobQueue(queue_path)
+    assert list(queue.results()) == [("r0", {"query": "query 0", "run": 2})]
+
+    # A run still in progress is not wiped by a worker that forgot to resume
+    queue.enqueue([_job("pending")])
+    with pytest.raises(RuntimeError, match="unfinished jobs"):
+        enqueue_requests(queue, requests_data, config, fresh=True)
+    assert queue.counts()["pending"] == 1
+    queue.close()
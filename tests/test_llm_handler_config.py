@@ -0,0 +1,63 @@
+# tests/test_llm_handler_config.py
+
+import pytest
+from pydantic import BaseModel
+
+from academic_claim_analyzer.llm_handler_config import CachedLLMHandler
+from llmhandler.api_handler import PromptResult
+from llmhandler._internal_models import UnifiedResponse
+
+class Verdict(BaseModel):
+    answer: str
+
+class _FakeHandler:
+    default_model = "openai:gpt-4o-mini"
+
+    def __init__(self):
+        self.calls = []
+
+    async def process(self, prompts, model=None, response_type=None, **kwargs):
+        self.calls.append(prompts)
+        if isinstance(prompts, str):
+            return UnifiedResponse(success=True, data=response_type(answer=prompts.upper()))
+        return UnifiedResponse(success=True, data=[
+            PromptResult(prompt=p, data=response_type(answer=p.upper())) if p != "bad" else PromptResult(prompt=p, error="invalid")
+            for p in prompts
+        ])
+
+@pytest.fixture
+def cached(tmp_path):
+    handler = CachedLLMHandler(_FakeHandler())
+    handler.configure(str(tmp_path / "llm.sqlite"))
+    yield handler
+    handler.close()
+
+@pytest.mark.asyncio
+async def test_single_prompt_is_answered_from_cache(cached):
+    first = await cached.process(prompts="hello", response_type=Verdict)
+    second = await cached.process(prompts="hello", response_type=Verdict)
+
+    assert first.data == second.data == Verdict(answer="HELLO")
+    assert cached.handler.calls == ["hello"]
+
+@pytest.mark.asyncio
+async def test_batch_only_sends_misses_and_keeps_order(cached):
+    await cached.process(prompts=["a", "bad"], response_type=Verdict)
+    result = await cached.process(prompts=["c", "a", "bad"], response_type=Verdict)
+
+    assert [item.data.answer if item.data else item.error for item in result.data] == ["C", "A", "invalid"]
+    assert cached.handler.calls == [["a", "bad"], ["c", "bad"]]
+
+@pytest.mark.asyncio
+async def test_opt_out_and_schema_changes_bypass_cache(cached):
+    class OtherVerdict(BaseModel):
+        answer: str
+        confidence: float = 0.0
+
+    await cached.process(prompts="x", response_type=Verdict)
+    await cached.process(prompts="x", response_type=Verdict, cache=False)
+    await cached.process(prompts="x", response_type=Verdict, stage="ranking")
+    await cached.process(prompts="x", response_type=OtherVerdict)
+
+    assert len(cached.handler.calls) == 4
+    assert cached.make_key("x", None, Verdict) != cached.make_key("x", "openai:gpt-4o", Verdict)
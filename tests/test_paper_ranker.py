@@ -1,3 +1,85 @@
-# tests\test_paper_ranker.py
+# tests/test_paper_ranker.py
 
+import re
+import pytest
 
+from academic_claim_analyzer import paper_ranker
+from academic_claim_analyzer.models import Paper
+from academic_claim_analyzer.paper_ranker import (
+    AnalysisResponse,
+    Ranking,
+    RankingResponse,
+    lexical_prerank,
+    rank_papers,
+)
+
+FILLER = " ".join(f"filler{i}" for i in range(250))
+
+def _paper(i, topic):
+    return Paper(
+        title=f"Paper {i} on {topic}",
+        authors=["A"],
+        doi=f"10.1/{i}",
+        abstract=f"A study of {topic}.",
+        full_text=f"{topic} {FILLER}"
+    )
+
+def _rank_by_number(ranked_numbers):
+    """Responder ranking the papers of each group by their number (lower is better)."""
+    def respond(prompt, response_type):
+        if response_type is AnalysisResponse:
+            return AnalysisResponse(analysis="ok", relevant_quotes=[])
+        found = re.findall(r"Paper ID: (\S+)\nTitle: Paper (\d+)", prompt)
+        ranked_numbers.extend(int(n) for _, n in found)
+        order = sorted(found, key=lambda f: int(f[1]))
+        return RankingResponse(rankings=[Ranking(paper_id=pid, rank=r + 1, explanation="") for r, (pid, _) in enumerate(order)])
+    return respond
+
+def _ranking_prompts(fake):
+    return sum(len(prompts) for response_type, prompts in fake.calls if response_type is RankingResponse)
+
+def test_lexical_prerank_keeps_best_matches():
+    papers = [_paper(1, "galaxy formation"), _paper(2, "drip irrigation sensors"), _paper(3, "irrigation policy")]
+    kept = lexical_prerank(papers, "irrigation sensors", "", 2)
+    assert [p.title for p in kept] == ["Paper 2 on drip irrigation sensors", "Paper 3 on irrigation policy"]
+    assert papers[0].metadata["lexical_score"] == 0
+
+@pytest.mark.asyncio
+async def test_only_prerank_survivors_reach_llm_rounds(monkeypatch, fake_llm):
+    ranked_numbers = []
+    fake_llm(paper_ranker, _rank_by_number(ranked_numbers))
+
+    async def no_bibtex(paper):
+        return ""
+    monkeypatch.setattr(paper_ranker, "_get_bibtex", no_bibtex)
+
+    papers = [_paper(i, "soil moisture irrigation") for i in range(1, 5)]
+    papers += [_paper(i, "galaxy formation") for i in range(5, 25)]
+
+    ranked = await rank_papers(papers, "soil moisture irrigation", "", top_n=2, prerank_top_m=4)
+
+    assert set(ranked_numbers) == {1, 2, 3, 4}
+    assert [p.title for p in ranked] == ["Paper 1 on soil moisture irrigation", "Paper 2 on soil moisture irrigation"]
+    assert ranked[0].relevance_score > ranked[1].relevance_score
+    assert all(p.relevance_uncertainty > 0 for p in ranked)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(5))
+async def test_adaptive_ranking_finds_top_papers_with_fewer_calls(monkeypatch, fake_llm, seed):
+    async def no_bibtex(paper):
+        return ""
+    monkeypatch.setattr(paper_ranker, "_get_bibtex", no_bibtex)
+    papers = [_paper(i, "soil moisture irrigation") for i in range(1, 21)]
+
+    calls = {}
+    for adaptive in (False, True):
+        paper_ranker.random.seed(seed)
+        fake = fake_llm(paper_ranker, _rank_by_number([]))
+        ranked = await rank_papers(
+            papers, "soil moisture irrigation", "", top_n=3, prerank_top_m=0, adaptive_ranking=adaptive
+        )
+        calls[adaptive] = _ranking_prompts(fake)
+
+    assert {p.title.split(" on ")[0] for p in ranked} == {"Paper 1", "Paper 2", "Paper 3"}
+
+    assert calls[True] < calls[False]
@@ -1,3 +1,103 @@
-# tests\test_paper_scraper.py
+# tests/test_paper_scraper.py
 
+import asyncio
+from contextlib import asynccontextmanager
 
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from academic_claim_analyzer.paper_scraper import UnifiedWebScraper
+from academic_claim_analyzer.search.http_client import create_http_session
+from academic_claim_analyzer.search.search_config import GlobalSearchConfig
+
+ARTICLE = b"<html><body><script>var x;</script><main><h1>Title</h1><p>Body text here.</p></main></body></html>"
+
+async def _article(request):
+    return web.Response(body=ARTICLE, content_type="text/html")
+
+async def _huge(request):
+    return web.Response(body=b"<html><body>" + b"word " * 100000 + b"</body></html>", content_type="text/html")
+
+async def _missing(request):
+    return web.Response(status=404)
+
+@asynccontextmanager
+async def _serve():
+    app = web.Application()
+    app.router.add_get("/article", _article)
+    app.router.add_get("/huge", _huge)
+    app.router.add_get("/missing", _missing)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield server
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_scrape_with_requests_extracts_main_text():
+    async with _serve() as server, create_http_session() as session:
+        scraper = UnifiedWebScraper(session)
+        text = await scraper.scrape_with_requests(str(server.make_url("/article")))
+        assert "Body text here." in text
+        assert "var x" not in text
+        assert await scraper.scrape_with_requests(str(server.make_url("/missing"))) == ""
+
+@pytest.mark.asyncio
+async def test_scrape_with_requests_caps_body_size(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "scrape_max_bytes", 1000)
+    async with _serve() as server, create_http_session() as session:
+        scraper = UnifiedWebScraper(session)
+        text = await scraper.scrape_with_requests(str(server.make_url("/huge")))
+        assert 0 < len(text.split()) < 250
+
+def _scraper_with(monkeypatch, requests_result, browser_result, requests_delay=0.0, browser_delay=0.0):
+    scraper = UnifiedWebScraper(session=None)
+    calls = []
+
+    async def fake_requests(url):
+        calls.append("requests")
+        await asyncio.sleep(requests_delay)
+        return requests_result
+
+    async def fake_browser(url):
+        calls.append("browser")
+        await asyncio.sleep(browser_delay)
+        return browser_result
+
+    monkeypatch.setattr(scraper, "scrape_with_requests", fake_requests)
+    monkeypatch.setattr(scraper, "scrape_with_playwright", fake_browser)
+    return scraper, calls
+
+@pytest.mark.asyncio
+async def test_hedged_scrape_skips_browser_when_fetch_is_fast(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "scrape_hedge_delay", 0.5)
+    scraper, calls = _scraper_with(monkeypatch, "word " * 20, "browser " * 20)
+
+    text = await scraper.scrape("https://example.org/paper", min_words=10, mode="hedged")
+
+    assert text.startswith("word")
+    assert calls == ["requests"]
+
+@pytest.mark.asyncio
+async def test_hedged_scrape_races_browser_against_slow_fetch(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "scrape_hedge_delay", 0.05)
+    scraper, calls = _scraper_with(monkeypatch, "word " * 20, "browser " * 20, requests_delay=5)
+
+    started = asyncio.get_running_loop().time()
+    text = await scraper.scrape("https://example.org/paper", min_words=10, mode="hedged")
+
+    assert text.startswith("browser")
+    assert calls == ["requests", "browser"]
+    assert asyncio.get_running_loop().time() - started < 1
+
+@pytest.mark.asyncio
+async def test_hedged_scrape_returns_best_partial_result_at_deadline(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "scrape_hedge_delay", 0.01)
+    monkeypatch.setattr(GlobalSearchConfig, "scrape_deadline", 0.2)
+    scraper, _ = _scraper_with(monkeypatch, "short text", "never", browser_delay=5)
+
+    text = await scraper.scrape("https://example.org/paper", min_words=10, mode="hedged")
+
+    assert text == "short text"
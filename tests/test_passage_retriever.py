@@ -0,0 +1,47 @@
+# tests/test_passage_retriever.py
+
+import numpy as np
+
+from academic_claim_analyzer.passage_retriever import BM25Index, PassageIndex, chunk_text, select_passages
+
+FILLER = "The weather station logged routine observations every morning. " * 30
+
+def _paper_text():
+    sections = [
+        "Abstract: drip irrigation trial in tomato fields.",
+        FILLER,
+        "The experiment used 1200 soil moisture sensors across 40 hectares.",
+        FILLER,
+        "This article is an original field study, not a literature review.",
+        FILLER,
+    ]
+    return "\n".join(sections)
+
+def test_chunk_text_overlaps_and_covers_everything():
+    words = [f"w{i}" for i in range(500)]
+    chunks = chunk_text(" ".join(words), chunk_words=200, overlap=50)
+    assert [c.split()[0] for c in chunks] == ["w0", "w150", "w300"]
+    assert chunks[-1].split()[-1] == "w499"
+
+def test_bm25_prefers_documents_matching_rare_terms():
+    index = BM25Index(["sensors sensors irrigation", "irrigation weather", "weather weather report"])
+    scores = index.score("soil sensors")
+    assert int(np.argmax(scores)) == 0
+    assert scores[2] == 0
+    assert not index.score("unrelated").any()
+
+def test_top_passages_cover_each_query_in_document_order():
+    index = PassageIndex(_paper_text(), chunk_words=40, overlap=0)
+    passages = index.top_passages(["number of sensors", "literature review"], k=3)
+
+    assert len(passages) == 3
+    assert passages[0].startswith("Abstract:")
+    assert any("1200 soil moisture sensors" in p for p in passages)
+    assert any("literature review" in p for p in passages)
+    assert passages == sorted(passages, key=index.passages.index)
+
+def test_select_passages_skips_short_texts():
+    assert select_passages("A short paper about sensors.", ["sensors"], k=8) is None
+    assert select_passages(_paper_text(), ["sensors"], k=0) is None
+    selected = select_passages(_paper_text(), ["sensors"], k=2, chunk_words=40)
+    assert selected is not None and "1200 soil moisture sensors" in selected
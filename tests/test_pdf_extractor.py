@@ -0,0 +1,74 @@
+# tests/test_pdf_extractor.py
+
+import time
+import asyncio
+import fitz
+import pytest
+
+from academic_claim_analyzer.pdf_extractor import PDFExtractor, extract_pdf_text
+
+def _make_pdf(num_pages: int) -> bytes:
+    document = fitz.open()
+    for i in range(num_pages):
+        page = document.new_page()
+        page.insert_text((72, 72), f"Page number {i + 1} of the test document")
+    data = document.tobytes()
+    document.close()
+    return data
+
+def test_extract_pdf_text_respects_page_limit():
+    pdf = _make_pdf(3)
+    assert "Page number 3" in extract_pdf_text(pdf)
+    limited = extract_pdf_text(pdf, max_pages=2)
+    assert "Page number 2" in limited and "Page number 3" not in limited
+    assert extract_pdf_text(b"not a pdf") == ""
+
+@pytest.mark.asyncio
+async def test_process_pool_extracts_concurrently():
+    extractor = PDFExtractor(workers=2, max_pending=2, max_pages=0, timeout=60)
+    try:
+        texts = await asyncio.gather(*(extractor.extract_text(_make_pdf(n)) for n in (1, 2, 3)))
+        assert ["Page number 3" in text for text in texts] == [False, False, True]
+        assert await extractor.extract_text(b"garbage") == ""
+        assert extractor.documents == 4
+    finally:
+        extractor.close()
+
+@pytest.mark.asyncio
+async def test_timeout_terminates_the_stuck_worker():
+    extractor = PDFExtractor(workers=1, max_pending=2, max_pages=0, timeout=60)
+    try:
+        assert "Page number 1" in await extractor.extract_text(_make_pdf(1))
+        stuck_pool = extractor._executor
+        workers = list(stuck_pool._processes.values())
+        # Occupy the only worker, as a pathological PDF would
+        asyncio.get_running_loop().run_in_executor(stuck_pool, time.sleep, 30)
+
+        extractor.timeout = 0.5
+        assert await extractor.extract_text(_make_pdf(1)) == ""
+        assert extractor.timeouts == 1
+        for process in workers:
+            process.join(timeout=10)
+            assert not process.is_alive()
+
+        extractor.timeout = 60
+        assert "Page number 1" in await extractor.extract_text(_make_pdf(1))
+        assert extractor._executor is not stuck_pool
+    finally:
+        extractor.close()
+
+def test_recycle_without_worker_access_abandons_the_pool():
+    class _OpaquePool:
+        def __init__(self):
+            self.shutdowns = []
+
+        def shutdown(self, **kwargs):
+            self.shutdowns.append(kwargs)
+
+    extractor = PDFExtractor(workers=1)
+    pool = extractor._executor = _OpaquePool()
+
+    extractor._recycle_executor(pool)
+
+    assert pool.shutdowns == [{"wait": False, "cancel_futures": True}]
+    assert extractor._executor is None
@@ -1,7 +1,9 @@
 # tests/test_query_formulator.py
 
 import pytest
-from academic_claim_analyzer.query_formulator import formulate_queries
+from academic_claim_analyzer import query_formulator, query_processor
+from academic_claim_analyzer.models import RequestAnalysis
+from academic_claim_analyzer.query_formulator import QueryCache, formulate_queries, formulate_queries_multi
 from unittest.mock import patch 
 
 @pytest.mark.asyncio
@@ -39,4 +41,52 @@ async def test_formulate_queries(claim, num_queries, query_type):
 @pytest.mark.asyncio
 async def test_formulate_queries_invalid_query_type():
     with pytest.raises(ValueError, match="Unsupported query type"):
-        await formulate_queries("Test claim", 3, "invalid_type")
\ No newline at end of file
+        await formulate_queries("Test claim", 3, "invalid_type")
+
+def _platform_queries(skip=()):
+    """Responder answering combined prompts for every platform except `skip`, and single-platform prompts."""
+    def respond(prompt, response_type):
+        fields = list(response_type.model_fields)
+        if fields == ["queries"]:
+            return response_type(queries=["single"])
+        return response_type(**{f: ([] if f in skip else [f"{f} q1", f"{f} q2"]) for f in fields})
+    return respond
+
+def _called_fields(fake):
+    return [list(response_type.model_fields) for response_type, _ in fake.calls]
+
+@pytest.mark.asyncio
+async def test_multi_platform_formulation_uses_one_call_and_caches(monkeypatch, fake_llm):
+    fake = fake_llm(query_formulator, _platform_queries(skip=("core",)))
+    monkeypatch.setattr(query_formulator, "_query_cache", QueryCache())
+
+    queries = await formulate_queries_multi("soil moisture", 2, ["scopus", "arxiv", "core"])
+
+    assert queries == {"scopus": ["scopus q1", "scopus q2"], "arxiv": ["arxiv q1", "arxiv q2"], "core": ["single"]}
+    assert _called_fields(fake) == [["scopus", "arxiv", "core"], ["queries"]]
+    assert query_formulator._query_cache.stats()["misses"] == 3
+
+    again = await formulate_queries_multi("  soil   moisture ", 2, ["arxiv", "core"])
+    assert again == {"arxiv": ["arxiv q1", "arxiv q2"], "core": ["single"]}
+    assert len(fake.calls) == 2
+
+@pytest.mark.asyncio
+async def test_combined_formulation_error_falls_back_to_per_platform_calls(monkeypatch):
+    async def failing_multi(user_query, num_queries, platforms):
+        raise RuntimeError("LLM unavailable")
+
+    async def fake_formulate(user_query, num_queries, platform):
+        if platform == "core":
+            raise RuntimeError("core failed")
+        return [f"{platform} q"]
+
+    monkeypatch.setattr(query_processor, "formulate_queries_multi", failing_multi)
+    monkeypatch.setattr(query_processor, "formulate_queries", fake_formulate)
+    analysis = RequestAnalysis(
+        query="soil moisture",
+        parameters={"num_queries": 1, "platforms": ["scopus", "core", "arxiv"], "combined_query_formulation": True}
+    )
+
+    await query_processor.formulate_queries_for_platforms(analysis)
+
+    assert [(q.query, q.source) for q in analysis.queries] == [("scopus q", "scopus"), ("arxiv q", "arxiv")]
@@ -0,0 +1,51 @@
+# tests/test_result_writer.py
+
+import json
+
+from academic_claim_analyzer.result_writer import JSONLResultWriter, jsonl_to_json, merge_jsonl
+
+def test_converted_json_matches_json_dump(tmp_path):
+    results = {
+        "first": {"query": "Café über alles", "ranked_papers": [{"title": "A\nB", "year": 2020}], "metadata": {}},
+        "second": {"error": "Empty query."},
+        "third": {"ranked_papers": [], "parameters": {"platforms": ["arxiv"]}},
+    }
+    jsonl_path = tmp_path / "full_results.jsonl"
+    with JSONLResultWriter(str(jsonl_path), fsync_every=2) as writer:
+        for request_id, result in results.items():
+            writer.write(request_id, result)
+        writer.write("first", {"query": "rerun"})
+    # A record cut off by a crash mid-write
+    with open(jsonl_path, "a", encoding="utf-8") as f:
+        f.write('{"request_id": "fourth", "res')
+
+    json_path = tmp_path / "full_results.json"
+    count = jsonl_to_json(str(jsonl_path), str(json_path))
+
+    expected = dict(results, first={"query": "rerun"})
+    assert count == 3
+    assert json_path.read_text(encoding="utf-8") == json.dumps(expected, ensure_ascii=False, indent=2)
+
+def test_empty_results_give_empty_object(tmp_path):
+    jsonl_path = tmp_path / "empty.jsonl"
+    JSONLResultWriter(str(jsonl_path)).close()
+
+    jsonl_to_json(str(jsonl_path), str(tmp_path / "empty.json"))
+
+    assert json.loads((tmp_path / "empty.json").read_text()) == {}
+
+def test_worker_files_are_merged_line_by_line(tmp_path):
+    first = tmp_path / "full_results.worker0.jsonl"
+    second = tmp_path / "full_results.worker1.jsonl"
+    with JSONLResultWriter(str(first)) as writer:
+        writer.write("a", {"n": 1})
+    # Worker 1 died in the middle of its second record
+    second.write_text('{"request_id": "b", "result": {"n": 2}}\n{"request_id": "c", "res', encoding="utf-8")
+    with JSONLResultWriter(str(tmp_path / "full_results.worker2.jsonl")) as writer:
+        writer.write("d", {"n": 4})
+
+    merged = tmp_path / "full_results.jsonl"
+    merge_jsonl([str(first), str(second), str(tmp_path / "missing.jsonl"), str(tmp_path / "full_results.worker2.jsonl")], str(merged))
+    jsonl_to_json(str(merged), str(tmp_path / "full_results.json"))
+
+    assert json.loads((tmp_path / "full_results.json").read_text()) == {"a": {"n": 1}, "b": {"n": 2}, "d": {"n": 4}}
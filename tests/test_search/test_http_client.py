@@ -0,0 +1,36 @@
+# tests/test_search/test_http_client.py
+
+import pytest
+from typing import List
+
+from academic_claim_analyzer.search.base import BaseSearch
+from academic_claim_analyzer.search.http_client import create_http_session
+from academic_claim_analyzer.search.search_config import GlobalSearchConfig
+from academic_claim_analyzer.models import Paper
+
+class _EchoSearch(BaseSearch):
+    async def search(self, query: str, limit: int) -> List[Paper]:
+        async with self._session_scope() as session:
+            self.seen = session
+        return []
+
+@pytest.mark.asyncio
+async def test_create_http_session_uses_global_config():
+    async with create_http_session() as session:
+        assert session.connector.limit == GlobalSearchConfig.http_max_connections
+        assert session.connector.limit_per_host == GlobalSearchConfig.http_max_connections_per_host
+        assert session.timeout.total == GlobalSearchConfig.http_total_timeout
+
+@pytest.mark.asyncio
+async def test_shared_session_is_reused_and_left_open():
+    async with create_http_session() as shared:
+        search = _EchoSearch(session=shared)
+        await search.search("q", 1)
+        assert search.seen is shared
+        assert not shared.closed
+
+@pytest.mark.asyncio
+async def test_temporary_session_is_closed():
+    search = _EchoSearch()
+    await search.search("q", 1)
+    assert search.seen.closed
@@ -0,0 +1,82 @@
+# tests/test_search/test_rate_limiter.py
+
+import asyncio
+import pytest
+
+from academic_claim_analyzer.search.rate_limiter import (
+    HostRateLimiter, SharedHostRateLimiter, configure_stage_limits, stage_semaphore
+)
+from academic_claim_analyzer.search.search_config import GlobalSearchConfig
+from academic_claim_analyzer.search import ScopusSearch, CORESearch
+
+def test_subdomains_share_parent_bucket(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "host_rate_limits", {"arxiv.org": (1, 3.0)})
+    assert HostRateLimiter.bucket_for("export.arxiv.org") == ("arxiv.org", (1, 3.0))
+    assert HostRateLimiter.bucket_for("arxiv.org") == ("arxiv.org", (1, 3.0))
+    assert HostRateLimiter.bucket_for("notarxiv.org")[0] == "notarxiv.org"
+
+@pytest.mark.asyncio
+async def test_bucket_is_shared_across_hosts_and_enforces_rate(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "host_rate_limits", {"example.org": (2, 0.2)})
+    limiter = HostRateLimiter()
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    await asyncio.gather(*(
+        limiter.acquire(url) for url in [
+            "https://api.example.org/a",
+            "https://example.org/b",
+            "https://www.example.org/c",
+            "https://example.org/d",
+        ]
+    ))
+    elapsed = loop.time() - started
+
+    assert limiter.limiter_for("api.example.org") is limiter.limiter_for("example.org")
+    # 2 tokens available at once, the other 2 need a full refill period
+    assert 0.15 <= elapsed < 1.0
+
+@pytest.mark.asyncio
+async def test_search_modules_share_concurrency_limit(monkeypatch):
+    monkeypatch.setenv("SCOPUS_API_KEY", "test")
+    monkeypatch.setenv("CORE_API_KEY", "test")
+    assert ScopusSearch().semaphore is ScopusSearch().semaphore
+    assert ScopusSearch().semaphore is not CORESearch().semaphore
+
+@pytest.mark.asyncio
+async def test_configured_stage_limit_caps_concurrent_calls(monkeypatch):
+    monkeypatch.setattr(GlobalSearchConfig, "stage_concurrency", {"search": 16, "scrape": 16, "llm": 8})
+    configure_stage_limits(llm=2)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with stage_semaphore("llm"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    with pytest.raises(ValueError):
+        configure_stage_limits(parsing=2)
+
+@pytest.mark.asyncio
+async def test_shared_limiters_enforce_one_rate_between_processes(monkeypatch, tmp_path):
+    monkeypatch.setattr(GlobalSearchConfig, "host_rate_limits", {"example.org": (2, 0.2)})
+    # Two limiters on one file stand in for two worker processes
+    path = str(tmp_path / "rate_limits.sqlite")
+    first, second = SharedHostRateLimiter(path), SharedHostRateLimiter(path)
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    await asyncio.gather(*(
+        limiter.acquire("https://example.org/x") for limiter in (first, second, first, second)
+    ))
+    elapsed = loop.time() - started
+
+    # Separate in-memory buckets would have let all four through at once
+    assert 0.15 <= elapsed < 1.0
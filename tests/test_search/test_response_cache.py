@@ -0,0 +1,108 @@
+# tests/test_search/test_response_cache.py
+
+import pytest
+
+from academic_claim_analyzer.cache_store import SQLiteBlobStore
+from academic_claim_analyzer.search import response_cache
+from academic_claim_analyzer.search.response_cache import (
+    ResponseCache,
+    cached_fetch,
+    configure_response_cache,
+    close_response_cache,
+    is_json,
+)
+
+class _FakeResponse:
+    def __init__(self, status, text):
+        self.status = status
+        self._text = text
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class _FakeSession:
+    def __init__(self, status=200, text='{"ok": true}'):
+        self.status = status
+        self.text = text
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return _FakeResponse(self.status, self.text)
+
+@pytest.fixture
+def cache_path(tmp_path):
+    yield str(tmp_path / "http.sqlite")
+    close_response_cache()
+
+def test_key_ignores_param_order():
+    a = ResponseCache.make_key("get", "https://x", {"a": 1, "b": 2})
+    b = ResponseCache.make_key("GET", "https://x", {"b": 2, "a": 1})
+    assert a == b
+    assert a != ResponseCache.make_key("GET", "https://x", {"a": 1, "b": 3})
+
+def test_blob_store_ttl_and_eviction(tmp_path):
+    store = SQLiteBlobStore(str(tmp_path / "s.sqlite"), max_size_bytes=10**9, ttl_seconds=-1)
+    store.set("k", b"value")
+    assert store.get("k") is None  # already expired
+
+    store = SQLiteBlobStore(str(tmp_path / "t.sqlite"), max_size_bytes=200)
+    for i in range(20):
+        store.set(f"k{i}", bytes([i]) * 1000)
+    assert store.stats()["size_bytes"] <= 200
+    assert store.get("k19") == bytes([19]) * 1000
+
+def test_blob_store_size_counts_overwrites_once(tmp_path):
+    store = SQLiteBlobStore(str(tmp_path / "s.sqlite"))
+    for i in range(5):
+        store.set("k", bytes(range(256)) * (i + 1))
+    store.set("other", b"x" * 100)
+    assert store.stats()["size_bytes"] == store._total_size()
+
+    store.delete("k")
+    assert store.stats()["size_bytes"] == store._total_size()
+
+@pytest.mark.asyncio
+async def test_cached_fetch_hits_after_first_success(cache_path):
+    configure_response_cache(cache_path)
+    session = _FakeSession()
+    waits = []
+
+    async def wait():
+        waits.append(1)
+
+    for _ in range(3):
+        status, text = await cached_fetch(session, "GET", "https://api/x", params={"q": "a"},
+                                          is_valid=is_json, before_request=wait)
+        assert status == 200 and text == '{"ok": true}'
+
+    assert session.calls == 1
+    assert len(waits) == 1
+    stats = response_cache.get_response_cache().stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_cached_fetch_does_not_store_errors_or_invalid_bodies(cache_path):
+    configure_response_cache(cache_path)
+    failing = _FakeSession(status=500, text="oops")
+    await cached_fetch(failing, "GET", "https://api/y")
+    await cached_fetch(failing, "GET", "https://api/y")
+    assert failing.calls == 2
+
+    truncated = _FakeSession(text='{"cut')
+    await cached_fetch(truncated, "GET", "https://api/z", is_valid=is_json)
+    await cached_fetch(truncated, "GET", "https://api/z", is_valid=is_json)
+    assert truncated.calls == 2
+
+@pytest.mark.asyncio
+async def test_cached_fetch_without_cache_passes_through():
+    session = _FakeSession()
+    await cached_fetch(session, "GET", "https://api/x")
+    await cached_fetch(session, "GET", "https://api/x")
+    assert session.calls == 2
@@ -0,0 +1,63 @@
+# tests/test_search_coordinator.py
+
+import pytest
+from typing import List
+
+from academic_claim_analyzer import search_coordinator
+from academic_claim_analyzer.search.base import BaseSearch
+from academic_claim_analyzer.models import RequestAnalysis, Paper
+
+class _FakeSearch(BaseSearch):
+    def __init__(self, titles, session=None):
+        super().__init__(session)
+        self.titles = titles
+        self.hydrated = []
+
+    async def search(self, query: str, limit: int) -> List[Paper]:
+        return [Paper(title=t, authors=["A"], doi=f"10.1/{t}", abstract="abs") for t in self.titles]
+
+    async def fetch_full_text(self, paper, scraper):
+        self.hydrated.append(paper.title)
+        return f"text of {paper.title}"
+
+@pytest.mark.asyncio
+async def test_only_deduplicated_papers_are_hydrated(monkeypatch):
+    modules = {
+        "openalex": _FakeSearch(["Paper A", "Paper B"]),
+        "core": _FakeSearch(["paper a ", "Paper C"]),
+    }
+    monkeypatch.setattr(search_coordinator, "create_search_module", lambda platform, session=None: modules[platform])
+
+    analysis = RequestAnalysis(query="q", parameters={"papers_per_query": 2, "platforms": ["openalex", "core"]})
+    analysis.add_query("q1", "openalex")
+    analysis.add_query("q2", "core")
+
+    await search_coordinator.perform_searches(analysis)
+
+    titles = sorted(p.title.lower().strip() for p in analysis.search_results)
+    assert titles == ["paper a", "paper b", "paper c"]
+    hydrated = modules["openalex"].hydrated + modules["core"].hydrated
+    assert len(hydrated) == 3
+    assert all(p.full_text == f"text of {p.title}" for p in analysis.search_results)
+    assert {p.metadata["search_platform"] for p in analysis.search_results} == {"openalex", "core"}
+
+class _FailingScrapeSearch(_FakeSearch):
+    async def search(self, query: str, limit: int) -> List[Paper]:
+        return [Paper(title=t, authors=["A"], doi=f"10.1/{t}") for t in self.titles]
+
+    async def fetch_full_text(self, paper, scraper):
+        self.hydrated.append(paper.title)
+        return None if paper.title == "No text" else f"text of {paper.title}"
+
+@pytest.mark.asyncio
+async def test_papers_without_content_are_dropped_after_hydration(monkeypatch):
+    module = _FailingScrapeSearch(["Has text", "No text"])
+    monkeypatch.setattr(search_coordinator, "create_search_module", lambda platform, session=None: module)
+
+    analysis = RequestAnalysis(query="q", parameters={"papers_per_query": 2, "platforms": ["openalex"]})
+    analysis.add_query("q1", "openalex")
+
+    await search_coordinator.perform_searches(analysis)
+
+    assert sorted(module.hydrated) == ["Has text", "No text"]
+    assert [p.title for p in analysis.search_results] == ["Has text"]
@@ -0,0 +1,100 @@
+# tests/test_streaming_pipeline.py
+
+import time
+import asyncio
+import pytest
+
+from academic_claim_analyzer import streaming_pipeline
+from academic_claim_analyzer.models import RequestAnalysis, Paper
+from academic_claim_analyzer.search.base import BaseSearch
+
+class _FakeSearch(BaseSearch):
+    def __init__(self, titles, delay):
+        super().__init__()
+        self.titles = titles
+        self.delay = delay
+        self.finished_at = None
+
+    async def search(self, query, limit):
+        await asyncio.sleep(self.delay)
+        self.finished_at = time.monotonic()
+        return [Paper(title=t, authors=["A"], doi=t, full_text=f"{t} text") for t in self.titles]
+
+def _setup(monkeypatch, slow_delay):
+    fast = _FakeSearch(["Fast 1", "Fast 2", "Shared"], 0.0)
+    slow = _FakeSearch(["Slow 1", "Shared", "Slow bad"], slow_delay)
+    monkeypatch.setattr(
+        streaming_pipeline, "plan_searches",
+        lambda analysis, session: [(fast, "openalex", "q"), (slow, "arxiv", "q")]
+    )
+
+    exclusion_calls = []
+
+    async def fake_exclusion(analysis):
+        exclusion_calls.append((time.monotonic(), [p.title for p in analysis.search_results]))
+        analysis.search_results = [p for p in analysis.search_results if "bad" not in p.title]
+    monkeypatch.setattr(streaming_pipeline, "apply_exclusion_criteria", fake_exclusion)
+
+    analysis = RequestAnalysis(query="q", parameters={"papers_per_query": 5, "num_papers_to_return": 2})
+    return analysis, slow, exclusion_calls
+
+@pytest.mark.asyncio
+async def test_exclusion_starts_before_the_slowest_search_finishes(monkeypatch):
+    analysis, slow, exclusion_calls = _setup(monkeypatch, slow_delay=0.3)
+
+    pipeline = streaming_pipeline.StreamingPipeline(analysis, session=None, hydration_workers=2)
+    await pipeline.run()
+
+    assert exclusion_calls[0][0] < slow.finished_at
+    assert sorted(p.title for p in analysis.search_results) == ["Fast 1", "Fast 2", "Shared", "Slow 1"]
+    assert analysis.search_results[0].metadata["search_platform"] == "openalex"
+    assert pipeline.found == 5
+
+@pytest.mark.asyncio
+async def test_deadline_ranks_the_pool_once_quorum_is_reached(monkeypatch):
+    analysis, slow, _ = _setup(monkeypatch, slow_delay=5.0)
+
+    started = time.monotonic()
+    await streaming_pipeline.run_streaming_pipeline(analysis, session=None, quorum=2, deadline=0.1)
+
+    assert time.monotonic() - started < 2.0
+    assert sorted(p.title for p in analysis.search_results) == ["Fast 1", "Fast 2", "Shared"]
+
+@pytest.mark.asyncio
+async def test_papers_left_without_content_skip_exclusion(monkeypatch):
+    analysis, slow, exclusion_calls = _setup(monkeypatch, slow_delay=0.0)
+    slow.titles = ["Slow 1", "No text"]
+    original_search = slow.search
+
+    async def search(query, limit):
+        papers = await original_search(query, limit)
+        papers[1].full_text = None
+        return papers
+
+    async def failed_scrape(self, paper):
+        paper.full_text = None
+
+    slow.search = search
+    monkeypatch.setattr(streaming_pipeline.FullTextHydrator, "hydrate", failed_scrape)
+
+    await streaming_pipeline.StreamingPipeline(analysis, session=None, hydration_workers=2).run()
+
+    assert all("No text" not in titles for _, titles in exclusion_calls)
+    assert sorted(p.title for p in analysis.search_results) == ["Fast 1", "Fast 2", "Shared", "Slow 1"]
+
+@pytest.mark.asyncio
+async def test_failed_exclusion_keeps_papers_marked_and_pool_is_in_search_order(monkeypatch):
+    analysis, slow, _ = _setup(monkeypatch, slow_delay=0.05)
+
+    async def flaky_exclusion(analysis):
+        if any(p.title == "Slow 1" for p in analysis.search_results):
+            raise RuntimeError("LLM unavailable")
+        await asyncio.sleep(0.1)  # the fast platform's batch finishes last
+
+    monkeypatch.setattr(streaming_pipeline, "apply_exclusion_criteria", flaky_exclusion)
+
+    await streaming_pipeline.StreamingPipeline(analysis, session=None, hydration_workers=1).run()
+
+    assert [p.title for p in analysis.search_results] == ["Fast 1", "Fast 2", "Shared", "Slow 1", "Slow bad"]
+    unevaluated = [p.title for p in analysis.search_results if "exclusion_unevaluated" in p.metadata]
+    assert unevaluated == ["Slow 1", "Slow bad"]